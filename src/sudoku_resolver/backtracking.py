@@ -1,55 +1,343 @@
 """Module containing methods to solve a sudoku."""
 
-from random import SystemRandom
+import copy
+from collections.abc import Callable
+from enum import Enum
+from itertools import count
+from random import Random, SystemRandom
 
 from .domains import Domain, Domains
-from .exceptions import ValueAssignmentError
+from .exceptions import (
+    SearchCancelledError,
+    SearchCutoffError,
+    UnsolvableSudokuError,
+    ValueAssignmentError,
+)
 from .grid import Grid, Index
+from .nogoods import NogoodStore
+from .trace import SearchTracer, TraceEvent
 
 cryptogen = SystemRandom()
 
 BACKTRACKING_DEPTH_THRESHOLD = cryptogen.randint(35, 65)
 BACKTRACKING_PROBABILITY = cryptogen.uniform(0.35, 0.65)
 
+# Number of iterations between two calls to the `should_stop` callback
+STOP_CHECK_INTERVAL = 64
 
-def _assign_value(*, grid: Grid, domains: Domains, value_index: Index) -> None:
+# Maximum number of nogoods learned by conflict-directed backjumping, and of literals per nogood
+NOGOODS_STORE_SIZE = 4096
+NOGOOD_MAX_LENGTH = 8
+
+
+class ValueOrdering(Enum):
+    """Enumeration of the orders in which the values of a domain are tried."""
+
+    LEAST_CONSTRAINING = "lcv"
+    NATURAL = "natural"
+    RANDOM = "random"
+
+
+def luby(i: int, /) -> int:
+    """Computes the i-th term of the Luby sequence (1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ...).
+
+    :param i: position in the sequence, starting at 1.
+    :returns: term of the sequence.
+    """
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while i != (1 << k) - 1:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+
+def _least_constraining_order(grid: Grid, value_index: Index, rng: Random) -> list[int]:
+    """Orders the values of a domain, the least constraining ones first."""
+    return grid.least_constraining_value(value_index)
+
+
+def _natural_order(grid: Grid, value_index: Index, rng: Random) -> list[int]:
+    """Orders the values of a domain in ascending order."""
+    return sorted(grid.domains.get_domain(value_index) or ())
+
+
+def _random_order(grid: Grid, value_index: Index, rng: Random) -> list[int]:
+    """Orders the values of a domain randomly."""
+    values = sorted(grid.domains.get_domain(value_index) or ())
+    rng.shuffle(values)
+    return values
+
+
+# Functions ordering the values of a domain, given the grid, the cell and a random generator
+VALUE_ORDERINGS: dict[ValueOrdering, Callable[[Grid, Index, Random], list[int]]] = {
+    ValueOrdering.LEAST_CONSTRAINING: _least_constraining_order,
+    ValueOrdering.NATURAL: _natural_order,
+    ValueOrdering.RANDOM: _random_order,
+}
+
+
+def _assign_value(
+    *,
+    grid: Grid,
+    domains: Domains,
+    value_index: Index,
+    value_ordering: ValueOrdering = ValueOrdering.NATURAL,
+    rng: Random = cryptogen,
+) -> None:
     """Assigns a value respecting constraints at the given index and removes it from the domain.
 
     :param grid: `Grid` containing the Sudoku to solve.
     :param domains: `Domains` containing every cell's domain.
     :param value_index: index of the cell to assign a value to.
+    :param value_ordering: order in which the values of the domain are tried.
+    :param rng: random generator used by `ValueOrdering.RANDOM`.
     :raises: `ValueAssignmentError` when every value from a domain has been tried unsuccessfully.
     """
-    if domains.get_domain(value_index):
-        domain = grid.least_constraining_value(value_index)
-        for value in domain:
+    if domain := domains.get_domain(value_index):
+        for value in VALUE_ORDERINGS[value_ordering](grid, value_index, rng):
             if grid.check_constraints(value=value, value_index=value_index):
-                domain.remove(value)
-                grid.domains.set_domain(domain, value_index)
+                grid.domains.set_domain(domain - {value}, value_index)
                 grid.set_value(value, value_index)
                 return
     raise ValueAssignmentError(value_index)
 
 
-def backtracking(
-    *, grid: Grid, domains: Domains, initial_domains: list[list[Domain | None]]
+def backtracking(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    *,
+    grid: Grid,
+    domains: Domains,
+    initial_domains: list[list[Domain | None]],
+    should_stop: Callable[[], bool] | None = None,
+    value_ordering: ValueOrdering = ValueOrdering.NATURAL,
+    rng: Random | None = None,
+    max_backtracks: int | None = None,
+    tracer: SearchTracer | None = None,
 ) -> None:
     """Backtracking algorithm for solving Sudoku puzzles.
 
     :param grid: `Grid` containing the sudoku to solve.
     :param domains: `Domains` containing every cell's domain.
+    :param initial_domains: starting domains values, used when a domain is reinitialized.
+    :param should_stop: callback polled every `STOP_CHECK_INTERVAL` iterations. The search is
+        cancelled as soon as it returns `True`.
+    :param value_ordering: order in which the values of a domain are tried.
+    :param rng: random generator used to break ties between the cells with the smallest domain
+        and by `ValueOrdering.RANDOM`. Ties are broken deterministically if not given.
+    :param max_backtracks: number of backtracks after which the search is given up.
+    :param tracer: `SearchTracer` recording the prunings of AC-3, every assignment, dead end
+        and backtrack.
+    :raises: `UnsolvableSudokuError` when every assignment has been tried unsuccessfully.
+    :raises: `SearchCancelledError` when `should_stop` asked for the search to stop.
+    :raises: `SearchCutoffError` when `max_backtracks` has been reached.
     """
     # AC-3 enforcement
-    grid.enforce_arc_consistency()
+    if tracer is None:
+        grid.enforce_arc_consistency()
+    else:
+        previous_domains = copy.deepcopy(domains.domains)
+        grid.enforce_arc_consistency()
+        tracer.record_prunings(previous_domains, domains.domains, depth=0)
 
     assignment_stack: list[Index] = []
+    iterations = 0
+    backtracks = 0
     while indexes := grid.minimum_remaining_value():
-        index = indexes[0]
+        iterations += 1
+        if should_stop is not None and iterations % STOP_CHECK_INTERVAL == 0 and should_stop():
+            raise SearchCancelledError
+        index = indexes[0] if rng is None else rng.choice(indexes)
         try:
-            _assign_value(grid=grid, domains=domains, value_index=index)
+            _assign_value(
+                grid=grid,
+                domains=domains,
+                value_index=index,
+                value_ordering=value_ordering,
+                rng=rng or cryptogen,
+            )
+            if tracer is not None:
+                tracer.record(
+                    TraceEvent.ASSIGN, index, grid.get_value(index), len(assignment_stack)
+                )
             assignment_stack.append(index)
         except ValueAssignmentError:
+            if tracer is not None:
+                tracer.record(TraceEvent.DEAD_END, index, 0, len(assignment_stack))
             domains.reinitialize_domain(domain_index=index, initial_domains=initial_domains)
+            if not assignment_stack:
+                raise UnsolvableSudokuError from None
+            backtracks += 1
+            if max_backtracks is not None and backtracks > max_backtracks:
+                raise SearchCutoffError(max_backtracks) from None
             # Reset last assignment's value and remove it from the assigment stack
             last_assignment = assignment_stack.pop()
+            if tracer is not None:
+                tracer.record(
+                    TraceEvent.BACKTRACK,
+                    last_assignment,
+                    grid.get_value(last_assignment),
+                    len(assignment_stack),
+                )
+            grid.reinitialize_value(last_assignment)
+
+
+def restarting_backtracking(
+    *,
+    grid: Grid,
+    restart_base: int,
+    rng: Random,
+    value_ordering: ValueOrdering = ValueOrdering.RANDOM,
+    should_stop: Callable[[], bool] | None = None,
+) -> None:
+    """Randomized backtracking restarted with Luby-style cutoffs.
+
+    The i-th run is given up after `restart_base * luby(i)` backtracks and the search starts over
+    from the initial grid, so that an unlucky early choice can't trap the search for long.
+
+    :param grid: `Grid` containing the sudoku to solve. It is filled in place once solved.
+    :param restart_base: number of backtracks of the shortest run.
+    :param rng: random generator driving the randomized choices.
+    :param value_ordering: order in which the values of a domain are tried.
+    :param should_stop: callback polled during the search, see `backtracking`.
+    :raises: `UnsolvableSudokuError` when a run exhausted the search space.
+    :raises: `SearchCancelledError` when `should_stop` asked for the search to stop.
+    """
+    for i in count(1):
+        attempt = Grid(grid.values.copy(), copy.deepcopy(grid.domains))
+        try:
+            backtracking(
+                grid=attempt,
+                domains=attempt.domains,
+                initial_domains=attempt.initial_domains,
+                should_stop=should_stop,
+                value_ordering=value_ordering,
+                rng=rng,
+                max_backtracks=restart_base * luby(i),
+            )
+        except SearchCutoffError:
+            continue
+        for index in grid.unassigned_values_indexes:
+            grid.set_value(int(attempt.get_value(index)), index)
+        return
+
+
+def _assign_value_tracking_conflicts(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    *,
+    grid: Grid,
+    domains: Domains,
+    value_index: Index,
+    assignments_depths: dict[Index, int],
+    conflict_set: set[Index],
+    nogoods: NogoodStore,
+) -> bool:
+    """Assigns a value respecting constraints and nogoods at the given index.
+
+    Every assignment preventing a value of the domain from being assigned is added to the
+    conflict set of the cell.
+
+    :param grid: `Grid` containing the Sudoku to solve.
+    :param domains: `Domains` containing every cell's domain.
+    :param value_index: index of the cell to assign a value to.
+    :param assignments_depths: depth in the search tree of every assigned cell.
+    :param conflict_set: conflict set of the cell, updated in place.
+    :param nogoods: learned nogoods.
+    :returns: `True` if a value has been assigned, `False` if the domain has been exhausted.
+    """
+    if not (domain := domains.get_domain(value_index)):
+        return False
+    neighbours_indexes = grid.get_neighbours_indexes(value_index)
+    for value in sorted(domain):
+        conflicts = [
+            index
+            for index in neighbours_indexes
+            if index in assignments_depths and grid.get_value(index) == value
+        ]
+        if conflicts:
+            conflict_set.update(conflicts)
+            continue
+        if nogood := nogoods.find_violated(grid=grid, value=value, value_index=value_index):
+            conflict_set.update(index for index, _ in nogood if index != value_index)
+            continue
+        domains.set_domain(domain - {value}, value_index)
+        grid.set_value(value, value_index)
+        return True
+    return False
+
+
+def conflict_directed_backjumping(
+    *,
+    grid: Grid,
+    domains: Domains,
+    initial_domains: list[list[Domain | None]],
+    should_stop: Callable[[], bool] | None = None,
+    max_nogoods: int = NOGOODS_STORE_SIZE,
+) -> None:
+    """Conflict-directed backjumping algorithm for solving Sudoku puzzles.
+
+    Each cell keeps track of the assignments that prevented its values from being assigned. When
+    a domain is exhausted, the search jumps straight back to the most recent of these assignments
+    instead of the last one, and the conflicting assignments are learned as a nogood pruning
+    later branches.
+
+    :param grid: `Grid` containing the sudoku to solve.
+    :param domains: `Domains` containing every cell's domain.
+    :param initial_domains: starting domains values, used when a domain is reinitialized.
+    :param should_stop: callback polled during the search, see `backtracking`.
+    :param max_nogoods: maximum number of learned nogoods kept.
+    :raises: `UnsolvableSudokuError` when a domain is exhausted because of the givens only.
+    :raises: `SearchCancelledError` when `should_stop` asked for the search to stop.
+    """
+    # AC-3 enforcement
+    grid.enforce_arc_consistency()
+
+    nogoods = NogoodStore(max_nogoods, NOGOOD_MAX_LENGTH)
+    assignment_stack: list[Index] = []
+    assignments_depths: dict[Index, int] = {}
+    conflict_sets: dict[Index, set[Index]] = {}
+    index: Index | None = None
+    iterations = 0
+    while True:
+        if index is None:
+            if not (indexes := grid.minimum_remaining_value()):
+                return
+            index = indexes[0]
+        iterations += 1
+        if should_stop is not None and iterations % STOP_CHECK_INTERVAL == 0 and should_stop():
+            raise SearchCancelledError
+
+        conflict_set = conflict_sets.setdefault(index, set())
+        if _assign_value_tracking_conflicts(
+            grid=grid,
+            domains=domains,
+            value_index=index,
+            assignments_depths=assignments_depths,
+            conflict_set=conflict_set,
+            nogoods=nogoods,
+        ):
+            assignments_depths[index] = len(assignment_stack)
+            assignment_stack.append(index)
+            index = None
+            continue
+
+        if not conflict_set:
+            raise UnsolvableSudokuError
+        nogoods.add(frozenset((cell, int(grid.get_value(cell))) for cell in conflict_set))
+        domains.reinitialize_domain(domain_index=index, initial_domains=initial_domains)
+        del conflict_sets[index]
+
+        # Undo every assignment made after the culprit, which had nothing to do with the conflict
+        culprit = max(conflict_set, key=assignments_depths.__getitem__)
+        while (last_assignment := assignment_stack.pop()) != culprit:
+            del assignments_depths[last_assignment]
             grid.reinitialize_value(last_assignment)
+            domains.reinitialize_domain(
+                domain_index=last_assignment, initial_domains=initial_domains
+            )
+            conflict_sets.pop(last_assignment, None)
+        del assignments_depths[culprit]
+        grid.reinitialize_value(culprit)
+        conflict_sets[culprit] |= conflict_set - {culprit}
+        index = culprit
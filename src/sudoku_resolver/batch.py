@@ -0,0 +1,334 @@
+"""Module containing methods to solve batches of sudokus, with checkpoints to resume from."""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO
+
+from .dedup import DedupIndex, DedupMode, dedup_form
+from .engines import EngineName
+from .exceptions import CheckpointError
+from .profiling import Stage, StageProfiler, profile_stage
+from .puzzles import is_puzzle, parse_puzzle
+from .sinks import Compression, SinkFormat, SolveRecord, open_sink
+from .solver import SolverContext
+from .telemetry import BatchTelemetry
+
+# Number of puzzles solved between two checkpoints
+DEFAULT_CHECKPOINT_INTERVAL = 10_000
+CHECKPOINT_SUFFIX = ".checkpoint"
+# Number of puzzles sent at once to a worker process
+CHUNK_SIZE = 64
+
+# Holds the solving contexts of each thread, reused from one puzzle to the next
+_local = threading.local()
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """Progress of a batch run, saved next to its output.
+
+    :param input_offset: number of bytes of the input file consumed.
+    :param puzzles: number of puzzles solved.
+    :param output_size: number of bytes of the output file written.
+    :param digest: SHA-256 digest of the output file written.
+    """
+
+    input_offset: int = 0
+    puzzles: int = 0
+    output_size: int = 0
+    digest: str = hashlib.sha256().hexdigest()
+
+    @classmethod
+    def load(cls, filepath: Path) -> "Checkpoint":
+        """Loads a checkpoint from a file.
+
+        :param filepath: path of the checkpoint file.
+        :returns: `Checkpoint`.
+        """
+        with Path.open(filepath, encoding="utf-8") as f:
+            return cls(**json.load(f))
+
+    def save(self, filepath: Path) -> None:
+        """Saves the checkpoint to a file atomically.
+
+        :param filepath: path of the checkpoint file.
+        """
+        temporary_path = filepath.with_name(filepath.name + ".tmp")
+        with Path.open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f)
+            f.flush()
+            os.fsync(f.fileno())
+        temporary_path.replace(filepath)
+
+
+def _get_context(engine: EngineName) -> SolverContext:
+    """Gets the solving context of the current thread for an engine."""
+    contexts: dict[EngineName, SolverContext] = _local.__dict__.setdefault("contexts", {})
+    if engine not in contexts:
+        contexts[engine] = SolverContext(engine=engine)
+    return contexts[engine]
+
+
+def solve_puzzle(
+    puzzle: str,
+    *,
+    engine: EngineName = EngineName.BACKTRACKING,
+    profiler: StageProfiler | None = None,
+) -> SolveRecord:
+    """Solves a puzzle given as a line of 81 characters.
+
+    :param puzzle: sudoku values, empty cells being either '0' or '.'.
+    :param engine: engine solving the sudoku.
+    :param profiler: `StageProfiler` measuring every stage, from parsing to the search.
+    :returns: `SolveRecord`, without solution if the puzzle has none or if the line isn't a
+        puzzle.
+    """
+    with profile_stage(profiler, Stage.PARSE):
+        values = parse_puzzle(puzzle) if is_puzzle(puzzle) else None
+    if values is None:
+        return SolveRecord(puzzle=puzzle, solution=None, elapsed=0.0, engine=engine.value)
+    result = _get_context(engine).solve(values, profiler=profiler)
+    return SolveRecord(
+        puzzle=puzzle,
+        solution=result.to_string() if result.solved else None,
+        elapsed=result.elapsed,
+        engine=engine.value,
+    )
+
+
+def _agrees(puzzle: str, solution: str) -> bool:
+    """Checks that a solution keeps the givens of a puzzle."""
+    return all(
+        value in "0." or value == solved for value, solved in zip(puzzle, solution, strict=True)
+    )
+
+
+def _solve_deduplicated(
+    block: list[str],
+    *,
+    solve_many: Callable[[list[str]], Iterable[SolveRecord]],
+    index: DedupIndex,
+    mode: DedupMode,
+    engine: EngineName,
+) -> list[SolveRecord]:
+    """Solves a block of puzzles, solving each distinct puzzle once.
+
+    :param block: puzzles to solve.
+    :param solve_many: function solving a list of puzzles, returning their records in order.
+    :param index: index of the solutions of the puzzles seen in former blocks, updated in place.
+    :param mode: way puzzles are recognized as duplicates.
+    :param engine: engine solving the sudokus.
+    :returns: records of the puzzles, in block order. Duplicates are given the solution of the
+        first occurrence and no elapsed time.
+    """
+    forms = [dedup_form(puzzle, mode) for puzzle in block]
+    solutions: dict[str, str | None] = {}
+    first_positions: dict[str, int] = {}
+    for position, form in enumerate(forms):
+        if form.key in solutions or form.key in first_positions:
+            continue
+        if form.key in index:
+            solutions[form.key] = index[form.key]
+        else:
+            first_positions[form.key] = position
+
+    solved = dict(
+        zip(
+            first_positions,
+            solve_many([block[position] for position in first_positions.values()]),
+            strict=True,
+        )
+    )
+    for key, record in solved.items():
+        solutions[key] = (
+            None
+            if record.solution is None
+            else forms[first_positions[key]].to_key_space(record.solution)
+        )
+        index[key] = solutions[key]
+
+    records = []
+    for position, (puzzle, form) in enumerate(zip(block, forms, strict=True)):
+        if first_positions.get(form.key) == position:
+            records.append(solved[form.key])
+            continue
+        key_solution = solutions[form.key]
+        solution = None if key_solution is None else form.from_key_space(key_solution)
+        # Keys without solution are told apart from the keys colliding with them by the index
+        if index.approximate and solution is not None and not _agrees(puzzle, solution):
+            # Digests collision, the puzzle isn't a duplicate after all
+            records.extend(solve_many([puzzle]))
+            continue
+        records.append(
+            SolveRecord(puzzle=puzzle, solution=solution, elapsed=0.0, engine=engine.value)
+        )
+    return records
+
+
+def _read_blocks(stream: BinaryIO, block_size: int) -> Iterator[tuple[list[str], int]]:
+    """Reads puzzles by blocks, skipping blank lines.
+
+    :param stream: input stream, positioned where reading starts.
+    :param block_size: number of puzzles per block.
+    :returns: blocks of puzzles, along with the input offset right after each block.
+    """
+    block: list[str] = []
+    for line in iter(stream.readline, b""):
+        if puzzle := line.strip():
+            # Non-ASCII bytes are escaped, the line being rejected as a puzzle later on
+            block.append(puzzle.decode("ascii", errors="backslashreplace"))
+            if len(block) == block_size:
+                yield block, stream.tell()
+                block = []
+    if block:
+        yield block, stream.tell()
+
+
+def _resume(output_path: Path, checkpoint_path: Path) -> tuple[Checkpoint, "hashlib._Hash"]:
+    """Checks that the output matches its checkpoint and drops what was written after it.
+
+    :param output_path: path of the output file.
+    :param checkpoint_path: path of the checkpoint file.
+    :returns: checkpoint to resume from, and the digest of the output up to that checkpoint.
+    :raises: `CheckpointError` if the output doesn't match the checkpoint.
+    """
+    checkpoint = Checkpoint.load(checkpoint_path)
+    if not output_path.exists() or output_path.stat().st_size < checkpoint.output_size:
+        error_msg = f"output file '{output_path}' is shorter than its checkpoint"
+        raise CheckpointError(error_msg)
+
+    digest = hashlib.sha256()
+    with Path.open(output_path, "r+b") as f:
+        remaining = checkpoint.output_size
+        while remaining and (data := f.read(min(remaining, 1 << 20))):
+            digest.update(data)
+            remaining -= len(data)
+        if digest.hexdigest() != checkpoint.digest:
+            error_msg = f"output file '{output_path}' doesn't match its checkpoint digest"
+            raise CheckpointError(error_msg)
+        f.truncate(checkpoint.output_size)
+    return checkpoint, digest
+
+
+def _process_pool(workers: int) -> Executor | None:
+    """Starts the processes solving puzzles, `None` being returned for a single worker."""
+    if workers <= 1:
+        return None
+    # Workers mustn't be forked from this process, which runs the sink's writer thread
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else None
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(start_method))
+
+
+def solve_batch(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    input_path: str | Path,
+    output_path: str | Path,
+    *,
+    engine: EngineName = EngineName.BACKTRACKING,
+    workers: int = 1,
+    checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+    resume: bool = False,
+    output_format: SinkFormat = SinkFormat.TEXT,
+    compression: Compression = Compression.NONE,
+    dedup: DedupMode = DedupMode.NONE,
+    dedup_index: DedupIndex | None = None,
+    telemetry: BatchTelemetry | None = None,
+    profiler: StageProfiler | None = None,
+) -> Checkpoint:
+    """Solves every puzzle of a file, one per line, and writes the results in input order.
+
+    Puzzles are solved by blocks of `checkpoint_interval`, results being handed to a sink that
+    writes them from a background thread. After each block the sink is synced to disk and a
+    checkpoint recording the input offset and the digest of the output is saved next to it, so
+    that an interrupted run can be resumed. Duplicated puzzles can be solved once, their solution
+    being fanned out to every duplicate. Lines that aren't puzzles of 81 characters are given no
+    solution rather than stopping the run.
+
+    :param input_path: path of the file containing one puzzle of 81 characters per line.
+    :param output_path: path of the file to write the solutions to.
+    :param engine: engine solving the sudokus.
+    :param workers: number of processes solving puzzles.
+    :param checkpoint_interval: number of puzzles solved between two checkpoints.
+    :param resume: whether to skip the puzzles already solved according to the checkpoint and
+        append to the existing output.
+    :param output_format: format of the output, see `SinkFormat`.
+    :param compression: compression of the output, see `Compression`.
+    :param dedup: way puzzles are recognized as duplicates, see `DedupMode`.
+    :param dedup_index: index remembering the solutions of the puzzles seen, a new exact index
+        being used if not given. It bounds the memory used to deduplicate.
+    :param telemetry: `BatchTelemetry` accounting for every puzzle handled. It is left open.
+    :param profiler: `StageProfiler` accumulating the stages of every puzzle solved, across
+        blocks. It measures the current process only, so it requires a single worker.
+    :returns: `Checkpoint` of the completed run.
+    :raises: `CheckpointError` when resuming from a checkpoint not matching the output.
+    :raises: `ValueError` when given a profiler along with several workers.
+    """
+    if profiler is not None and workers > 1:
+        error_msg = f"Profiling requires a single worker, got '{workers}'"
+        raise ValueError(error_msg)
+    input_path, output_path = Path(input_path), Path(output_path)
+    checkpoint_path = output_path.with_name(output_path.name + CHECKPOINT_SUFFIX)
+    append = resume and checkpoint_path.exists()
+    if append:
+        checkpoint, digest = _resume(output_path, checkpoint_path)
+    else:
+        checkpoint, digest = Checkpoint(), hashlib.sha256()
+
+    executor = _process_pool(workers)
+    solve = partial(solve_puzzle, engine=engine, profiler=profiler)
+
+    def solve_many(puzzles: list[str]) -> Iterable[SolveRecord]:
+        records: Iterable[SolveRecord]
+        if executor is None:
+            records = map(solve, puzzles)
+        else:
+            records = executor.map(solve, puzzles, chunksize=CHUNK_SIZE)
+        return records if telemetry is None else telemetry.observe_many(records)
+
+    if dedup is DedupMode.NONE:
+        dedup_index = None
+    elif dedup_index is None:
+        dedup_index = DedupIndex()
+    try:
+        with (
+            Path.open(input_path, "rb") as input_stream,
+            open_sink(
+                output_path, output_format, compression=compression, append=append, digest=digest
+            ) as sink,
+        ):
+            input_stream.seek(checkpoint.input_offset)
+            for block, input_offset in _read_blocks(input_stream, checkpoint_interval):
+                handled = 0 if telemetry is None else telemetry.handled
+                sink.write_many(
+                    solve_many(block)
+                    if dedup_index is None
+                    else _solve_deduplicated(
+                        block,
+                        solve_many=solve_many,
+                        index=dedup_index,
+                        mode=dedup,
+                        engine=engine,
+                    )
+                )
+                sink.sync()
+                if telemetry is not None:
+                    telemetry.observe_duplicates(len(block) - (telemetry.handled - handled))
+
+                checkpoint = Checkpoint(
+                    input_offset=input_offset,
+                    puzzles=checkpoint.puzzles + len(block),
+                    output_size=sink.size,
+                    digest=sink.digest,
+                )
+                checkpoint.save(checkpoint_path)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return checkpoint
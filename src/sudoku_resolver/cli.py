@@ -1,11 +1,30 @@
 """Command line interface entrypoint."""
 
+from contextlib import nullcontext
 from enum import Enum
+from pathlib import Path
 from time import time
+from typing import Optional
 
 import typer
 
+from sudoku_resolver.batch import DEFAULT_CHECKPOINT_INTERVAL, solve_batch
+from sudoku_resolver.constraints import VARIANTS, ConstraintModel, Variant
+from sudoku_resolver.dedup import DEFAULT_MAX_ENTRIES, DedupIndex, DedupMode
+from sudoku_resolver.engines import EngineName
+from sudoku_resolver.profiling import StageProfiler
+from sudoku_resolver.sat import CNF
+from sudoku_resolver.sharding import (
+    DEFAULT_LEASE_TIMEOUT,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_SHARD_SIZE,
+    coordinate,
+    run_worker,
+)
+from sudoku_resolver.sinks import Compression, SinkFormat
 from sudoku_resolver.sudoku import Sudoku
+from sudoku_resolver.telemetry import DEFAULT_REPORT_INTERVAL, BatchTelemetry
+from sudoku_resolver.trace import SearchTracer, Trace, build_search_tree, summarize
 
 app = typer.Typer(no_args_is_help=True)
 
@@ -19,15 +38,265 @@ class SudokuDifficulty(Enum):
 
 
 @app.command("solve", no_args_is_help=True)
-def solve_sudoku(file_path: str = typer.Argument(..., help="Path to sudoku file.")) -> None:
+def solve_sudoku(  # noqa: PLR0913, PLR0917  # pylint: disable=too-many-arguments
+    file_path: str = typer.Argument(..., help="Path to sudoku file."),
+    workers: int = typer.Option(
+        1,
+        help="Number of processes searching the tree in parallel, with the backtracking engine.",
+    ),
+    portfolio: bool = typer.Option(  # noqa: FBT001
+        False,  # noqa: FBT003
+        help="Race several solver configurations and keep the first result.",
+    ),
+    engine: EngineName = typer.Option(EngineName.BACKTRACKING, help="Solving engine."),
+    trace: Optional[str] = typer.Option(  # noqa: UP045
+        None, help="Path of a file to record the backtracking search to."
+    ),
+    variant: Variant = typer.Option(Variant.CLASSIC, help="Sudoku variant."),
+    regions: Optional[str] = typer.Option(  # noqa: UP045
+        None,
+        help="Path to a file of 9 lines of 9 region labels, for an irregular sudoku.",
+    ),
+    profile: bool = typer.Option(  # noqa: FBT001
+        False,  # noqa: FBT003
+        help="Report the time and peak memory of every stage, from parsing to the final check.",
+    ),
+    profile_dir: Optional[str] = typer.Option(  # noqa: UP045
+        None, help="Directory to write the cProfile statistics of every stage to."
+    ),
+) -> None:
     """Solves a sudoku."""
+    model = (
+        VARIANTS[variant]
+        if regions is None
+        else ConstraintModel.irregular(
+            [list(line.strip()) for line in Path(regions).read_text(encoding="utf-8").splitlines()]
+        )
+    )
+    with (
+        StageProfiler(cprofile=profile_dir is not None) if profile or profile_dir else nullcontext()
+    ) as profiler:
+        sudoku = Sudoku(filepath=file_path, model=model, profiler=profiler)
+        print(sudoku.humanize())
+
+        start = time()
+        with SearchTracer(trace, sudoku.grid.values) if trace else nullcontext() as tracer:
+            sudoku.solve(engine=engine, workers=workers, portfolio=portfolio, tracer=tracer)
+        sudoku.check_consistency()
+        end = time() - start
+
+    print("SOLVED SUDOKU:\n\n" + sudoku.humanize() + "\n")
+    if sudoku.winning_configuration is not None:
+        print(f"WINNING CONFIGURATION: {sudoku.winning_configuration.name}")
+    print(f"ELAPSED TIME: {end}")
+    if profiler is not None:
+        print("\nPROFILE:\n\n" + str(profiler.report()))
+        if profile_dir is not None:
+            profiler.dump_stats(profile_dir)
+
+
+@app.command("profile", no_args_is_help=True)
+def profile_sudokus(
+    file_paths: list[str] = typer.Argument(..., help="Paths to sudoku files."),
+    engine: EngineName = typer.Option(EngineName.BACKTRACKING, help="Solving engine."),
+    repeat: int = typer.Option(1, help="Number of times every sudoku is solved."),
+    memory: bool = typer.Option(  # noqa: FBT001
+        True,  # noqa: FBT003
+        help="Trace the peak memory of every stage, which slows every stage down.",
+    ),
+    profile_dir: Optional[str] = typer.Option(  # noqa: UP045
+        None, help="Directory to write the cProfile statistics of every stage to."
+    ),
+) -> None:
+    """Profiles every stage of the pipeline over many sudokus."""
+    with StageProfiler(trace_memory=memory, cprofile=profile_dir is not None) as profiler:
+        for _ in range(repeat):
+            for file_path in file_paths:
+                sudoku = Sudoku(filepath=file_path, profiler=profiler)
+                sudoku.solve(engine=engine)
+                sudoku.check_consistency()
+
+    print(f"SOLVED SUDOKUS: {repeat * len(file_paths)}\n")
+    print(profiler.report())
+    if profile_dir is not None:
+        profiler.dump_stats(profile_dir)
+
+
+@app.command("replay", no_args_is_help=True)
+def replay_trace(
+    trace_path: str = typer.Argument(..., help="Path to a search trace file."),
+    max_depth: Optional[int] = typer.Option(  # noqa: UP045
+        None, help="Deepest level of the tree printed."
+    ),
+) -> None:
+    """Rebuilds the search tree of a trace and the grid it ended on."""
+    trace = Trace.load(trace_path)
+    for depth, node in build_search_tree(trace).walk(-1):
+        if node.value_index is None or (max_depth is not None and depth > max_depth):
+            continue
+        outcome = " x" if node.failed else ""
+        print(f"{'  ' * depth}{node.value_index} = {node.value}{outcome}")
+    print(
+        "\nFINAL GRID:\n\n"
+        + Sudoku.from_string("".join(str(value) for value in trace.replay().ravel())).humanize()
+    )
+
+
+@app.command("trace-summary", no_args_is_help=True)
+def summarize_trace(
+    trace_path: str = typer.Argument(..., help="Path to a search trace file."),
+    hot_cells: int = typer.Option(10, help="Number of hot cells reported."),
+) -> None:
+    """Prints event counts, depth histogram and hot cells of a trace."""
+    print(summarize(Trace.load(trace_path), hot_cells=hot_cells))
+
+
+@app.command("export-dimacs", no_args_is_help=True)
+def export_dimacs(
+    file_path: str = typer.Argument(..., help="Path to sudoku file."),
+    output_path: str = typer.Argument(..., help="Path of the DIMACS CNF file to write."),
+) -> None:
+    """Exports the SAT encoding of a sudoku in DIMACS CNF format."""
     sudoku = Sudoku.from_file(file_path)
-    print(sudoku.humanize())
+    CNF.from_grid(sudoku.grid).save_dimacs(output_path)
+
 
+@app.command("batch", no_args_is_help=True)
+def solve_sudokus(  # noqa: PLR0913, PLR0917  # pylint: disable=too-many-arguments
+    input_path: str = typer.Argument(..., help="Path to a file containing one sudoku per line."),
+    output_path: str = typer.Argument(..., help="Path of the file to write the solutions to."),
+    engine: EngineName = typer.Option(EngineName.BACKTRACKING, help="Solving engine."),
+    workers: int = typer.Option(1, help="Number of processes solving sudokus."),
+    checkpoint_interval: int = typer.Option(
+        DEFAULT_CHECKPOINT_INTERVAL, help="Number of sudokus solved between two checkpoints."
+    ),
+    resume: bool = typer.Option(  # noqa: FBT001
+        False,  # noqa: FBT003
+        help="Skip the sudokus solved before the last checkpoint and append to the output.",
+    ),
+    output_format: SinkFormat = typer.Option(
+        SinkFormat.TEXT, "--format", help="Format of the output."
+    ),
+    compression: Compression = typer.Option(Compression.NONE, help="Compression of the output."),
+    dedup: DedupMode = typer.Option(
+        DedupMode.NONE, help="Solve duplicated sudokus once, comparing raw or canonical forms."
+    ),
+    dedup_max_entries: int = typer.Option(
+        DEFAULT_MAX_ENTRIES, help="Number of distinct sudokus remembered to deduplicate."
+    ),
+    approximate_dedup: bool = typer.Option(  # noqa: FBT001
+        False,  # noqa: FBT003
+        help="Remember sudokus by 64-bit digests, to deduplicate larger inputs in less memory.",
+    ),
+    report_interval: float = typer.Option(
+        DEFAULT_REPORT_INTERVAL, help="Number of seconds between two progress reports on stderr."
+    ),
+    metrics_path: Optional[str] = typer.Option(  # noqa: UP045
+        None, help="Path of a file to write the metrics to in the Prometheus text format."
+    ),
+    metrics_port: Optional[int] = typer.Option(  # noqa: UP045
+        None, help="Local port to serve the metrics on in the OpenMetrics text format."
+    ),
+    profile: bool = typer.Option(  # noqa: FBT001
+        False,  # noqa: FBT003
+        help="Report the time and peak memory of every stage over the whole batch, with a "
+        "single worker.",
+    ),
+    profile_dir: Optional[str] = typer.Option(  # noqa: UP045
+        None, help="Directory to write the cProfile statistics of every stage to."
+    ),
+) -> None:
+    """Solves a batch of sudokus."""
+    telemetry = BatchTelemetry(
+        workers=workers, report_interval=report_interval, metrics_path=metrics_path
+    )
+    if metrics_port is not None:
+        telemetry.serve(metrics_port)
     start = time()
-    sudoku.solve()
-    sudoku.check_consistency()
+    try:
+        with (
+            StageProfiler(cprofile=profile_dir is not None)
+            if profile or profile_dir
+            else nullcontext()
+        ) as profiler:
+            checkpoint = solve_batch(
+                input_path,
+                output_path,
+                engine=engine,
+                workers=workers,
+                checkpoint_interval=checkpoint_interval,
+                resume=resume,
+                output_format=output_format,
+                compression=compression,
+                dedup=dedup,
+                dedup_index=DedupIndex(
+                    max_entries=dedup_max_entries, approximate=approximate_dedup
+                ),
+                telemetry=telemetry,
+                profiler=profiler,
+            )
+    finally:
+        telemetry.close()
     end = time() - start
 
-    print("SOLVED SUDOKU:\n\n" + sudoku.humanize() + "\n")
+    print(f"SOLVED SUDOKUS: {checkpoint.puzzles}")
+    print(f"ELAPSED TIME: {end}")
+    if profiler is not None:
+        print("\nPROFILE:\n\n" + str(profiler.report()))
+        if profile_dir is not None:
+            profiler.dump_stats(profile_dir)
+
+
+@app.command("batch-coordinator", no_args_is_help=True)
+def coordinate_sudokus(  # noqa: PLR0913, PLR0917  # pylint: disable=too-many-arguments
+    input_path: str = typer.Argument(..., help="Path to a file containing one sudoku per line."),
+    output_path: str = typer.Argument(..., help="Path of the file to write the solutions to."),
+    job_path: str = typer.Argument(..., help="Path of a job directory shared with the workers."),
+    engine: EngineName = typer.Option(EngineName.BACKTRACKING, help="Solving engine."),
+    shard_size: int = typer.Option(DEFAULT_SHARD_SIZE, help="Number of sudokus per shard."),
+    output_format: SinkFormat = typer.Option(
+        SinkFormat.TEXT, "--format", help="Format of the output."
+    ),
+    compression: Compression = typer.Option(Compression.NONE, help="Compression of the output."),
+    lease_timeout: float = typer.Option(
+        DEFAULT_LEASE_TIMEOUT,
+        help="Seconds after which the shard of a silent worker is reassigned.",
+    ),
+    poll_interval: float = typer.Option(
+        DEFAULT_POLL_INTERVAL, help="Seconds between two looks at the job directory."
+    ),
+) -> None:
+    """Splits a batch of sudokus into shards for workers, then merges their solutions."""
+    start = time()
+    job = coordinate(
+        input_path,
+        output_path,
+        job_path,
+        shard_size=shard_size,
+        engine=engine,
+        output_format=output_format,
+        compression=compression,
+        lease_timeout=lease_timeout,
+        poll_interval=poll_interval,
+    )
+    end = time() - start
+
+    print(f"SOLVED SHARDS: {job.shards}")
+    print(f"ELAPSED TIME: {end}")
+
+
+@app.command("batch-worker", no_args_is_help=True)
+def work_on_sudokus(
+    job_path: str = typer.Argument(..., help="Path of the job directory of a coordinator."),
+    workers: int = typer.Option(1, help="Number of processes solving sudokus."),
+    poll_interval: float = typer.Option(
+        DEFAULT_POLL_INTERVAL, help="Seconds between two looks at the job directory."
+    ),
+) -> None:
+    """Solves the shards of a coordinated batch until every shard is done."""
+    start = time()
+    shards = run_worker(job_path, workers=workers, poll_interval=poll_interval)
+    end = time() - start
+
+    print(f"SOLVED SHARDS: {shards}")
     print(f"ELAPSED TIME: {end}")
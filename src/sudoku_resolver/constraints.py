@@ -0,0 +1,194 @@
+"""Module defining the constraint models of the sudoku variants, compiled into lookup tables.
+
+A model is a list of units, groups of 9 cells that must each hold every digit once: rows,
+columns and subgrids for classic sudokus, plus diagonals for X-Sudokus or windows for
+Hyper-Sudokus, while irregular sudokus replace subgrids with arbitrary regions. Cells are
+numbered row * 9 + column.
+"""
+
+from collections.abc import Sequence
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from numpy import typing as npt
+
+if TYPE_CHECKING:
+    from .grid import Index
+
+_CELLS = np.arange(81).reshape(9, 9)
+# Rows, columns then subgrids
+_CLASSIC_UNITS = np.concatenate(
+    [_CELLS, _CELLS.T, _CELLS.reshape(3, 3, 3, 3).transpose(0, 2, 1, 3).reshape(9, 9)]
+)
+_DIAGONALS = np.stack([_CELLS.diagonal(), np.fliplr(_CELLS).diagonal()])
+_WINDOWS = np.stack([_CELLS[i : i + 3, j : j + 3].ravel() for i in (1, 5) for j in (1, 5)])
+# Kinds of the units, as named in messages
+_LINES_KINDS = ("row",) * 9 + ("column",) * 9
+_CLASSIC_KINDS = (*_LINES_KINDS, *("subgrid",) * 9)
+
+
+class Variant(Enum):
+    """Enumeration of the predefined sudoku variants."""
+
+    CLASSIC = "classic"
+    X = "x"
+    HYPER = "hyper"
+
+
+class ConstraintModel:
+    """Units of a sudoku variant, compiled once into tables shared by every grid.
+
+    Besides the units themselves, the model holds the label of every unit, the units of every
+    cell, the peers of every cell, i.e. the cells sharing a unit with it, the peers sharing
+    several units with it, and the units and peers as 81-bit masks. A model is immutable:
+    copying it returns the same model.
+    """
+
+    def __init__(
+        self,
+        units: npt.ArrayLike,
+        *,
+        name: str = "custom",
+        unit_kinds: Sequence[str] | None = None,
+    ) -> None:
+        """Compiles the model.
+
+        :param units: cells of every unit, of shape (U, 9).
+        :param name: name of the model.
+        :param unit_kinds: kind of every unit, e.g. 'row', units being numbered within their
+            kind. Every unit is of kind 'unit' if not given.
+        :raises: `ValueError` when a unit doesn't hold 9 distinct cells of the grid, or when
+            there isn't one kind per unit.
+        """
+        array = np.array(units, dtype=np.intp)
+        if array.ndim != 2 or array.shape[1] != 9:  # noqa: PLR2004
+            error_msg = f"Expected units of shape (U, 9), got '{array.shape}'"
+            raise ValueError(error_msg)
+        unit_kinds = ("unit",) * len(array) if unit_kinds is None else tuple(unit_kinds)
+        if len(unit_kinds) != len(array):
+            error_msg = f"Expected {len(array)} unit kinds, got '{len(unit_kinds)}'"
+            raise ValueError(error_msg)
+        repeated = (np.diff(np.sort(array, axis=1), axis=1) == 0).any()
+        if repeated or ((array < 0) | (array > 80)).any():  # noqa: PLR2004
+            error_msg = "Every unit must hold 9 distinct cells numbered from 0 to 80"
+            raise ValueError(error_msg)
+        array.setflags(write=False)
+        self.name = name
+        self.units = array
+        self.unit_kinds = unit_kinds
+        # Kind of every unit along with its number among the units of that kind
+        self.unit_labels: tuple[tuple[str, int], ...] = tuple(
+            (kind, unit_kinds[:unit].count(kind)) for unit, kind in enumerate(unit_kinds)
+        )
+        self.membership = np.zeros((len(array), 81), dtype=np.bool_)
+        self.membership[np.arange(len(array))[:, None], array] = True
+        self.membership.setflags(write=False)
+
+        units_cells: list[list[Index]] = [
+            [divmod(cell, 9) for cell in unit] for unit in array.tolist()
+        ]
+        self.cells_units: dict[Index, tuple[int, ...]] = {
+            (i, j): tuple(np.flatnonzero(self.membership[:, i * 9 + j]).tolist())
+            for i in range(9)
+            for j in range(9)
+        }
+        # Deduplicated through a set, so that peers are iterated in set order rather than unit
+        # order: the same order as the former neighbours tables, which searches depend on
+        self.peers: dict[Index, tuple[Index, ...]] = {
+            index: tuple(
+                {peer for unit in cell_units for peer in units_cells[unit] if peer != index}
+            )
+            for index, cell_units in self.cells_units.items()
+        }
+        # Peers sharing several units with a cell, along with the number of units they share
+        # beyond the first one
+        self.overlaps: dict[Index, tuple[tuple[Index, int], ...]] = {}
+        for index, cell_units in self.cells_units.items():
+            shared: dict[Index, int] = {}
+            for unit in cell_units:
+                for peer in units_cells[unit]:
+                    if peer != index:
+                        shared[peer] = shared.get(peer, 0) + 1
+            self.overlaps[index] = tuple(
+                (peer, count - 1) for peer, count in shared.items() if count > 1
+            )
+        self.unit_masks = tuple(sum(1 << cell for cell in unit) for unit in array.tolist())
+        self.peer_masks = tuple(
+            sum(1 << (i * 9 + j) for i, j in self.peers[divmod(cell, 9)]) for cell in range(81)
+        )
+
+    @classmethod
+    def classic(cls) -> "ConstraintModel":
+        """Builds the model of classic sudokus: rows, columns and subgrids."""
+        return cls(_CLASSIC_UNITS, name=Variant.CLASSIC.value, unit_kinds=_CLASSIC_KINDS)
+
+    @classmethod
+    def x_sudoku(cls) -> "ConstraintModel":
+        """Builds the model of X-Sudokus, whose two diagonals are units too."""
+        return cls(
+            np.concatenate([_CLASSIC_UNITS, _DIAGONALS]),
+            name=Variant.X.value,
+            unit_kinds=(*_CLASSIC_KINDS, *("diagonal",) * len(_DIAGONALS)),
+        )
+
+    @classmethod
+    def hyper(cls) -> "ConstraintModel":
+        """Builds the model of Hyper-Sudokus, with four extra 3x3 windows."""
+        return cls(
+            np.concatenate([_CLASSIC_UNITS, _WINDOWS]),
+            name=Variant.HYPER.value,
+            unit_kinds=(*_CLASSIC_KINDS, *("window",) * len(_WINDOWS)),
+        )
+
+    @classmethod
+    def irregular(cls, regions: npt.ArrayLike) -> "ConstraintModel":
+        """Builds the model of an irregular sudoku, whose subgrids are replaced by regions.
+
+        :param regions: region of every cell, of shape (9, 9), holding 9 distinct labels.
+        :returns: `ConstraintModel`.
+        :raises: `ValueError` when there aren't 9 regions of 9 cells.
+        """
+        labels = np.asarray(regions).reshape(-1)
+        names, counts = np.unique(labels, return_counts=True)
+        if labels.size != 81 or len(names) != 9 or (counts != 9).any():  # noqa: PLR2004
+            error_msg = "Expected 9 regions of 9 cells"
+            raise ValueError(error_msg)
+        units = [np.flatnonzero(labels == name) for name in names]
+        return cls(
+            np.concatenate([_CLASSIC_UNITS[:18], units]),
+            name="irregular",
+            unit_kinds=(*_LINES_KINDS, *("region",) * len(units)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    def __repr__(self) -> str:
+        return f"ConstraintModel(name='{self.name}', units={len(self)})"
+
+    def __copy__(self) -> "ConstraintModel":
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "ConstraintModel":
+        return self
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Predefined models are looked up again rather than compiled anew
+        return _load, (self.units, self.name, self.unit_kinds)
+
+
+def _load(units: npt.NDArray[np.intp], name: str, unit_kinds: tuple[str, ...]) -> ConstraintModel:
+    """Rebuilds an unpickled model."""
+    for model in VARIANTS.values():
+        if model.name == name and np.array_equal(model.units, units):
+            return model
+    return ConstraintModel(units, name=name, unit_kinds=unit_kinds)
+
+
+CLASSIC = ConstraintModel.classic()
+VARIANTS: dict[Variant, ConstraintModel] = {
+    Variant.CLASSIC: CLASSIC,
+    Variant.X: ConstraintModel.x_sudoku(),
+    Variant.HYPER: ConstraintModel.hyper(),
+}
@@ -0,0 +1,240 @@
+"""Module containing the keys and the index used to solve duplicated puzzles only once."""
+
+import hashlib
+import itertools
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+
+import numpy as np
+from numpy import typing as npt
+
+from .puzzles import is_puzzle
+
+# Default number of distinct puzzles remembered by a dedup index
+DEFAULT_MAX_ENTRIES = 1_000_000
+# Size of the digests kept instead of the keys by an approximate index
+APPROXIMATE_DIGEST_SIZE = 8
+# Size of a solution packed two digits per byte
+PACKED_SOLUTION_SIZE = 41
+
+
+def _geometric_transforms() -> npt.NDArray[np.intp]:
+    """Builds the cell permutations of every band and stack reordering, with or without transpose.
+
+    :returns: array of shape (72, 81), transformed cell i taking the value of the cell at index i.
+    """
+    transforms = []
+    for transpose in (False, True):
+        for bands in itertools.permutations(range(3)):
+            for stacks in itertools.permutations(range(3)):
+                rows = [bands[i // 3] * 3 + i % 3 for i in range(9)]
+                columns = [stacks[j // 3] * 3 + j % 3 for j in range(9)]
+                cells = np.array([[rows[i] * 9 + columns[j] for j in range(9)] for i in range(9)])
+                transforms.append((cells.T if transpose else cells).ravel())
+    return np.array(transforms, dtype=np.intp)
+
+
+_TRANSFORMS = _geometric_transforms()
+_DIGITS = np.arange(1, 10, dtype=np.uint8)
+
+
+def _to_digits(puzzle: str, /) -> npt.NDArray[np.uint8]:
+    """Converts a puzzle of 81 characters to an array of digits, '.' standing for 0."""
+    return np.frombuffer(puzzle.replace(".", "0").encode("ascii"), dtype=np.uint8) - ord("0")
+
+
+def _to_string(digits: npt.NDArray[np.uint8], /) -> str:
+    """Converts an array of digits to a string."""
+    return (digits + ord("0")).astype(np.uint8).tobytes().decode("ascii")
+
+
+def _pack(solution: str, /) -> bytes:
+    """Packs a solution of 81 digits in 41 bytes, two digits per byte."""
+    digits = np.append(_to_digits(solution), np.uint8(0))
+    return (digits[::2] << 4 | digits[1::2]).astype(np.uint8).tobytes()
+
+
+def _unpack(packed: bytes, /) -> str:
+    """Unpacks a solution packed by `_pack`."""
+    pairs = np.frombuffer(packed, dtype=np.uint8)
+    return _to_string(np.stack([pairs >> 4, pairs & 0x0F], axis=1).ravel()[:81])
+
+
+class DedupMode(Enum):
+    """Enumeration of the ways puzzles are recognized as duplicates."""
+
+    NONE = "none"
+    RAW = "raw"
+    CANONICAL = "canonical"
+
+
+@dataclass(frozen=True)
+class RawForm:
+    """Puzzle keyed by its raw string, empty cells being '0'."""
+
+    key: str
+
+    def to_key_space(self, solution: str) -> str:
+        """Converts a solution of the puzzle to the solution of its key."""
+        return solution
+
+    def from_key_space(self, solution: str) -> str:
+        """Converts a solution of the key to the solution of the puzzle."""
+        return solution
+
+
+@dataclass(frozen=True)
+class CanonicalForm:
+    """Puzzle keyed by the smallest of its symmetric forms.
+
+    Symmetric forms are obtained by reordering bands and stacks, transposing, then relabeling
+    digits in their order of first appearance. Duplicates only differing by these symmetries
+    share a key; swapping rows within a band or columns within a stack isn't accounted for.
+
+    :param key: canonical puzzle.
+    :param permutation: cells permutation, canonical cell i coming from the cell at index i.
+    :param labels: digits relabeling, digit d becoming labels[d] in the canonical puzzle.
+    """
+
+    key: str
+    permutation: npt.NDArray[np.intp]
+    labels: npt.NDArray[np.uint8]
+
+    @classmethod
+    def from_puzzle(cls, puzzle: str) -> "CanonicalForm":
+        """Computes the canonical form of a puzzle.
+
+        :param puzzle: sudoku values, empty cells being either '0' or '.'.
+        :returns: `CanonicalForm`.
+        :raises: `ValueError` when the puzzle isn't 81 digits or dots.
+        """
+        if not is_puzzle(puzzle):
+            error_msg = f"Expected a puzzle of 81 digits, got '{puzzle}'"
+            raise ValueError(error_msg)
+        variants = _to_digits(puzzle)[_TRANSFORMS]
+        occurrences = variants[:, :, None] == _DIGITS
+        first_positions = np.where(
+            occurrences.any(axis=1), occurrences.argmax(axis=1), variants.shape[1]
+        )
+        order = np.argsort(first_positions, axis=1, kind="stable")
+        labels = np.zeros((len(variants), 10), dtype=np.uint8)
+        np.put_along_axis(labels[:, 1:], order, _DIGITS[None, :], axis=1)
+        relabeled = np.take_along_axis(labels, variants.astype(np.intp), axis=1)
+        best = np.lexsort(relabeled.T[::-1])[0]
+        return cls(
+            key=_to_string(relabeled[best]), permutation=_TRANSFORMS[best], labels=labels[best]
+        )
+
+    def to_key_space(self, solution: str) -> str:
+        """Converts a solution of the puzzle to the solution of its key."""
+        return _to_string(self.labels[_to_digits(solution)[self.permutation]])
+
+    def from_key_space(self, solution: str) -> str:
+        """Converts a solution of the key to the solution of the puzzle."""
+        inverse_labels = np.argsort(self.labels).astype(np.uint8)
+        digits = np.empty(81, dtype=np.uint8)
+        digits[self.permutation] = inverse_labels[_to_digits(solution)]
+        return _to_string(digits)
+
+
+def dedup_form(puzzle: str, mode: DedupMode) -> RawForm | CanonicalForm:
+    """Computes the form a puzzle is deduplicated by.
+
+    :param puzzle: sudoku values, empty cells being either '0' or '.'.
+    :param mode: way puzzles are recognized as duplicates, other than `DedupMode.NONE`.
+    :returns: `RawForm` or `CanonicalForm`. Lines that aren't puzzles have no canonical form and
+        are keyed by their raw string.
+    """
+    if mode is DedupMode.CANONICAL and is_puzzle(puzzle):
+        return CanonicalForm.from_puzzle(puzzle)
+    if mode in {DedupMode.RAW, DedupMode.CANONICAL}:
+        return RawForm(puzzle.replace(".", "0"))
+    error_msg = f"Puzzles aren't deduplicated in mode '{mode.value}'"
+    raise ValueError(error_msg)
+
+
+class DedupIndex:
+    """Bounded index of the solutions of the puzzles seen so far, keyed by their dedup form.
+
+    Once full, the least recently used entry is evicted first. Solutions are kept packed in 41
+    bytes. An approximate index also keeps a 64-bit digest of each key instead of the key itself:
+    it holds more entries in the same memory, at the cost of rare collisions. Keys without
+    solution keep a second, independent digest telling them apart from the keys colliding with
+    them, while callers should check the solutions they get against their puzzle.
+    """
+
+    def __init__(
+        self, *, max_entries: int = DEFAULT_MAX_ENTRIES, approximate: bool = False
+    ) -> None:
+        """Initializes the index.
+
+        :param max_entries: maximum number of entries kept.
+        :param approximate: whether to key entries by digest.
+        """
+        self.max_entries = max_entries
+        self.approximate = approximate
+        # Packed solutions, or for keys without solution `None`, or their check digest if
+        # approximate
+        self._entries: OrderedDict[str | bytes, bytes | None] = OrderedDict()
+
+    def _key(self, key: str) -> str | bytes:
+        if self.approximate:
+            return hashlib.blake2b(
+                key.encode("ascii"), digest_size=APPROXIMATE_DIGEST_SIZE
+            ).digest()
+        return key
+
+    @staticmethod
+    def _check(key: str) -> bytes:
+        """Digests a key independently of `_key`, to tell apart keys whose digests collide."""
+        return hashlib.blake2b(
+            key.encode("ascii"), digest_size=APPROXIMATE_DIGEST_SIZE, person=b"check"
+        ).digest()
+
+    def _find(self, key: str) -> str | bytes | None:
+        """Finds the entry of a key, `None` if there is none."""
+        entry_key = self._key(key)
+        if entry_key not in self._entries:
+            return None
+        entry = self._entries[entry_key]
+        if entry is not None and len(entry) != PACKED_SOLUTION_SIZE and entry != self._check(key):
+            # Another key without solution sharing the digest
+            return None
+        return entry_key
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) is not None
+
+    def __getitem__(self, key: str) -> str | None:
+        """Gets the solution of a key, marking it as recently used.
+
+        :param key: key of the puzzle.
+        :returns: solution of the key, `None` if it has none.
+        :raises: `KeyError` if the key isn't in the index.
+        """
+        if (entry_key := self._find(key)) is None:
+            raise KeyError(key)
+        self._entries.move_to_end(entry_key)
+        entry = self._entries[entry_key]
+        return _unpack(entry) if entry is not None and len(entry) == PACKED_SOLUTION_SIZE else None
+
+    def __setitem__(self, key: str, solution: str | None) -> None:
+        """Adds the solution of a key, evicting the least recently used entry if full.
+
+        :param key: key of the puzzle.
+        :param solution: solution of the key, `None` if it has none.
+        """
+        if self.max_entries <= 0:
+            return
+        entry_key = self._key(key)
+        if entry_key not in self._entries and len(self._entries) >= self.max_entries:
+            self._entries.popitem(last=False)
+        if solution is not None:
+            self._entries[entry_key] = _pack(solution)
+        else:
+            self._entries[entry_key] = self._check(key) if self.approximate else None
+        self._entries.move_to_end(entry_key)
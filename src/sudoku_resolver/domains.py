@@ -1,20 +1,68 @@
 """Module containing the definition of a domain and its related methods"""
 
+from collections.abc import Iterable
 from typing import TYPE_CHECKING, TypeAlias
 
+from .constraints import CLASSIC, ConstraintModel
+
 if TYPE_CHECKING:
     from sudoku_resolver.grid import Index
 
 Domain: TypeAlias = set[int]
 
+ALL_VALUES = frozenset(range(1, 10))
+
+# Units of every cell of a classic sudoku, numbered rows first, then columns and subgrids
+CELLS_UNITS: dict["Index", tuple[int, ...]] = CLASSIC.cells_units
+
 
 class Domains:
-    """Defines the domains of a Sudoku."""
+    """Defines the domains of a Sudoku.
+
+    Alongside the domains, the number of cells of every unit whose domain holds a value is kept
+    up to date by every method modifying a domain. Domains modified directly through `domains`
+    items must be followed by a call to `recount`.
+    """
+
+    def __init__(self, model: ConstraintModel = CLASSIC) -> None:
+        """Initializes every domain with every digit.
 
-    def __init__(self) -> None:
-        self.domains: list[list[Domain | None]] = [
-            [set(range(1, 10)) for _ in range(9)] for _ in range(9)
+        :param model: `ConstraintModel` whose units values are counted in.
+        """
+        self.model = model
+        self._domains: list[list[Domain | None]] = [
+            [set(ALL_VALUES) for _ in range(9)] for _ in range(9)
         ]
+        self.counts: list[list[int]] = []
+        self.recount()
+
+    @property
+    def domains(self) -> list[list[Domain | None]]:
+        """Returns every domain, row by row."""
+        return self._domains
+
+    @domains.setter
+    def domains(self, domains: list[list[Domain | None]]) -> None:
+        self._domains = domains
+        self.recount()
+
+    def recount(self) -> None:
+        """Recomputes the number of cells of every unit whose domain holds each value."""
+        self.counts = [[0] * 10 for _ in range(len(self.model))]
+        for index, units in self.model.cells_units.items():
+            for value in ALL_VALUES.intersection(self._domains[index[0]][index[1]] or ()):
+                for unit in units:
+                    self.counts[unit][value] += 1
+
+    def _count(self, values: Iterable[int], domain_index: "Index", increment: int) -> None:
+        """Adds an increment to the counts of some values in the units of a cell.
+
+        Values other than digits, which no sudoku cell can hold, aren't counted.
+        """
+        units = self.model.cells_units[domain_index]
+        for value in ALL_VALUES.intersection(values):
+            for unit in units:
+                self.counts[unit][value] += increment
 
     def get_domain(self, domain_index: "Index", /) -> Domain | None:
         """Gets domain at given index.
@@ -22,7 +70,7 @@ class Domains:
         :param domain_index: index of the domain to get.
         :returns: domain.
         """
-        return self.domains[domain_index[0]][domain_index[1]]
+        return self._domains[domain_index[0]][domain_index[1]]
 
     def set_domain(self, domain: Domain | None, domain_index: "Index") -> None:
         """Sets domain at given index.
@@ -30,10 +78,12 @@ class Domains:
         :param domain: new domain value.
         :param domain_index: index of the domain to set.
         """
-        if self.get_domain(domain_index) is None:
+        if (previous_domain := self.get_domain(domain_index)) is None:
             error_msg = f"Tried to set a 'None' domain at '{domain_index}'"
             raise ValueError(error_msg)
-        self.domains[domain_index[0]][domain_index[1]] = domain
+        self._count(previous_domain, domain_index, -1)
+        self._count(domain or (), domain_index, 1)
+        self._domains[domain_index[0]][domain_index[1]] = domain
 
     def reinitialize_domain(
         self, *, domain_index: "Index", initial_domains: list[list[Domain | None]]
@@ -55,6 +105,19 @@ class Domains:
         :param domain_index: index of the domain to work on.
         :returns: extracted value if domain is not empty, `None` otherwise.
         """
-        if not self.get_domain(domain_index):
+        if not (domain := self.get_domain(domain_index)):
+            return
+        domain.remove(value)
+        self._count((value,), domain_index, -1)
+
+    def discard_values(self, values: Iterable[int], domain_index: "Index") -> None:
+        """Removes values from a domain, if it holds them.
+
+        :param values: values to remove.
+        :param domain_index: index of the domain to work on.
+        """
+        if not (domain := self.get_domain(domain_index)):
             return
-        self.domains[domain_index[0]][domain_index[1]].remove(value)  # type:ignore
+        removed = domain.intersection(values)
+        domain -= removed
+        self._count(removed, domain_index, -1)
@@ -0,0 +1,67 @@
+"""Module defining the common interface of the solving engines and their registry."""
+
+from collections.abc import Callable
+from enum import Enum
+from typing import Protocol
+
+from .backtracking import backtracking, conflict_directed_backjumping
+from .grid import Grid
+from .sat import sat_solve
+from .templates import template_solve
+
+
+class Engine(Protocol):  # pylint: disable=too-few-public-methods
+    """Solving engine.
+
+    An engine fills the grid in place, raises `UnsolvableSudokuError` when the sudoku has no
+    solution and `SearchCancelledError` when `should_stop` asked for the search to stop.
+    """
+
+    def __call__(self, grid: Grid, *, should_stop: Callable[[], bool] | None = None) -> None: ...
+
+
+class EngineName(Enum):
+    """Enumeration of the available engines."""
+
+    BACKTRACKING = "backtracking"
+    BACKJUMPING = "backjumping"
+    SAT = "sat"
+    TEMPLATES = "templates"
+
+
+def _backtracking(grid: Grid, *, should_stop: Callable[[], bool] | None = None) -> None:
+    """Solves a sudoku with chronological backtracking."""
+    backtracking(
+        grid=grid,
+        domains=grid.domains,
+        initial_domains=grid.initial_domains,
+        should_stop=should_stop,
+    )
+
+
+def _backjumping(grid: Grid, *, should_stop: Callable[[], bool] | None = None) -> None:
+    """Solves a sudoku with conflict-directed backjumping."""
+    conflict_directed_backjumping(
+        grid=grid,
+        domains=grid.domains,
+        initial_domains=grid.initial_domains,
+        should_stop=should_stop,
+    )
+
+
+ENGINES: dict[EngineName, Engine] = {
+    EngineName.BACKTRACKING: _backtracking,
+    EngineName.BACKJUMPING: _backjumping,
+    EngineName.SAT: sat_solve,
+    EngineName.TEMPLATES: template_solve,
+}
+
+
+def get_engine(name: EngineName | str, /) -> Engine:
+    """Gets an engine by its name.
+
+    :param name: name of the engine.
+    :returns: engine.
+    :raises: `ValueError` if there is no engine with that name.
+    """
+    return ENGINES[EngineName(name)]
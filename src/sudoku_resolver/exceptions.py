@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .grid import Index
+    from .precheck import Rejection
 
 
 class ConsistencyError(Exception):
@@ -33,3 +34,76 @@ class ValueAssignmentError(Exception):
 
     def __str__(self) -> str:
         return f"Failed to assign a value at given index '{self.value_index}'"
+
+
+class UnsolvableSudokuError(Exception):
+    """Unsolvable sudoku error.
+
+    Raised when the search space has been exhausted without finding a solution.
+    """
+
+    def __str__(self) -> str:
+        return "Sudoku has no solution"
+
+
+class InvalidSudokuError(UnsolvableSudokuError):
+    """Invalid sudoku error.
+
+    Raised when a sudoku is rejected before any search, e.g. because a given is duplicated.
+    """
+
+    def __init__(self, rejection: "Rejection") -> None:
+        self.rejection = rejection
+
+    def __str__(self) -> str:
+        return f"Sudoku has no solution: {self.rejection}"
+
+
+class SearchCancelledError(Exception):
+    """Search cancelled error.
+
+    Raised when a search is stopped before completion, e.g. because another worker found a
+    solution first.
+    """
+
+    def __str__(self) -> str:
+        return "Search has been cancelled"
+
+
+class SearchCutoffError(SearchCancelledError):
+    """Search cutoff error.
+
+    Raised when a search reaches its backtracks limit before completion.
+    """
+
+    def __init__(self, max_backtracks: int) -> None:
+        self.max_backtracks = max_backtracks
+
+    def __str__(self) -> str:
+        return f"Search has been given up after '{self.max_backtracks}' backtracks"
+
+
+class CheckpointError(Exception):
+    """Checkpoint error.
+
+    Raised when a batch run can't be resumed from its checkpoint.
+    """
+
+    def __init__(self, reason: str) -> None:
+        self.reason = reason
+
+    def __str__(self) -> str:
+        return f"Can't resume from checkpoint: {self.reason}"
+
+
+class TraceError(Exception):
+    """Trace error.
+
+    Raised when a search trace file can't be read.
+    """
+
+    def __init__(self, reason: str) -> None:
+        self.reason = reason
+
+    def __str__(self) -> str:
+        return f"Can't read search trace: {self.reason}"
@@ -2,14 +2,16 @@
 
 import copy
 from collections import deque
-from functools import cache, reduce
 from typing import TypeAlias
 
 import numpy as np
 from numpy import typing as npt
 
-from .domains import Domains
+from .constraints import CLASSIC, ConstraintModel
+from .domains import ALL_VALUES, Domain, Domains
 from .exceptions import ValueAssignmentError
+from .profiling import Stage, StageProfiler, profile_stage
+from .tensors import from_bitmasks
 
 Index: TypeAlias = tuple[int, int]
 
@@ -17,14 +19,74 @@ Index: TypeAlias = tuple[int, int]
 class Grid:
     """Sudoku grid containing all values."""
 
-    def __init__(self, values: npt.NDArray[np.uint8]) -> None:
+    def __init__(
+        self,
+        values: npt.NDArray[np.uint8],
+        domains: Domains | None = None,
+        *,
+        model: ConstraintModel | None = None,
+        profiler: StageProfiler | None = None,
+    ) -> None:
+        """Initializes the grid.
+
+        :param values: array containing the sudoku values, 0 standing for an empty cell.
+        :param domains: already preprocessed domains. If not given, they are computed from values.
+        :param model: `ConstraintModel` of the sudoku. Defaults to the model of the domains if
+            given, to the classic model otherwise.
+        :param profiler: `StageProfiler` measuring the domains preprocessing and AC-3.
+        """
         self._values = values
+        self.profiler = profiler
+        self.model = model or (domains.model if domains is not None else CLASSIC)
 
-        self.domains = Domains()
-        self.preprocess_domains(self.domains)
+        if domains is None:
+            domains = Domains(self.model)
+            self.preprocess_domains(domains)
+        self.domains = domains
         self.initial_domains = copy.deepcopy(self.domains.domains)
 
-        self._initial_assigned_values_indexes = self.assigned_values_indexes
+        self._givens = values != 0
+        # Sets reused by `reset`, allocated on its first call
+        self._domains_buffers: list[list[Domain]] | None = None
+        self._initial_domains_buffers: list[list[Domain]] | None = None
+
+    def reset(self, values: npt.ArrayLike) -> None:
+        """Loads new values into the grid, reusing its arrays and domains sets.
+
+        Values are copied into the grid's array, so that a single grid can solve many sudokus
+        without allocating new domains nor deep copying them.
+
+        :param values: sudoku values of shape (9, 9) or (81,), 0 standing for an empty cell.
+        """
+        np.copyto(self._values, np.reshape(values, (9, 9)), casting="unsafe")
+        np.not_equal(self._values, 0, out=self._givens)
+        if self._domains_buffers is None or self._initial_domains_buffers is None:
+            self._domains_buffers = [[set() for _ in range(9)] for _ in range(9)]
+            self._initial_domains_buffers = [[set() for _ in range(9)] for _ in range(9)]
+
+        # Searches may leave initial domains sets in the domains, the buffers are reassigned so
+        # that both never share a set
+        domains = self.domains.domains
+        for i, row in enumerate(self._domains_buffers):
+            for j, domain in enumerate(row):
+                domain.clear()
+                domain.update(ALL_VALUES)
+                domains[i][j] = domain
+        self.domains.recount()
+        self.preprocess_domains(self.domains)
+        for i, row in enumerate(self._initial_domains_buffers):
+            for j, initial_domain in enumerate(row):
+                if (preprocessed_domain := domains[i][j]) is None:
+                    self.initial_domains[i][j] = None
+                    continue
+                initial_domain.clear()
+                initial_domain.update(preprocessed_domain)
+                self.initial_domains[i][j] = initial_domain
+
+    @property
+    def values(self) -> npt.NDArray[np.uint8]:
+        """Returns the array containing the sudoku values."""
+        return self._values
 
     @property
     def unassigned_values_indexes(self) -> list[Index]:
@@ -36,6 +98,41 @@ class Grid:
         """Returns assigned values indexes."""
         return list(tuple(index) for index in np.argwhere(self._values != 0))  # type: ignore
 
+    @property
+    def candidates(self) -> npt.NDArray[np.bool_]:
+        """Returns the candidates of every cell as a (9, 9, 9) boolean tensor.
+
+        `candidates[i, j, d - 1]` is `True` if digit d is in the domain of (i, j), assigned cells
+        holding their value only. The tensor is built from the domains in a single pass, and
+        isn't tied to them: use `load_candidates` to write candidates back.
+        """
+        masks = np.fromiter(
+            (
+                sum(1 << value for value in domain) if domain else 0
+                for row in self.domains.domains
+                for domain in row
+            ),
+            dtype=np.uint16,
+            count=81,
+        ).reshape(9, 9)
+        assigned = self._values != 0
+        masks[assigned] = np.left_shift(1, self._values[assigned], dtype=np.uint16)
+        return from_bitmasks(masks)
+
+    def load_candidates(self, candidates: npt.ArrayLike) -> None:
+        """Replaces the domains of the unassigned cells with candidates from a tensor.
+
+        :param candidates: boolean tensor of shape (9, 9, 9), as returned by `candidates`.
+        """
+        tensor = np.asarray(candidates, dtype=np.bool_)
+        if tensor.shape != (9, 9, 9):
+            error_msg = f"Expected candidates of shape (9, 9, 9), got '{tensor.shape}'"
+            raise ValueError(error_msg)
+        domains = self.domains.domains
+        for i, j in self.unassigned_values_indexes:
+            domains[i][j] = set((np.flatnonzero(tensor[i, j]) + 1).tolist())
+        self.domains.recount()
+
     def get_value(self, value_index: Index, /) -> int:
         """Gets the value at given index.
 
@@ -51,7 +148,7 @@ class Grid:
         :param value_index: index of the value to set.
         :raises `ValueAssignmentError`
         """
-        if value_index in self._initial_assigned_values_indexes:
+        if self._givens[value_index[0], value_index[1]]:
             raise ValueAssignmentError(value_index)
         self._values[value_index[0]][value_index[1]] = value
 
@@ -67,17 +164,18 @@ class Grid:
 
         :param domains: domains to clean.
         """
-        for index in self.assigned_values_indexes:
-            domains.set_domain(None, index)
-        for index in self.unassigned_values_indexes:
-            neighbor_values = set()
-            for neighbor_index in self.get_neighbours_indexes(index):
-                if domains.get_domain(neighbor_index) is None:
-                    neighbor_values.add(self.get_value(neighbor_index))
-            domains.domains[index[0]][index[1]] -= neighbor_values  # type:ignore
+        with profile_stage(self.profiler, Stage.PREPROCESS):
+            for index in self.assigned_values_indexes:
+                domains.set_domain(None, index)
+            for index in self.unassigned_values_indexes:
+                neighbor_values = set()
+                for neighbor_index in self.get_neighbours_indexes(index):
+                    if domains.get_domain(neighbor_index) is None:
+                        neighbor_values.add(self.get_value(neighbor_index))
+                domains.discard_values(neighbor_values, index)
 
     def get_horizontal_neighbours_indexes(self, value_index: Index, /) -> list[Index]:
-        """Gets horizontal neighbours indexes.
+        """Gets horizontal neighbours indexes, whatever the model.
 
         :param value_index: index of the value to get neighbours indexes from.
         :returns: list containing neighbours' indexes in the row.
@@ -86,7 +184,7 @@ class Grid:
         return [(i, j) for j in range(9) if (i, j) != value_index]
 
     def get_vertical_neighbours_indexes(self, value_index: Index, /) -> list[Index]:
-        """Gets vertical neighbours indexes.
+        """Gets vertical neighbours indexes, whatever the model.
 
         :param value_index: index of the value to get neighbours indexes from.
         :returns: list containing neighbours' indexes in the column.
@@ -95,7 +193,7 @@ class Grid:
         return [(i, j) for i in range(9) if (i, j) != value_index]
 
     def get_subgrid_neighbours_indexes(self, value_index: Index, /) -> list[Index]:
-        """Gets subgrid neighbours indexes.
+        """Gets the neighbours indexes in the 3x3 subgrid, whatever the model.
 
         :param value_index: index of the value to get the subgrid neighbours indexes from.
         :returns: list containing neighbours' indexes in the subgrid.
@@ -108,20 +206,13 @@ class Grid:
             if (i_, j_) != (i, j)
         )
 
-    @cache  # pylint: disable=method-cache-max-size-none
-    def get_neighbours_indexes(self, value_index: Index, /) -> list[Index]:
-        """Gets all neighbours indexes.
+    def get_neighbours_indexes(self, value_index: Index, /) -> tuple[Index, ...]:
+        """Gets all neighbours indexes, i.e. the cells sharing a unit of the model with a cell.
 
         :param value_index: index of the value to get the neighbours indexes from.
-        :returns: list containing every indexes.
+        :returns: tuple containing every indexes.
         """
-        return list(
-            set(
-                self.get_horizontal_neighbours_indexes(value_index)
-                + self.get_vertical_neighbours_indexes(value_index)
-                + self.get_subgrid_neighbours_indexes(value_index)
-            )
-        )
+        return self.model.peers[value_index]
 
     def get_neighbours_values(self, value_index: Index, /) -> list[int]:
         """Gets all neighbours values.
@@ -137,13 +228,11 @@ class Grid:
         :param value_index: index of the value to get the neighbours domains values from.
         :returns: list containing every values.
         """
-        return reduce(
-            lambda x, y: x + y,
-            [
-                list(self.domains.get_domain(index) or [])
-                for index in self.get_neighbours_indexes(value_index)
-            ],
-        )
+        return [
+            value
+            for index in self.get_neighbours_indexes(value_index)
+            for value in self.domains.get_domain(index) or ()
+        ]
 
     def check_constraints(self, *, value: int, value_index: Index) -> bool:
         """Checks if every constraint is respected for a given value.
@@ -175,49 +264,58 @@ class Grid:
                     smallest_set_indexes.append(value_index)
         return smallest_set_indexes
 
-    def least_constraining_value(self, value_index: Index) -> set[int]:
-        """Returns a list of the values to test, ordered by number of occurences in neighbours'
-        domains.
+    def least_constraining_value(self, value_index: Index) -> list[int]:
+        """Orders the values of a domain, the ones left in the fewest neighbours' domains first.
+
+        A value's weight is the number of neighbours holding it in their domain. It is read from
+        the per-unit counts kept up to date by `Domains`, neighbours sharing several units with
+        the cell being counted once, so that ordering costs a few lookups per value. The cell
+        itself is counted in each of its units, which shifts every weight alike. Ties are broken
+        in natural order.
 
         :param value_index: index of the value's domain to order.
-        returns: ordered domain values.
+        :returns: ordered domain values.
         """
-        neighbours_domains_values = self.get_neighbours_domains_values(value_index)
-        count: dict[int, int] = {}
-        for value in self.domains.get_domain(value_index):  # type: ignore
-            count[value] = neighbours_domains_values.count(value)
-        sorted_count = sorted(count.items(), key=lambda x: x[1])
-        return set(list(zip(*sorted_count))[0])
+        counts = self.domains.counts
+        domains = self.domains.domains
+        units = [counts[unit] for unit in self.model.cells_units[value_index]]
+        overlaps = [
+            (domain, extra)
+            for (i, j), extra in self.model.overlaps[value_index]
+            if (domain := domains[i][j])
+        ]
+
+        def weight(value: int) -> tuple[int, int]:
+            shared = sum(extra for domain, extra in overlaps if value in domain)
+            return sum(unit_counts[value] for unit_counts in units) - shared, value
+
+        return sorted(self.domains.get_domain(value_index) or (), key=weight)
 
     def enforce_arc_consistency(self) -> None:
-        """Enforces arc-consistency algorithm (AC-3) on the sudoku."""
-        queue: deque = deque()
+        """Enforces arc-consistency on the sudoku.
 
-        for value_index in self.unassigned_values_indexes:
-            for neighbour in self.get_neighbours_indexes(value_index):
-                queue.append((value_index, neighbour))
-
-        while queue:
-            value_index, neighbour_index = queue.popleft()
-            if self._revise(value_index, neighbour_index):
-                if not self.domains.get_domain(value_index):
-                    return
-                for neighbour in self.get_neighbours_indexes(value_index):
-                    queue.append((neighbour, value_index))
-
-    def _revise(self, value_index: Index, neighbour_index: Index) -> bool:
-        """Removes inconsistent values from the domain of the cell.
-
-        :param value_index: cell to check for consistency.
-        :param neighbour_index: neighbour to check the consistency with.
-        :returns: boolean whether a valiue has been removed or not.
-        """
-        domain = self.domains.get_domain(value_index)
-        neighbour_domain = self.domains.get_domain(neighbour_index)
-        revised = False
-        if domain and neighbour_domain:
-            for value in domain.copy():
-                if not any(value != neighbour_value for neighbour_value in neighbour_domain):
-                    self.domains.pop_value_from_domain(value, value_index)
-                    revised = True
-        return revised
+        Every constraint of a sudoku is a difference: a value always has a support in a
+        neighbour's domain, unless that domain is reduced to the value itself. Arcs towards a
+        cell only need revising once its domain becomes a singleton, so the work queue holds
+        cells rather than arcs, and each cell is queued at most once, when its domain shrinks to
+        a single value.
+        """
+        with profile_stage(self.profiler, Stage.ARC_CONSISTENCY):
+            domains = self.domains.domains
+            queue: deque[Index] = deque(
+                index
+                for index in self.unassigned_values_indexes
+                if len(domains[index[0]][index[1]] or ()) == 1
+            )
+
+            while queue:
+                value_index = queue.popleft()
+                (value,) = domains[value_index[0]][value_index[1]]  # type: ignore[misc]
+                for i, j in self.get_neighbours_indexes(value_index):
+                    neighbour_domain = domains[i][j]
+                    if neighbour_domain and value in neighbour_domain:
+                        self.domains.pop_value_from_domain(value, (i, j))
+                        if not neighbour_domain:
+                            return
+                        if len(neighbour_domain) == 1:
+                            queue.append((i, j))
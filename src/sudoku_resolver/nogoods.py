@@ -0,0 +1,68 @@
+"""Module containing the definition of nogoods and the store they are learned into."""
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, TypeAlias
+
+if TYPE_CHECKING:
+    from sudoku_resolver.grid import Grid, Index
+
+Literal: TypeAlias = tuple["Index", int]
+Nogood: TypeAlias = frozenset[Literal]
+
+
+class NogoodStore:
+    """Bounded store of nogoods, i.e. partial assignments known not to lead to a solution.
+
+    Nogoods are indexed by each of their literals so that the ones involving a given assignment
+    are found without scanning the whole store. Once full, the oldest nogood is evicted first.
+    Long nogoods are not stored: they are seldom completed again and only slow lookups down.
+    """
+
+    def __init__(self, max_size: int, max_length: int) -> None:
+        """Initializes the store.
+
+        :param max_size: maximum number of nogoods kept.
+        :param max_length: maximum number of literals of a stored nogood.
+        """
+        self.max_size = max_size
+        self.max_length = max_length
+        self._nogoods: OrderedDict[Nogood, None] = OrderedDict()
+        self._literals_nogoods: dict[Literal, set[Nogood]] = {}
+
+    def __len__(self) -> int:
+        return len(self._nogoods)
+
+    def __contains__(self, nogood: object) -> bool:
+        return nogood in self._nogoods
+
+    def add(self, nogood: Nogood) -> None:
+        """Adds a nogood to the store, evicting the oldest one if the store is full.
+
+        :param nogood: literals that can't be assigned together.
+        """
+        if not 0 < len(nogood) <= self.max_length or nogood in self._nogoods or self.max_size <= 0:
+            return
+        if len(self._nogoods) >= self.max_size:
+            evicted, _ = self._nogoods.popitem(last=False)
+            for literal in evicted:
+                self._literals_nogoods[literal].discard(evicted)
+        self._nogoods[nogood] = None
+        for literal in nogood:
+            self._literals_nogoods.setdefault(literal, set()).add(nogood)
+
+    def find_violated(self, *, grid: "Grid", value: int, value_index: "Index") -> Nogood | None:
+        """Finds a nogood that assigning a value would complete.
+
+        :param grid: `Grid` containing the current assignment.
+        :param value: value about to be assigned.
+        :param value_index: index of the cell the value would be assigned to.
+        :returns: nogood whose other literals are all assigned, `None` if there isn't any.
+        """
+        for nogood in self._literals_nogoods.get((value_index, value), ()):
+            if all(
+                grid.get_value(index) == literal_value
+                for index, literal_value in nogood
+                if index != value_index
+            ):
+                return nogood
+        return None
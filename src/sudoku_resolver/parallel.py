@@ -0,0 +1,196 @@
+"""Module containing methods to solve a single sudoku by searching its tree in parallel."""
+
+import copy
+import multiprocessing
+import os
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from multiprocessing.synchronize import Event
+from typing import TypeVar
+
+import numpy as np
+from numpy import typing as npt
+
+from .backtracking import backtracking
+from .constraints import CLASSIC, ConstraintModel
+from .domains import Domain, Domains
+from .exceptions import SearchCancelledError, UnsolvableSudokuError
+from .grid import Grid, Index
+
+# Number of subproblems generated per worker. Splitting the tree in more parts than there are
+# workers lets idle workers pick up pending subproblems while others are still busy with harder
+# branches.
+SUBPROBLEMS_PER_WORKER = 8
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_cancel_event: Event | None = None
+
+
+@dataclass(frozen=True)
+class Subproblem:
+    """Independent part of a search tree: a partial assignment and the matching domains."""
+
+    values: npt.NDArray[np.uint8]
+    domains: list[list[Domain | None]]
+    model: ConstraintModel = CLASSIC
+
+    @property
+    def is_complete(self) -> bool:
+        """Returns `True` if every cell of the subproblem has been assigned."""
+        return not (self.values == 0).any()
+
+
+def _branch(grid: Grid, subproblem: Subproblem) -> list[Subproblem]:
+    """Expands a subproblem on its cell with the smallest domain.
+
+    Each value of the cell's domain gives a child subproblem whose neighbours' domains are
+    pruned (forward checking). Children with an empty domain are dropped.
+
+    :param grid: `Grid` used to get the neighbours of a cell.
+    :param subproblem: subproblem to expand.
+    :returns: list of children subproblems.
+    """
+    unassigned_indexes: list[Index] = [
+        (i, j) for i in range(9) for j in range(9) if subproblem.domains[i][j] is not None
+    ]
+    index = min(unassigned_indexes, key=lambda x: len(subproblem.domains[x[0]][x[1]] or ()))
+    neighbours_indexes = grid.get_neighbours_indexes(index)
+    neighbours_values = {int(subproblem.values[i][j]) for i, j in neighbours_indexes}
+
+    children: list[Subproblem] = []
+    for value in sorted(subproblem.domains[index[0]][index[1]] or ()):
+        if value in neighbours_values:
+            continue
+        values = subproblem.values.copy()
+        values[index[0]][index[1]] = value
+        domains = copy.deepcopy(subproblem.domains)
+        domains[index[0]][index[1]] = None
+        for i, j in neighbours_indexes:
+            domain = domains[i][j]
+            if domain is not None:
+                domain.discard(value)
+                if not domain:
+                    break
+        else:
+            children.append(Subproblem(values=values, domains=domains, model=subproblem.model))
+    return children
+
+
+def split_search_tree(grid: Grid, *, max_subproblems: int) -> list[Subproblem]:
+    """Expands the top levels of the search tree into independent subproblems.
+
+    Levels are expanded one at a time until there are at least `max_subproblems` subproblems. If
+    a complete assignment is reached while expanding, it is returned on its own.
+
+    :param grid: `Grid` containing the sudoku to split. It is left untouched.
+    :param max_subproblems: number of subproblems above which the expansion stops.
+    :returns: list of subproblems, empty if the sudoku has no solution.
+    """
+    frontier = [
+        Subproblem(
+            values=grid.values.copy(),
+            domains=copy.deepcopy(grid.domains.domains),
+            model=grid.model,
+        )
+    ]
+    while frontier and len(frontier) < max_subproblems:
+        for subproblem in frontier:
+            if subproblem.is_complete:
+                return [subproblem]
+        frontier = [child for subproblem in frontier for child in _branch(grid, subproblem)]
+    return frontier
+
+
+def _initialize_worker(cancel_event: Event) -> None:
+    """Stores the shared cancellation event in the worker process.
+
+    :param cancel_event: event set once a result has been found.
+    """
+    global _cancel_event  # noqa: PLW0603  # pylint: disable=global-statement
+    _cancel_event = cancel_event
+
+
+def is_cancelled() -> bool:
+    """Returns `True` once another worker of the pool has found a result.
+
+    Meant to be given as `should_stop` callback to the searches run by `race`.
+    """
+    return _cancel_event is not None and _cancel_event.is_set()
+
+
+def race(
+    function: Callable[[T], R | None], arguments: Iterable[T], *, max_workers: int
+) -> tuple[T, R] | None:
+    """Runs a function on every argument in a pool of processes until one returns a result.
+
+    Pending arguments are pulled by workers as soon as they are idle. Once a result has been
+    found, pending calls are cancelled and running ones are asked to stop through `is_cancelled`.
+
+    :param function: picklable function returning `None` when it has no result.
+    :param arguments: arguments to call the function with, in order of submission.
+    :param max_workers: number of processes.
+    :returns: first argument to give a result along with that result, `None` if none did.
+    """
+    context = multiprocessing.get_context()
+    cancel_event = context.Event()
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=context,
+        initializer=_initialize_worker,
+        initargs=(cancel_event,),
+    ) as executor:
+        pending = {executor.submit(function, argument): argument for argument in arguments}
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    argument = pending.pop(future)
+                    if (result := future.result()) is not None:
+                        return argument, result
+        finally:
+            cancel_event.set()
+            executor.shutdown(cancel_futures=True)
+    return None
+
+
+def _solve_subproblem(subproblem: Subproblem) -> npt.NDArray[np.uint8] | None:
+    """Solves a subproblem with the backtracking algorithm.
+
+    :param subproblem: subproblem to solve.
+    :returns: solved values, `None` if the subproblem has no solution or has been cancelled.
+    """
+    domains = Domains(subproblem.model)
+    domains.domains = subproblem.domains
+    grid = Grid(subproblem.values, domains)
+    try:
+        backtracking(
+            grid=grid,
+            domains=grid.domains,
+            initial_domains=grid.initial_domains,
+            should_stop=is_cancelled,
+        )
+    except (UnsolvableSudokuError, SearchCancelledError):
+        return None
+    return grid.values
+
+
+def parallel_backtracking(grid: Grid, *, max_workers: int | None = None) -> None:
+    """Solves a sudoku by searching independent subtrees in a pool of processes.
+
+    Pending subproblems are pulled by workers as soon as they are idle, and every worker is
+    cancelled when the first solution is found. The grid is filled in place.
+
+    :param grid: `Grid` containing the sudoku to solve.
+    :param max_workers: number of processes. Defaults to the number of CPUs.
+    :raises: `UnsolvableSudokuError` when no subproblem has a solution.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    subproblems = split_search_tree(grid, max_subproblems=max_workers * SUBPROBLEMS_PER_WORKER)
+    if (winner := race(_solve_subproblem, subproblems, max_workers=max_workers)) is None:
+        raise UnsolvableSudokuError
+    _, solution = winner
+    for index in grid.unassigned_values_indexes:
+        grid.set_value(int(solution[index]), index)
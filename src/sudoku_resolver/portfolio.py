@@ -0,0 +1,121 @@
+"""Module containing methods to race several solver configurations on a sudoku."""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from random import Random
+
+import numpy as np
+from numpy import typing as npt
+
+from .backtracking import ValueOrdering, backtracking, restarting_backtracking
+from .constraints import CLASSIC, ConstraintModel
+from .engines import EngineName, get_engine
+from .exceptions import SearchCancelledError, UnsolvableSudokuError
+from .grid import Grid
+from .parallel import is_cancelled, race
+
+
+@dataclass(frozen=True)
+class SolverConfiguration:
+    """Configuration of one of the solvers of a portfolio.
+
+    :param name: name identifying the configuration.
+    :param engine: engine solving the sudoku.
+    :param value_ordering: order in which the values of a domain are tried.
+    :param restart_base: number of backtracks of the shortest run when restarts are enabled,
+        `None` to search without restarts.
+    :param seed: seed of the random generator. Ties between cells are broken deterministically
+        when not given and restarts are disabled.
+
+    Value ordering, restarts and seed only apply to the backtracking engine.
+    """
+
+    name: str
+    engine: EngineName = EngineName.BACKTRACKING
+    value_ordering: ValueOrdering = ValueOrdering.NATURAL
+    restart_base: int | None = None
+    seed: int | None = None
+
+
+DEFAULT_PORTFOLIO = (
+    SolverConfiguration("natural"),
+    SolverConfiguration("backjumping", engine=EngineName.BACKJUMPING),
+    SolverConfiguration("sat", engine=EngineName.SAT),
+    SolverConfiguration("lcv", value_ordering=ValueOrdering.LEAST_CONSTRAINING),
+    SolverConfiguration(
+        "random-restarts-1", value_ordering=ValueOrdering.RANDOM, restart_base=64, seed=1
+    ),
+    SolverConfiguration(
+        "random-restarts-2", value_ordering=ValueOrdering.RANDOM, restart_base=256, seed=2
+    ),
+)
+
+
+@dataclass(frozen=True)
+class _Job:
+    """Configuration to run on a sudoku, sent to a worker process."""
+
+    configuration: SolverConfiguration
+    values: npt.NDArray[np.uint8]
+    model: ConstraintModel = CLASSIC
+
+
+def _run_configuration(job: _Job) -> npt.NDArray[np.uint8] | None:
+    """Solves a sudoku with the given configuration.
+
+    :param job: configuration and values of the sudoku to solve.
+    :returns: solved values, `None` if the sudoku has no solution or the run has been cancelled.
+    """
+    configuration = job.configuration
+    grid = Grid(job.values.copy(), model=job.model)
+    rng = None if configuration.seed is None else Random(configuration.seed)  # noqa: S311
+    try:
+        if configuration.engine is not EngineName.BACKTRACKING:
+            get_engine(configuration.engine)(grid, should_stop=is_cancelled)
+        elif configuration.restart_base is None:
+            backtracking(
+                grid=grid,
+                domains=grid.domains,
+                initial_domains=grid.initial_domains,
+                should_stop=is_cancelled,
+                value_ordering=configuration.value_ordering,
+                rng=rng,
+            )
+        else:
+            restarting_backtracking(
+                grid=grid,
+                restart_base=configuration.restart_base,
+                rng=rng or Random(),  # noqa: S311
+                value_ordering=configuration.value_ordering,
+                should_stop=is_cancelled,
+            )
+    except (UnsolvableSudokuError, SearchCancelledError):
+        return None
+    return grid.values
+
+
+def portfolio_solve(
+    grid: Grid,
+    *,
+    configurations: Sequence[SolverConfiguration] = DEFAULT_PORTFOLIO,
+    max_workers: int | None = None,
+) -> SolverConfiguration:
+    """Solves a sudoku by racing several configurations in a pool of processes.
+
+    The first configuration to solve the sudoku wins and the others are cancelled. The grid is
+    filled in place.
+
+    :param grid: `Grid` containing the sudoku to solve.
+    :param configurations: configurations to race.
+    :param max_workers: number of processes. Defaults to one per configuration.
+    :returns: winning configuration.
+    :raises: `UnsolvableSudokuError` when the sudoku has no solution.
+    """
+    jobs = [_Job(configuration, grid.values, grid.model) for configuration in configurations]
+    winner = race(_run_configuration, jobs, max_workers=max_workers or len(jobs))
+    if winner is None:
+        raise UnsolvableSudokuError
+    job, solution = winner
+    for index in grid.unassigned_values_indexes:
+        grid.set_value(int(solution[index]), index)
+    return job.configuration
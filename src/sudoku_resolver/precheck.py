@@ -0,0 +1,121 @@
+"""Module containing a fast check rejecting sudokus that obviously have no solution."""
+
+from dataclasses import dataclass, field
+from enum import Enum
+
+import numpy as np
+from numpy import typing as npt
+
+from .constraints import CLASSIC, ConstraintModel
+from .exceptions import InvalidSudokuError
+from .grid import Index
+
+_DIGITS = np.arange(1, 10)
+
+
+class RejectionReason(Enum):
+    """Enumeration of the reasons a sudoku is rejected for."""
+
+    INVALID_VALUE = "invalid value"
+    DUPLICATE_GIVEN = "duplicate given"
+    EMPTY_DOMAIN = "empty domain"
+    DIGIT_WITHOUT_PLACE = "digit without place"
+
+
+@dataclass(frozen=True)
+class Rejection:
+    """Reason a sudoku has no solution.
+
+    :param reason: `RejectionReason`.
+    :param value: offending digit, `None` for an empty domain.
+    :param value_index: index of the offending cell, `None` for a digit without place.
+    :param unit: number of the offending unit in the units of the model, `None` for an invalid
+        value or an empty domain.
+    :param unit_label: kind and number within its kind of the offending unit, as given by the
+        model, e.g. ('diagonal', 0). The unit is described by its number alone if not given.
+    """
+
+    reason: RejectionReason
+    value: int | None = None
+    value_index: Index | None = None
+    unit: int | None = None
+    unit_label: tuple[str, int] | None = field(default=None, compare=False)
+
+    def __str__(self) -> str:
+        description = self.reason.value
+        if self.value is not None:
+            description += f" '{self.value}'"
+        if self.value_index is not None:
+            description += f" at index '{self.value_index}'"
+        if self.unit_label is not None:
+            kind, number = self.unit_label
+            description += f" in {kind} '{number}'"
+        elif self.unit is not None:
+            description += f" in unit '{self.unit}'"
+        return description
+
+
+def _to_index(cell: int, /) -> Index:
+    """Converts a flat cell number to an index."""
+    return int(cell) // 9, int(cell) % 9
+
+
+def find_rejection(values: npt.ArrayLike, *, model: ConstraintModel = CLASSIC) -> Rejection | None:
+    """Looks for a reason a sudoku has no solution, without searching.
+
+    Checks, in order, that values are digits, that no given is duplicated in a unit, that every
+    empty cell has a candidate left and that every digit has a place left in every unit.
+
+    :param values: sudoku values of shape (9, 9) or (81,), 0 standing for an empty cell.
+    :param model: `ConstraintModel` giving the units, rows, columns and subgrids by default.
+    :returns: first `Rejection` found, `None` if the sudoku passes every check.
+    """
+    cells = np.asarray(values).reshape(81)
+    if (invalid_cells := np.flatnonzero(cells > 9)).size:  # noqa: PLR2004
+        cell = invalid_cells[0]
+        return Rejection(
+            RejectionReason.INVALID_VALUE, value=int(cells[cell]), value_index=_to_index(cell)
+        )
+
+    units = model.units
+    units_placed = (cells[:, None] == _DIGITS)[units]
+    counts = units_placed.sum(axis=1)
+    if (duplicates := np.argwhere(counts > 1)).size:
+        unit, digit = duplicates[0]
+        cell = units[unit][units_placed[unit, :, digit]][1]
+        return Rejection(
+            RejectionReason.DUPLICATE_GIVEN,
+            value=int(digit) + 1,
+            value_index=_to_index(cell),
+            unit=int(unit),
+            unit_label=model.unit_labels[unit],
+        )
+
+    placed = counts > 0
+    empty = cells == 0
+    # Number of units of every cell a digit is placed in, shape (81, 9)
+    peers_placed = model.membership.T.astype(np.intp) @ placed
+    candidates = (peers_placed == 0) & empty[:, None]
+    if (empty_domains := np.flatnonzero(empty & ~candidates.any(axis=1))).size:
+        return Rejection(RejectionReason.EMPTY_DOMAIN, value_index=_to_index(empty_domains[0]))
+
+    if (missing := np.argwhere(~placed & ~candidates[units].any(axis=1))).size:
+        unit, digit = missing[0]
+        return Rejection(
+            RejectionReason.DIGIT_WITHOUT_PLACE,
+            value=int(digit) + 1,
+            unit=int(unit),
+            unit_label=model.unit_labels[unit],
+        )
+    return None
+
+
+def precheck(values: npt.ArrayLike, *, model: ConstraintModel = CLASSIC) -> None:
+    """Rejects a sudoku that obviously has no solution, before any search.
+
+    :param values: sudoku values of shape (9, 9) or (81,), 0 standing for an empty cell.
+    :param model: `ConstraintModel` giving the units, rows, columns and subgrids by default.
+    :raises: `InvalidSudokuError` when a reason for the sudoku to have no solution is found.
+    """
+    if (rejection := find_rejection(values, model=model)) is not None:
+        raise InvalidSudokuError(rejection)
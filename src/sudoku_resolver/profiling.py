@@ -0,0 +1,211 @@
+"""Module containing a profiler breaking solves into the stages of the pipeline.
+
+Every stage accumulates its number of calls, its wall time and, if memory is traced, the peak of
+the memory it allocated, over as many solves as the profiler is used for. Stages nest: the time
+of a stage excludes the time of the stages run within it, e.g. the grid construction excludes
+the domains preprocessing, so that the times of every stage add up to the whole pipeline.
+"""
+
+import cProfile
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+
+class Stage(Enum):
+    """Enumeration of the stages of the solving pipeline, in order."""
+
+    PARSE = "parse"
+    GRID = "grid"
+    PREPROCESS = "preprocess_domains"
+    PRECHECK = "precheck"
+    ARC_CONSISTENCY = "ac3"
+    SEARCH = "search"
+    CHECK = "check_consistency"
+
+
+@dataclass
+class StageStats:
+    """Measures of a stage accumulated over every run.
+
+    :param calls: number of runs of the stage.
+    :param elapsed: wall time spent in the stage, stages nested in it excluded, in seconds.
+    :param peak_memory: largest memory allocated by a run of the stage, in bytes.
+    """
+
+    calls: int = 0
+    elapsed: float = 0.0
+    peak_memory: int = 0
+
+
+@dataclass
+class _Frame:
+    """Stage running, on the stack of the profiler."""
+
+    stage: Stage
+    start: float
+    start_memory: int
+    peak_memory: int = 0
+    nested_elapsed: float = 0.0
+
+
+@dataclass(frozen=True)
+class ProfileReport:
+    """Measures of every stage run at least once, in pipeline order.
+
+    :param stages: `StageStats` of every stage.
+    :param trace_memory: whether memory has been traced.
+    """
+
+    stages: dict[Stage, StageStats]
+    trace_memory: bool = True
+
+    @property
+    def elapsed(self) -> float:
+        """Returns the wall time spent in every stage, in seconds."""
+        return sum(stats.elapsed for stats in self.stages.values())
+
+    def __str__(self) -> str:
+        lines = [
+            f"{'STAGE':<20}{'CALLS':>8}{'TOTAL (s)':>12}{'MEAN (ms)':>12}{'SHARE':>8}"
+            + (f"{'PEAK (KiB)':>12}" if self.trace_memory else "")
+        ]
+        elapsed = self.elapsed
+        for stage, stats in self.stages.items():
+            share = stats.elapsed / elapsed if elapsed else 0.0
+            line = (
+                f"{stage.value:<20}{stats.calls:>8}{stats.elapsed:>12.4f}"
+                f"{stats.elapsed / stats.calls * 1000:>12.3f}{share:>8.1%}"
+            )
+            if self.trace_memory:
+                line += f"{stats.peak_memory / 1024:>12.1f}"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+class StageProfiler:
+    """Profiler accumulating the measures of every stage of the solves it is given to.
+
+    Tracing memory slows every allocation down, and so the stages themselves: times measured with
+    `trace_memory` are only meaningful relative to each other. A profiler isn't thread-safe.
+    """
+
+    def __init__(self, *, trace_memory: bool = True, cprofile: bool = False) -> None:
+        """Initializes the profiler, starting to trace memory if asked to.
+
+        :param trace_memory: whether to measure the peak memory of every stage with
+            `tracemalloc`.
+        :param cprofile: whether to run `cProfile` in every stage, see `dump_stats`.
+        """
+        self.trace_memory = trace_memory
+        self.stats: dict[Stage, StageStats] = {}
+        self._profiles: dict[Stage, cProfile.Profile] | None = {} if cprofile else None
+        self._stack: list[_Frame] = []
+        self._started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, stage: Stage) -> Iterator[None]:
+        """Measures a run of a stage.
+
+        :param stage: stage run within the context.
+        """
+        parent = self._stack[-1] if self._stack else None
+        start_memory = 0
+        if self.trace_memory:
+            start_memory, peak_memory = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent.peak_memory = max(parent.peak_memory, peak_memory)
+            tracemalloc.reset_peak()
+        parent_stage = None if parent is None else parent.stage
+        self._switch_profile(parent_stage, stage)
+        frame = _Frame(stage, time.perf_counter(), start_memory)
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - frame.start
+            self._stack.pop()
+            self._switch_profile(stage, parent_stage)
+            stats = self.stats.setdefault(stage, StageStats())
+            stats.calls += 1
+            stats.elapsed += elapsed - frame.nested_elapsed
+            if parent is not None:
+                parent.nested_elapsed += elapsed
+            if self.trace_memory:
+                peak_memory = max(frame.peak_memory, tracemalloc.get_traced_memory()[1])
+                stats.peak_memory = max(stats.peak_memory, peak_memory - frame.start_memory)
+                if parent is not None:
+                    parent.peak_memory = max(parent.peak_memory, peak_memory)
+
+    def _switch_profile(self, current: Stage | None, following: Stage | None) -> None:
+        """Hands `cProfile` over from a stage to another, a single profile running at a time."""
+        if self._profiles is None:
+            return
+        if current is not None:
+            self._profiles[current].disable()
+        if following is not None:
+            self._profiles.setdefault(following, cProfile.Profile()).enable()
+
+    def report(self) -> ProfileReport:
+        """Gathers the measures of the stages run so far.
+
+        :returns: `ProfileReport`.
+        """
+        return ProfileReport(
+            stages={stage: self.stats[stage] for stage in Stage if stage in self.stats},
+            trace_memory=self.trace_memory,
+        )
+
+    def dump_stats(self, directory: str | Path) -> list[Path]:
+        """Writes the `cProfile` statistics of every stage run, to be read with `pstats`.
+
+        :param directory: directory the `<stage>.pstats` files are written to, created if needed.
+        :returns: paths of the files written.
+        :raises: `ValueError` when the profiler doesn't run `cProfile`.
+        """
+        if self._profiles is None:
+            error_msg = "The profiler doesn't run cProfile"
+            raise ValueError(error_msg)
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for stage, profile in self._profiles.items():
+            path = directory / f"{stage.value}.pstats"
+            profile.dump_stats(path)
+            paths.append(path)
+        return paths
+
+    def close(self) -> None:
+        """Stops tracing memory if the profiler started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def profile_stage(profiler: StageProfiler | None, stage: Stage) -> AbstractContextManager[None]:
+    """Measures a run of a stage if there is a profiler.
+
+    :param profiler: `StageProfiler`, nothing being measured if `None`.
+    :param stage: stage run within the context.
+    :returns: context manager.
+    """
+    return nullcontext() if profiler is None else profiler.stage(stage)
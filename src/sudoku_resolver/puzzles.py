@@ -0,0 +1,24 @@
+"""Module containing the parsing of puzzles given as lines of 81 characters."""
+
+import numpy as np
+from numpy import typing as npt
+
+_PUZZLE_CHARACTERS = frozenset("0123456789.")
+
+
+def is_puzzle(line: str) -> bool:
+    """Checks that a line is a puzzle: 81 digits, empty cells being either '0' or '.'.
+
+    :param line: line to check.
+    :returns: `True` if the line is a puzzle.
+    """
+    return len(line) == 81 and _PUZZLE_CHARACTERS.issuperset(line)  # noqa: PLR2004
+
+
+def parse_puzzle(line: str) -> npt.NDArray[np.uint8]:
+    """Parses a puzzle checked by `is_puzzle`.
+
+    :param line: sudoku values, empty cells being either '0' or '.'.
+    :returns: array of the 81 values, 0 standing for an empty cell.
+    """
+    return np.frombuffer(line.replace(".", "0").encode("ascii"), dtype=np.uint8) - ord("0")
@@ -0,0 +1,353 @@
+"""Module containing the SAT encoding of a sudoku and a CDCL solver to solve it."""
+
+import heapq
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from itertools import combinations
+from pathlib import Path
+
+from .backtracking import luby
+from .exceptions import SearchCancelledError, UnsolvableSudokuError
+from .grid import Grid
+
+# Number of conflicts of the shortest run between two restarts
+RESTART_BASE = 64
+# Activity decay of the variables (VSIDS)
+ACTIVITY_DECAY = 0.95
+# Activity above which every activity is rescaled to avoid overflows
+ACTIVITY_LIMIT = 1e100
+# Number of decisions between two calls to the `should_stop` callback
+STOP_CHECK_INTERVAL = 64
+
+
+def variable(row: int, column: int, digit: int) -> int:
+    """Gets the variable meaning "the cell at (row, column) holds digit".
+
+    :param row: row of the cell.
+    :param column: column of the cell.
+    :param digit: digit, between 1 and 9.
+    :returns: variable, between 1 and 729.
+    """
+    return 81 * row + 9 * column + digit
+
+
+def _exactly_one(literals: list[int]) -> Iterator[list[int]]:
+    """Yields the clauses stating that exactly one literal is true.
+
+    :param literals: literals of the constraint.
+    """
+    yield literals
+    for first, second in combinations(literals, 2):
+        yield [-first, -second]
+
+
+@dataclass
+class CNF:
+    """Formula in conjunctive normal form, as a list of clauses of DIMACS literals."""
+
+    num_variables: int
+    clauses: list[list[int]] = field(default_factory=list)
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> "CNF":
+        """Encodes a sudoku grid.
+
+        Every cell holds exactly one digit, every digit appears exactly once in each unit of the
+        grid's constraint model, and every given is a unit clause.
+
+        :param grid: `Grid` containing the sudoku to encode.
+        :returns: `CNF` encoding the sudoku.
+        """
+        cnf = cls(num_variables=729)
+        for i in range(9):
+            for j in range(9):
+                cnf.clauses.extend(_exactly_one([variable(i, j, d) for d in range(1, 10)]))
+        for unit in grid.model.units.tolist():
+            for digit in range(1, 10):
+                cnf.clauses.extend(
+                    _exactly_one([variable(cell // 9, cell % 9, digit) for cell in unit])
+                )
+        for i, j in grid.assigned_values_indexes:
+            cnf.clauses.append([variable(i, j, int(grid.get_value((i, j))))])
+        return cnf
+
+    def to_dimacs(self) -> str:
+        """Renders the formula in the DIMACS CNF format.
+
+        :returns: formula in DIMACS format.
+        """
+        lines = [f"p cnf {self.num_variables} {len(self.clauses)}"]
+        lines.extend(" ".join(map(str, clause)) + " 0" for clause in self.clauses)
+        return "\n".join(lines) + "\n"
+
+    def save_dimacs(self, filepath: str | Path) -> None:
+        """Saves the formula to a file in the DIMACS CNF format.
+
+        :param filepath: path where the formula will be saved.
+        """
+        path = Path(filepath) if isinstance(filepath, str) else filepath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with Path.open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_dimacs())
+
+
+class CDCLSolver:  # pylint: disable=too-many-instance-attributes
+    """Conflict-driven clause learning SAT solver.
+
+    Clauses are propagated with two watched literals, conflicts are analysed up to their first
+    unique implication point and learned, decisions follow the VSIDS heuristic with phase saving,
+    and the search restarts following the Luby sequence.
+    """
+
+    def __init__(self, cnf: CNF) -> None:
+        """Initializes the solver.
+
+        :param cnf: formula to solve.
+        """
+        size = cnf.num_variables + 1
+        self._num_variables = cnf.num_variables
+        self._clauses: list[list[int]] = []
+        # Watchers of a literal are the clauses to visit when that literal becomes false
+        self._watches: dict[int, list[int]] = {}
+        self._values = [0] * size
+        self._levels = [0] * size
+        self._reasons: list[int | None] = [None] * size
+        self._phases = [False] * size
+        self._activities = [0.0] * size
+        self._activity_increment = 1.0
+        self._heap = [(0.0, v) for v in range(1, size)]
+        self._trail: list[int] = []
+        self._trail_limits: list[int] = []
+        self._propagation_head = 0
+        self._unsatisfiable = False
+
+        for clause in cnf.clauses:
+            self._add_clause(sorted(set(clause), key=abs))
+
+    def _value(self, literal: int) -> int:
+        """Gets the value of a literal: 1 if true, -1 if false, 0 if unassigned."""
+        value = self._values[abs(literal)]
+        return value if literal > 0 else -value
+
+    @property
+    def _decision_level(self) -> int:
+        return len(self._trail_limits)
+
+    def _add_clause(self, clause: list[int]) -> None:
+        """Adds an original clause to the solver, at decision level 0.
+
+        :param clause: clause to add.
+        """
+        if not clause:
+            self._unsatisfiable = True
+        elif len(clause) == 1:
+            value = self._value(clause[0])
+            if value == -1:
+                self._unsatisfiable = True
+            elif value == 0:
+                self._enqueue(clause[0], None)
+        else:
+            self._clauses.append(clause)
+            self._watch(len(self._clauses) - 1)
+
+    def _watch(self, clause_index: int) -> None:
+        """Watches the first two literals of a clause."""
+        clause = self._clauses[clause_index]
+        self._watches.setdefault(clause[0], []).append(clause_index)
+        self._watches.setdefault(clause[1], []).append(clause_index)
+
+    def _enqueue(self, literal: int, reason: int | None) -> None:
+        """Assigns a literal to true.
+
+        :param literal: literal to assign.
+        :param reason: index of the clause implying the literal, `None` for a decision.
+        """
+        variable_ = abs(literal)
+        self._values[variable_] = 1 if literal > 0 else -1
+        self._levels[variable_] = self._decision_level
+        self._reasons[variable_] = reason
+        self._trail.append(literal)
+
+    def _propagate(self) -> int | None:
+        """Propagates every assignment of the trail not propagated yet.
+
+        :returns: index of a conflicting clause, `None` if there is no conflict.
+        """
+        while self._propagation_head < len(self._trail):
+            false_literal = -self._trail[self._propagation_head]
+            self._propagation_head += 1
+            watchers = self._watches.get(false_literal, [])
+            i = j = 0
+            while i < len(watchers):
+                clause_index = watchers[i]
+                i += 1
+                clause = self._clauses[clause_index]
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+                first = clause[0]
+                if self._value(first) == 1:
+                    watchers[j] = clause_index
+                    j += 1
+                    continue
+                for k in range(2, len(clause)):
+                    if self._value(clause[k]) != -1:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self._watches.setdefault(clause[1], []).append(clause_index)
+                        break
+                else:
+                    watchers[j] = clause_index
+                    j += 1
+                    if self._value(first) == -1:
+                        watchers[j:] = watchers[i:]
+                        return clause_index
+                    self._enqueue(first, clause_index)
+            del watchers[j:]
+        return None
+
+    def _bump(self, variable_: int) -> None:
+        """Bumps the activity of a variable."""
+        self._activities[variable_] += self._activity_increment
+        if self._activities[variable_] > ACTIVITY_LIMIT:
+            self._activities = [activity / ACTIVITY_LIMIT for activity in self._activities]
+            self._activity_increment /= ACTIVITY_LIMIT
+            self._heap = [
+                (-self._activities[v], v)
+                for v in range(1, self._num_variables + 1)
+                if not self._values[v]
+            ]
+            heapq.heapify(self._heap)
+        elif not self._values[variable_]:
+            heapq.heappush(self._heap, (-self._activities[variable_], variable_))
+
+    def _analyze(self, conflict: int) -> tuple[list[int], int]:
+        """Analyses a conflict up to its first unique implication point.
+
+        :param conflict: index of the conflicting clause.
+        :returns: learned clause, whose first literal is asserting, and the level to backjump to.
+        """
+        seen = [False] * (self._num_variables + 1)
+        learned: list[int] = [0]
+        counter = 0
+        literal: int | None = None
+        trail_index = len(self._trail) - 1
+        clause_index: int | None = conflict
+        while True:
+            assert clause_index is not None
+            clause = self._clauses[clause_index]
+            for other in clause if literal is None else clause[1:]:
+                variable_ = abs(other)
+                if not seen[variable_] and self._levels[variable_] > 0:
+                    seen[variable_] = True
+                    self._bump(variable_)
+                    if self._levels[variable_] == self._decision_level:
+                        counter += 1
+                    else:
+                        learned.append(other)
+            while not seen[abs(self._trail[trail_index])]:
+                trail_index -= 1
+            literal = self._trail[trail_index]
+            trail_index -= 1
+            clause_index = self._reasons[abs(literal)]
+            seen[abs(literal)] = False
+            counter -= 1
+            if counter == 0:
+                break
+        learned[0] = -literal
+        self._activity_increment /= ACTIVITY_DECAY
+
+        if len(learned) == 1:
+            return learned, 0
+        # The literal with the highest level is watched along with the asserting literal
+        highest = max(range(1, len(learned)), key=lambda k: self._levels[abs(learned[k])])
+        learned[1], learned[highest] = learned[highest], learned[1]
+        return learned, self._levels[abs(learned[1])]
+
+    def _backjump(self, level: int) -> None:
+        """Undoes every assignment made above the given decision level.
+
+        :param level: decision level to go back to.
+        """
+        if self._decision_level <= level:
+            return
+        limit = self._trail_limits[level]
+        for literal in self._trail[limit:]:
+            variable_ = abs(literal)
+            self._phases[variable_] = literal > 0
+            self._values[variable_] = 0
+            self._reasons[variable_] = None
+            heapq.heappush(self._heap, (-self._activities[variable_], variable_))
+        del self._trail[limit:]
+        del self._trail_limits[level:]
+        self._propagation_head = limit
+
+    def _decide(self) -> int | None:
+        """Picks the unassigned variable with the highest activity.
+
+        :returns: literal to assign, `None` if every variable is assigned.
+        """
+        while self._heap:
+            _, variable_ = heapq.heappop(self._heap)
+            if not self._values[variable_]:
+                return variable_ if self._phases[variable_] else -variable_
+        return None
+
+    def solve(self, *, should_stop: Callable[[], bool] | None = None) -> list[int] | None:
+        """Solves the formula.
+
+        :param should_stop: callback polled every `STOP_CHECK_INTERVAL` decisions. The search is
+            cancelled as soon as it returns `True`.
+        :returns: list of the true variables, `None` if the formula is unsatisfiable.
+        :raises: `SearchCancelledError` when `should_stop` asked for the search to stop.
+        """
+        if self._unsatisfiable or self._propagate() is not None:
+            return None
+
+        restarts = 1
+        conflicts = 0
+        decisions = 0
+        while True:
+            if (conflict := self._propagate()) is not None:
+                if self._decision_level == 0:
+                    return None
+                conflicts += 1
+                learned, level = self._analyze(conflict)
+                self._backjump(level)
+                if len(learned) == 1:
+                    self._enqueue(learned[0], None)
+                else:
+                    self._clauses.append(learned)
+                    self._watch(len(self._clauses) - 1)
+                    self._enqueue(learned[0], len(self._clauses) - 1)
+                continue
+
+            if conflicts >= RESTART_BASE * luby(restarts):
+                restarts += 1
+                conflicts = 0
+                self._backjump(0)
+                continue
+
+            decisions += 1
+            if should_stop is not None and decisions % STOP_CHECK_INTERVAL == 0 and should_stop():
+                raise SearchCancelledError
+            if (literal := self._decide()) is None:
+                return [v for v in range(1, self._num_variables + 1) if self._values[v] == 1]
+            self._trail_limits.append(len(self._trail))
+            self._enqueue(literal, None)
+
+
+def sat_solve(grid: Grid, *, should_stop: Callable[[], bool] | None = None) -> None:
+    """Solves a sudoku by encoding it in CNF and running the CDCL solver on it.
+
+    :param grid: `Grid` containing the sudoku to solve. It is filled in place.
+    :param should_stop: callback polled during the search, see `CDCLSolver.solve`.
+    :raises: `UnsolvableSudokuError` when the formula is unsatisfiable.
+    :raises: `SearchCancelledError` when `should_stop` asked for the search to stop.
+    """
+    model = CDCLSolver(CNF.from_grid(grid)).solve(should_stop=should_stop)
+    if model is None:
+        raise UnsolvableSudokuError
+    for true_variable in model:
+        row, rest = divmod(true_variable - 1, 81)
+        column, digit = divmod(rest, 9)
+        if not grid.get_value((row, column)):
+            grid.set_value(digit + 1, (row, column))
@@ -0,0 +1,257 @@
+"""Module defining a stateful solving session, giving logical deductions one step at a time."""
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from enum import Enum
+
+import numpy as np
+from numpy import typing as npt
+
+from .exceptions import ValueAssignmentError
+from .grid import Index
+from .validation import UNITS
+
+# Candidates of a cell are stored as a bitmask, bit d standing for digit d
+ALL_CANDIDATES = 0b1111111110
+
+_UNITS: list[list[int]] = UNITS.tolist()
+_ROWS, _COLUMNS, _BOXES = _UNITS[:9], _UNITS[9:18], _UNITS[18:]
+_BOX_OF_CELL = [i // 3 * 3 + j // 3 for i in range(9) for j in range(9)]
+_PEERS: list[list[int]] = [
+    sorted({peer for unit in _UNITS if cell in unit for peer in unit} - {cell})
+    for cell in range(81)
+]
+
+
+def _to_index(cell: int, /) -> Index:
+    """Converts a flat cell number to an index."""
+    return divmod(cell, 9)
+
+
+def _digits(candidates: int, /) -> Iterator[int]:
+    """Yields the digits of a candidates bitmask."""
+    for digit in range(1, 10):
+        if candidates >> digit & 1:
+            yield digit
+
+
+class Technique(Enum):
+    """Enumeration of the techniques a deduction can come from."""
+
+    NAKED_SINGLE = "naked single"
+    HIDDEN_SINGLE = "hidden single"
+    LOCKED_CANDIDATES = "locked candidates"
+
+
+@dataclass(frozen=True)
+class Deduction:
+    """Logical deduction found in a grid.
+
+    :param technique: technique the deduction comes from.
+    :param value: digit the deduction is about.
+    :param value_index: index of the cell the digit is placed in, `None` if the deduction only
+        eliminates candidates.
+    :param eliminated_candidates: candidates removed by the deduction, as (index, digit) pairs.
+    """
+
+    technique: Technique
+    value: int
+    value_index: Index | None
+    eliminated_candidates: tuple[tuple[Index, int], ...]
+
+
+class SolverSession:
+    """Solving session for interactive clients.
+
+    Candidates are kept up to date as cells are edited, so that the next deduction is found
+    without rebuilding a `Grid` nor solving the sudoku from scratch.
+    """
+
+    def __init__(self, values: npt.NDArray[np.uint8]) -> None:
+        """Initializes the session.
+
+        :param values: array containing the sudoku values, 0 standing for an empty cell. It is
+            copied, edits made through the session don't affect it.
+        """
+        self._values: list[int] = [int(value) for value in np.asarray(values).ravel()]
+        self._givens = [value != 0 for value in self._values]
+        self._candidates = [0] * 81
+        self._compute_candidates()
+
+    @property
+    def values(self) -> npt.NDArray[np.uint8]:
+        """Returns a copy of the current values."""
+        return np.array(self._values, dtype=np.uint8).reshape(9, 9)
+
+    def _compute_candidates(self) -> None:
+        """Computes every candidate from the values, dropping former eliminations."""
+        for cell in range(81):
+            if self._values[cell]:
+                self._candidates[cell] = 0
+                continue
+            candidates = ALL_CANDIDATES
+            for peer in _PEERS[cell]:
+                candidates &= ~(1 << self._values[peer])
+            self._candidates[cell] = candidates
+
+    def get_candidates(self, value_index: Index, /) -> set[int]:
+        """Gets the candidates of a cell.
+
+        :param value_index: index of the cell.
+        :returns: digits that can still be placed in the cell.
+        """
+        return set(_digits(self._candidates[value_index[0] * 9 + value_index[1]]))
+
+    def set_value(self, value: int, value_index: Index) -> None:
+        """Places a digit in a cell and removes it from the candidates of its peers.
+
+        :param value: digit to place.
+        :param value_index: index of the cell.
+        :raises: `ValueAssignmentError` if the cell is a given, the digit isn't between 1 and 9 or
+            a peer already holds it.
+        """
+        cell = value_index[0] * 9 + value_index[1]
+        if (
+            not 1 <= value <= 9  # noqa: PLR2004
+            or self._givens[cell]
+            or any(self._values[peer] == value for peer in _PEERS[cell])
+        ):
+            raise ValueAssignmentError(value_index)
+        if self._values[cell]:
+            self.clear_value(value_index)
+        self._values[cell] = value
+        self._candidates[cell] = 0
+        mask = ~(1 << value)
+        for peer in _PEERS[cell]:
+            self._candidates[peer] &= mask
+
+    def clear_value(self, value_index: Index, /) -> None:
+        """Empties a cell.
+
+        Candidates are recomputed from the values, since eliminations made while the digit was
+        placed may not hold anymore.
+
+        :param value_index: index of the cell.
+        :raises: `ValueAssignmentError` if the cell is a given.
+        """
+        cell = value_index[0] * 9 + value_index[1]
+        if self._givens[cell]:
+            raise ValueAssignmentError(value_index)
+        if self._values[cell]:
+            self._values[cell] = 0
+            self._compute_candidates()
+
+    def _placement(self, technique: Technique, cell: int, value: int) -> Deduction:
+        """Builds the deduction placing a digit in a cell."""
+        eliminated = [(_to_index(cell), digit) for digit in _digits(self._candidates[cell])]
+        eliminated.extend(
+            (_to_index(peer), value) for peer in _PEERS[cell] if self._candidates[peer] >> value & 1
+        )
+        return Deduction(
+            technique=technique,
+            value=value,
+            value_index=_to_index(cell),
+            eliminated_candidates=tuple(
+                candidate for candidate in eliminated if candidate != (_to_index(cell), value)
+            ),
+        )
+
+    def _find_naked_single(self) -> Deduction | None:
+        """Finds a cell left with a single candidate."""
+        for cell, candidates in enumerate(self._candidates):
+            if candidates and not candidates & (candidates - 1):
+                return self._placement(Technique.NAKED_SINGLE, cell, candidates.bit_length() - 1)
+        return None
+
+    def _find_hidden_single(self) -> Deduction | None:
+        """Finds a digit left with a single place in a unit."""
+        for unit in _UNITS:
+            placed = 0
+            for cell in unit:
+                placed |= 1 << self._values[cell]
+            for digit in range(1, 10):
+                if placed >> digit & 1:
+                    continue
+                cells = [cell for cell in unit if self._candidates[cell] >> digit & 1]
+                if len(cells) == 1:
+                    return self._placement(Technique.HIDDEN_SINGLE, cells[0], digit)
+        return None
+
+    def _locked_candidates(self, digit: int, unit: list[int], line: list[int]) -> Deduction | None:
+        """Builds the deduction eliminating a digit confined to a unit from the rest of a line.
+
+        :param digit: digit confined to the intersection of the unit and the line.
+        :param unit: unit the digit is confined in.
+        :param line: unit intersecting the first one, to eliminate the digit from.
+        :returns: `Deduction`, `None` if there is nothing to eliminate.
+        """
+        eliminated = tuple(
+            (_to_index(cell), digit)
+            for cell in line
+            if cell not in unit and self._candidates[cell] >> digit & 1
+        )
+        if not eliminated:
+            return None
+        return Deduction(
+            technique=Technique.LOCKED_CANDIDATES,
+            value=digit,
+            value_index=None,
+            eliminated_candidates=eliminated,
+        )
+
+    def _confinements(self, digit: int) -> Iterator[tuple[list[int], list[int]]]:
+        """Yields the units whose candidates for a digit all lie in another intersecting unit.
+
+        :param digit: digit to look for.
+        :returns: pairs of the unit the digit is confined in and of the intersecting unit.
+        """
+        for box in _BOXES:
+            cells = [cell for cell in box if self._candidates[cell] >> digit & 1]
+            if not cells:
+                continue
+            if len(rows := {cell // 9 for cell in cells}) == 1:
+                yield box, _ROWS[rows.pop()]
+            if len(columns := {cell % 9 for cell in cells}) == 1:
+                yield box, _COLUMNS[columns.pop()]
+        for line in _ROWS + _COLUMNS:
+            cells = [cell for cell in line if self._candidates[cell] >> digit & 1]
+            if cells and len(boxes := {_BOX_OF_CELL[cell] for cell in cells}) == 1:
+                yield line, _BOXES[boxes.pop()]
+
+    def _find_locked_candidates(self) -> Deduction | None:
+        """Finds a digit confined to the intersection of a box and a row or a column."""
+        for digit in range(1, 10):
+            for unit, line in self._confinements(digit):
+                if deduction := self._locked_candidates(digit, unit, line):
+                    return deduction
+        return None
+
+    def next_deduction(self) -> Deduction | None:
+        """Finds the next logical move, trying the simplest techniques first.
+
+        :returns: `Deduction`, `None` if none of the techniques applies.
+        """
+        return (
+            self._find_naked_single()
+            or self._find_hidden_single()
+            or self._find_locked_candidates()
+        )
+
+    def apply(self, deduction: Deduction) -> None:
+        """Applies a deduction to the session.
+
+        :param deduction: deduction to apply.
+        """
+        if deduction.value_index is not None:
+            self.set_value(deduction.value, deduction.value_index)
+        for (i, j), digit in deduction.eliminated_candidates:
+            self._candidates[i * 9 + j] &= ~(1 << digit)
+
+    def step(self) -> Deduction | None:
+        """Finds the next logical move and applies it.
+
+        :returns: applied `Deduction`, `None` if none of the techniques applies.
+        """
+        if (deduction := self.next_deduction()) is not None:
+            self.apply(deduction)
+        return deduction
@@ -0,0 +1,427 @@
+"""Module containing methods to share a batch run between several hosts through a directory.
+
+A coordinator splits the input into shards saved in the `pending` directory of a job directory
+every worker can reach, e.g. a network file system. Workers claim a shard by renaming it into
+the `claimed` directory under a name holding their identifier, an atomic operation only one of
+them can succeed at, and hold a lease on it by touching it regularly. A shard whose lease hasn't
+been renewed for `lease_timeout` seconds is moved back to `pending`, its worker being presumed
+dead: should that worker be alive after all, its claim is gone and it can't release or renew the
+claim of the worker the shard is reassigned to. Solved shards are renamed
+into the `done` directory, and merged in order by the coordinator once all of them are there.
+
+Leases rely on the modification times of the shared files: the clocks of the hosts must agree
+well within the lease timeout.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import socket
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Self
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore[assignment]
+
+from .batch import CHECKPOINT_SUFFIX, DEFAULT_CHECKPOINT_INTERVAL, solve_batch
+from .engines import EngineName
+from .sinks import SINKS, Compression, SinkFormat, open_sink
+
+# Number of puzzles per shard
+DEFAULT_SHARD_SIZE = 10_000
+# Number of seconds after which the shard of a worker that didn't renew its lease is reassigned
+DEFAULT_LEASE_TIMEOUT = 60.0
+# Number of seconds between two looks at the job directory while waiting
+DEFAULT_POLL_INTERVAL = 1.0
+JOB_FILENAME = "job.json"
+
+
+@dataclass(frozen=True)
+class ShardedJob:
+    """Settings of a sharded batch run, saved in its job directory.
+
+    :param shards: number of shards.
+    :param engine: value of the engine solving the sudokus.
+    :param output_format: value of the format of the outputs.
+    :param compression: value of the compression of the outputs.
+    :param lease_timeout: number of seconds after which an unrenewed lease expires.
+    """
+
+    shards: int
+    engine: str = EngineName.BACKTRACKING.value
+    output_format: str = SinkFormat.TEXT.value
+    compression: str = Compression.NONE.value
+    lease_timeout: float = DEFAULT_LEASE_TIMEOUT
+
+    @classmethod
+    def load(cls, filepath: Path) -> "ShardedJob":
+        """Loads a job from a file.
+
+        :param filepath: path of the job file.
+        :returns: `ShardedJob`.
+        """
+        with Path.open(filepath, encoding="utf-8") as f:
+            return cls(**json.load(f))
+
+    def save(self, filepath: Path) -> None:
+        """Saves the job to a file atomically.
+
+        :param filepath: path of the job file.
+        """
+        temporary_path = filepath.with_name(filepath.name + ".tmp")
+        with Path.open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f)
+            f.flush()
+            os.fsync(f.fileno())
+        temporary_path.replace(filepath)
+
+
+class JobDirectory:
+    """Layout of a job directory."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Initializes the layout, creating its directories if needed.
+
+        :param path: path of the job directory.
+        """
+        self.path = Path(path)
+        self.pending = self.path / "pending"
+        self.claimed = self.path / "claimed"
+        self.done = self.path / "done"
+        self.work = self.path / "work"
+        for directory in (self.pending, self.claimed, self.done, self.work):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def job_path(self) -> Path:
+        """Returns the path of the job file, only written once every shard is pending."""
+        return self.path / JOB_FILENAME
+
+    @staticmethod
+    def shard_name(index: int, /) -> str:
+        """Gets the file name of a shard, sorting in shard order."""
+        return f"{index:06d}"
+
+    def claim_path(self, index: int, worker_id: str) -> Path:
+        """Gets the path of a shard claimed by a worker."""
+        return self.claimed / f"{self.shard_name(index)}.{worker_id}"
+
+    def done_count(self) -> int:
+        """Returns the number of solved shards."""
+        return sum(1 for _ in self.done.iterdir())
+
+
+def split_input(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    input_path: str | Path,
+    job_directory: JobDirectory,
+    *,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    engine: EngineName = EngineName.BACKTRACKING,
+    output_format: SinkFormat = SinkFormat.TEXT,
+    compression: Compression = Compression.NONE,
+    lease_timeout: float = DEFAULT_LEASE_TIMEOUT,
+) -> ShardedJob:
+    """Splits an input file into pending shards, then saves the job file.
+
+    :param input_path: path of the file containing one puzzle of 81 characters per line.
+    :param job_directory: `JobDirectory` of the job.
+    :param shard_size: number of puzzles per shard.
+    :param engine: engine solving the sudokus.
+    :param output_format: format of the outputs, see `SinkFormat`.
+    :param compression: compression of the outputs, see `Compression`.
+    :param lease_timeout: number of seconds after which an unrenewed lease expires.
+    :returns: `ShardedJob`.
+    :raises: `ValueError` when the job directory already holds a job.
+    """
+    if shard_size < 1:
+        error_msg = f"Expected a positive shard size, got '{shard_size}'"
+        raise ValueError(error_msg)
+    if job_directory.job_path.exists():
+        error_msg = f"Job directory '{job_directory.path}' already holds a job"
+        raise ValueError(error_msg)
+
+    def save_shard(index: int, lines: list[bytes]) -> None:
+        # Written aside first, so that a worker never claims a partial shard
+        name = job_directory.shard_name(index)
+        temporary_path = job_directory.work / f"{name}.split"
+        temporary_path.write_bytes(b"".join(lines))
+        temporary_path.replace(job_directory.pending / name)
+
+    shards = 0
+    lines: list[bytes] = []
+    with Path.open(Path(input_path), "rb") as f:
+        for line in f:
+            if puzzle := line.strip():
+                lines.append(puzzle + b"\n")
+                if len(lines) == shard_size:
+                    save_shard(shards, lines)
+                    shards, lines = shards + 1, []
+    if lines:
+        save_shard(shards, lines)
+        shards += 1
+
+    job = ShardedJob(
+        shards=shards,
+        engine=engine.value,
+        output_format=output_format.value,
+        compression=compression.value,
+        lease_timeout=lease_timeout,
+    )
+    job.save(job_directory.job_path)
+    return job
+
+
+def _default_worker_id() -> str:
+    """Gets an identifier of the current process, unique across hosts."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def claim_shard(job_directory: JobDirectory, *, worker_id: str | None = None) -> int | None:
+    """Claims the first pending shard and takes a lease on it.
+
+    :param job_directory: `JobDirectory` of the job.
+    :param worker_id: identifier of the worker, unique across hosts. Defaults to the host name
+        and process id.
+    :returns: index of the claimed shard, `None` if no shard is pending.
+    """
+    worker_id = worker_id or _default_worker_id()
+    for path in sorted(job_directory.pending.iterdir()):
+        claimed_path = job_directory.claim_path(int(path.name), worker_id)
+        try:
+            path.rename(claimed_path)
+            # Renaming keeps the modification time of the pending shard: the lease starts now
+            os.utime(claimed_path)
+        except FileNotFoundError:
+            # Claimed by another worker, or reaped right after being claimed
+            continue
+        return int(path.name)
+    return None
+
+
+def reap_expired_leases(
+    job_directory: JobDirectory, lease_timeout: float, *, now: float | None = None
+) -> list[int]:
+    """Moves the claimed shards whose lease expired back to pending.
+
+    :param job_directory: `JobDirectory` of the job.
+    :param lease_timeout: number of seconds after which an unrenewed lease expires.
+    :param now: current time, as a timestamp. Defaults to `time.time()`.
+    :returns: indexes of the shards moved back.
+    """
+    now = time.time() if now is None else now
+    reaped = []
+    for path in sorted(job_directory.claimed.iterdir()):
+        try:
+            if path.stat().st_mtime + lease_timeout >= now:
+                continue
+            index = int(path.name.partition(".")[0])
+            path.rename(job_directory.pending / job_directory.shard_name(index))
+        except FileNotFoundError:
+            # Done, or reaped by another worker in the meantime
+            continue
+        reaped.append(index)
+    return reaped
+
+
+class _Lease:
+    """Renews the lease on a claimed shard from a background thread."""
+
+    def __init__(self, path: Path, interval: float) -> None:
+        self._path = path
+        self._interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._renew, daemon=True)
+
+    def _renew(self) -> None:
+        while not self._stopped.wait(self._interval):
+            try:
+                os.utime(self._path)
+            except FileNotFoundError:
+                # Reaped: another worker may solve the shard too, both outputs being the same
+                return
+
+    def __enter__(self) -> Self:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+
+def solve_shard(
+    job_directory: JobDirectory,
+    job: ShardedJob,
+    index: int,
+    *,
+    workers: int = 1,
+    worker_id: str | None = None,
+) -> None:
+    """Solves a claimed shard and publishes its output to the `done` directory.
+
+    The claim is released afterwards, unless the lease expired in the meantime: the shard may
+    then be claimed by another worker, whose claim is left untouched.
+
+    :param job_directory: `JobDirectory` of the job.
+    :param job: `ShardedJob` the shard belongs to.
+    :param index: index of the shard.
+    :param workers: number of processes solving puzzles.
+    :param worker_id: identifier of the worker the shard was claimed by, see `claim_shard`.
+    """
+    worker_id = worker_id or _default_worker_id()
+    name = job_directory.shard_name(index)
+    claimed_path = job_directory.claim_path(index, worker_id)
+    output_path = job_directory.work / f"{name}.{worker_id}"
+    with _Lease(claimed_path, job.lease_timeout / 3):
+        solve_batch(
+            claimed_path,
+            output_path,
+            engine=EngineName(job.engine),
+            workers=workers,
+            checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL,
+            output_format=SinkFormat(job.output_format),
+            compression=Compression(job.compression),
+        )
+    output_path.replace(job_directory.done / name)
+    output_path.with_name(output_path.name + CHECKPOINT_SUFFIX).unlink(missing_ok=True)
+    # Missing if reaped, a new claim of the shard being named after its own worker
+    claimed_path.unlink(missing_ok=True)
+
+
+def wait_for_job(
+    job_directory: JobDirectory, *, poll_interval: float = DEFAULT_POLL_INTERVAL
+) -> ShardedJob:
+    """Waits for the coordinator to finish splitting the input.
+
+    :param job_directory: `JobDirectory` of the job.
+    :param poll_interval: number of seconds between two looks for the job file.
+    :returns: `ShardedJob`.
+    """
+    while not job_directory.job_path.exists():
+        time.sleep(poll_interval)
+    return ShardedJob.load(job_directory.job_path)
+
+
+def run_worker(
+    job_directory: str | Path,
+    *,
+    workers: int = 1,
+    worker_id: str | None = None,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> int:
+    """Claims and solves shards until every shard of the job is done.
+
+    Once no shard is left pending, the worker keeps reaping expired leases, so that the shards
+    of dead workers are solved by the ones still alive.
+
+    :param job_directory: path of the job directory.
+    :param workers: number of processes solving the puzzles of a shard.
+    :param worker_id: identifier of the worker, see `solve_shard`.
+    :param poll_interval: number of seconds between two looks at the job directory.
+    :returns: number of shards solved by this worker.
+    """
+    directory = JobDirectory(job_directory)
+    job = wait_for_job(directory, poll_interval=poll_interval)
+    worker_id = worker_id or _default_worker_id()
+    solved = 0
+    while directory.done_count() < job.shards:
+        if (index := claim_shard(directory, worker_id=worker_id)) is not None:
+            solve_shard(directory, job, index, workers=workers, worker_id=worker_id)
+            solved += 1
+        elif not reap_expired_leases(directory, job.lease_timeout):
+            time.sleep(poll_interval)
+    return solved
+
+
+def _strip_header(data: bytes, header: bytes, compression: Compression) -> bytes:
+    """Removes the header at the start of an output, decompressing it if needed."""
+    if compression is Compression.NONE:
+        return data.removeprefix(header)
+    if compression is Compression.GZIP:
+        return gzip.compress(gzip.decompress(data).removeprefix(header), mtime=0)
+    content = zstandard.ZstdDecompressor().stream_reader(data, read_across_frames=True).read()
+    return zstandard.ZstdCompressor().compress(content.removeprefix(header))
+
+
+def merge_outputs(job_directory: JobDirectory, job: ShardedJob, output_path: str | Path) -> None:
+    """Concatenates the outputs of every shard in order, keeping the first header only.
+
+    Compressed outputs are made of whole frames, so that they are concatenated as they are.
+
+    :param job_directory: `JobDirectory` of the job.
+    :param job: `ShardedJob`.
+    :param output_path: path of the merged output, written atomically.
+    """
+    output_path = Path(output_path)
+    output_format, compression = SinkFormat(job.output_format), Compression(job.compression)
+    temporary_path = output_path.with_name(output_path.name + ".tmp")
+    if not job.shards:
+        with open_sink(temporary_path, output_format, compression=compression):
+            pass
+        temporary_path.replace(output_path)
+        return
+
+    header = SINKS[output_format].header
+    with Path.open(temporary_path, "wb") as output:
+        for index in range(job.shards):
+            shard_path = job_directory.done / job_directory.shard_name(index)
+            if index and header:
+                output.write(_strip_header(shard_path.read_bytes(), header, compression))
+                continue
+            with Path.open(shard_path, "rb") as shard:
+                shutil.copyfileobj(shard, output)
+        output.flush()
+        os.fsync(output.fileno())
+    temporary_path.replace(output_path)
+
+
+def coordinate(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    input_path: str | Path,
+    output_path: str | Path,
+    job_directory: str | Path,
+    *,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    engine: EngineName = EngineName.BACKTRACKING,
+    output_format: SinkFormat = SinkFormat.TEXT,
+    compression: Compression = Compression.NONE,
+    lease_timeout: float = DEFAULT_LEASE_TIMEOUT,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> ShardedJob:
+    """Splits an input into shards, waits for workers to solve them all and merges the outputs.
+
+    The coordinator solves nothing itself: start `run_worker` on every host, including this one
+    if it should take part. It reaps expired leases while waiting, so that a job completes as long
+    as one worker is alive.
+
+    :param input_path: path of the file containing one puzzle of 81 characters per line.
+    :param output_path: path of the file to write the solutions to, in input order.
+    :param job_directory: path of the job directory, shared with the workers.
+    :param shard_size: number of puzzles per shard.
+    :param engine: engine solving the sudokus.
+    :param output_format: format of the output, see `SinkFormat`.
+    :param compression: compression of the output, see `Compression`.
+    :param lease_timeout: number of seconds after which an unrenewed lease expires.
+    :param poll_interval: number of seconds between two looks at the job directory.
+    :returns: `ShardedJob` of the completed run.
+    """
+    directory = JobDirectory(job_directory)
+    job = split_input(
+        input_path,
+        directory,
+        shard_size=shard_size,
+        engine=engine,
+        output_format=output_format,
+        compression=compression,
+        lease_timeout=lease_timeout,
+    )
+    while directory.done_count() < job.shards:
+        reap_expired_leases(directory, job.lease_timeout)
+        time.sleep(poll_interval)
+    merge_outputs(directory, job, output_path)
+    return job
@@ -0,0 +1,336 @@
+"""Module defining the sinks batch results are written to."""
+
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import queue
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from types import TracebackType
+from typing import Any, BinaryIO, Self
+
+from .puzzles import is_puzzle
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore[assignment]
+
+# Size above which buffered results are handed over to the writer thread
+DEFAULT_BUFFER_SIZE = 1 << 20
+# Number of buffers waiting to be written before `write` blocks
+MAX_PENDING_BUFFERS = 8
+
+_DIGITS_TABLE = bytes.maketrans(b"0123456789.", bytes(range(10)) + b"\x00")
+
+
+@dataclass(frozen=True)
+class SolveRecord:
+    """Result of the resolution of a puzzle.
+
+    :param puzzle: puzzle as a string of 81 characters.
+    :param solution: solution as a string of 81 characters, `None` if there is none.
+    :param elapsed: time spent solving the puzzle, in seconds.
+    :param engine: name of the engine that solved the puzzle.
+    """
+
+    puzzle: str
+    solution: str | None
+    elapsed: float
+    engine: str
+
+    @property
+    def solved(self) -> bool:
+        """Returns `True` if the puzzle has been solved."""
+        return self.solution is not None
+
+
+class SinkFormat(Enum):
+    """Enumeration of the available output formats."""
+
+    TEXT = "txt"
+    JSONL = "jsonl"
+    CSV = "csv"
+    BINARY = "bin"
+
+
+class Compression(Enum):
+    """Enumeration of the available output compressions."""
+
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
+class _DigestFile:
+    """Binary file keeping track of the size and digest of everything written to it."""
+
+    def __init__(self, stream: BinaryIO, *, size: int, digest: Any) -> None:
+        self.stream = stream
+        self.size = size
+        self.digest = digest
+
+    def write(self, data: bytes) -> int:
+        self.stream.write(data)
+        self.digest.update(data)
+        self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+class ResultSink(ABC):  # pylint: disable=too-many-instance-attributes
+    """Buffered sink results are written to.
+
+    Encoded results are gathered in a buffer handed over to a background thread once large
+    enough, so that compression and output I/O don't stall the solvers. `sync` closes the
+    current compression frame and syncs the file to disk: the file can then be truncated to its
+    current size and appended to later on.
+    """
+
+    header = b""
+
+    def __init__(
+        self,
+        filepath: str | Path,
+        *,
+        compression: Compression = Compression.NONE,
+        append: bool = False,
+        digest: Any = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        """Opens the sink.
+
+        :param filepath: path of the output file.
+        :param compression: compression of the output.
+        :param append: whether to append to the file instead of overwriting it.
+        :param digest: hash object to update with the written bytes, holding the digest of the
+            existing file when appending. A new SHA-256 hash object is used if not given.
+        :param buffer_size: size above which buffered results are handed to the writer thread.
+        """
+        if compression is Compression.ZSTD and zstandard is None:
+            error_msg = "zstd compression requires the 'zstandard' package"
+            raise ValueError(error_msg)
+        path = Path(filepath)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        stream = Path.open(path, "ab" if append else "wb")
+        self._file = _DigestFile(
+            stream, size=stream.tell(), digest=digest if digest is not None else hashlib.sha256()
+        )
+        self._compression = compression
+        self._compressor: Any = None
+        self._buffer = bytearray()
+        self._buffer_size = buffer_size
+        self._queue: queue.Queue[bytes | threading.Event | None] = queue.Queue(MAX_PENDING_BUFFERS)
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._write_pending, daemon=True)
+        self._thread.start()
+        if not append or not self._file.size:
+            self._buffer += self.header
+
+    @property
+    def size(self) -> int:
+        """Returns the size of the file as of the last `sync`."""
+        return self._file.size
+
+    @property
+    def digest(self) -> str:
+        """Returns the hexadecimal digest of the file as of the last `sync`."""
+        return str(self._file.digest.hexdigest())
+
+    @abstractmethod
+    def encode(self, record: SolveRecord) -> bytes:
+        """Encodes a result.
+
+        :param record: result to encode.
+        :returns: encoded result.
+        """
+
+    def write(self, record: SolveRecord) -> None:
+        """Writes a result to the sink.
+
+        :param record: result to write.
+        """
+        self._buffer += self.encode(record)
+        if len(self._buffer) >= self._buffer_size:
+            self._hand_over()
+
+    def write_many(self, records: Iterable[SolveRecord]) -> None:
+        """Writes several results to the sink.
+
+        :param records: results to write.
+        """
+        for record in records:
+            self.write(record)
+
+    def sync(self) -> None:
+        """Writes every buffered result, closes the compression frame and syncs to disk."""
+        self._hand_over()
+        synced = threading.Event()
+        self._queue.put(synced)
+        synced.wait()
+        self._raise_error()
+
+    def close(self) -> None:
+        """Syncs and closes the sink."""
+        if not self._thread.is_alive():
+            return
+        try:
+            self.sync()
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+            self._file.stream.close()
+
+    def _hand_over(self) -> None:
+        """Hands the buffer over to the writer thread."""
+        self._raise_error()
+        if self._buffer:
+            self._queue.put(bytes(self._buffer))
+            self._buffer.clear()
+
+    def _raise_error(self) -> None:
+        """Raises the error the writer thread stopped on, if any."""
+        if self._error is not None:
+            raise self._error
+
+    def _write_pending(self) -> None:
+        """Writes the buffers handed over until the sink is closed, in the writer thread."""
+        while (item := self._queue.get()) is not None:
+            try:
+                if isinstance(item, threading.Event):
+                    self._end_frame()
+                    self._file.flush()
+                    os.fsync(self._file.stream.fileno())
+                    item.set()
+                elif self._error is None:
+                    self._write_compressed(item)
+            except Exception as ex:  # noqa: BLE001  # pylint: disable=broad-exception-caught
+                self._error = ex
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def _write_compressed(self, data: bytes) -> None:
+        """Writes data through the compressor, starting a new frame if needed."""
+        if self._compression is Compression.NONE:
+            self._file.write(data)
+            return
+        if self._compressor is None:
+            if self._compression is Compression.GZIP:
+                self._compressor = gzip.GzipFile(fileobj=self._file, mode="wb", mtime=0)  # type: ignore[arg-type]
+            else:
+                self._compressor = zstandard.ZstdCompressor().stream_writer(
+                    self._file,  # type: ignore[arg-type]
+                    closefd=False,
+                )
+        self._compressor.write(data)
+
+    def _end_frame(self) -> None:
+        """Ends the current compression frame, so that the file is complete up to its end."""
+        if self._compressor is None:
+            return
+        if self._compression is Compression.GZIP:
+            self._compressor.close()
+        else:
+            self._compressor.flush(zstandard.FLUSH_FRAME)
+        self._compressor = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class TextSink(ResultSink):
+    """Sink writing one solution per line, or the puzzle itself if it has no solution."""
+
+    def encode(self, record: SolveRecord) -> bytes:
+        return ((record.solution or record.puzzle) + "\n").encode("ascii")
+
+
+class JsonlSink(ResultSink):
+    """Sink writing one JSON object per line, with the resolution statistics."""
+
+    def encode(self, record: SolveRecord) -> bytes:
+        return (
+            json.dumps(
+                {
+                    "puzzle": record.puzzle,
+                    "solution": record.solution,
+                    "solved": record.solved,
+                    "elapsed": record.elapsed,
+                    "engine": record.engine,
+                }
+            )
+            + "\n"
+        ).encode("ascii")
+
+
+class CsvSink(ResultSink):
+    """Sink writing one comma-separated line per result, after a header.
+
+    Fields are quoted when needed, lines that aren't puzzles being written as they are.
+    """
+
+    header = b"puzzle,solution,solved,elapsed,engine\n"
+
+    def encode(self, record: SolveRecord) -> bytes:
+        row = io.StringIO()
+        csv.writer(row, lineterminator="\n").writerow(
+            [
+                record.puzzle,
+                record.solution or "",
+                int(record.solved),
+                f"{record.elapsed:.6f}",
+                record.engine,
+            ]
+        )
+        return row.getvalue().encode("ascii")
+
+
+class BinarySink(ResultSink):
+    """Sink writing 81 bytes per result, one per cell, holding the solution's digits.
+
+    Puzzles without a solution are written as they are, 0 standing for an empty cell, and lines
+    that aren't puzzles as 81 zeros, so that every result keeps its size.
+    """
+
+    def encode(self, record: SolveRecord) -> bytes:
+        if record.solution is None and not is_puzzle(record.puzzle):
+            return bytes(81)
+        return (record.solution or record.puzzle).encode("ascii").translate(_DIGITS_TABLE)
+
+
+SINKS: dict[SinkFormat, type[ResultSink]] = {
+    SinkFormat.TEXT: TextSink,
+    SinkFormat.JSONL: JsonlSink,
+    SinkFormat.CSV: CsvSink,
+    SinkFormat.BINARY: BinarySink,
+}
+
+
+def open_sink(
+    filepath: str | Path, sink_format: SinkFormat = SinkFormat.TEXT, **kwargs: Any
+) -> ResultSink:
+    """Opens a sink in the given format.
+
+    :param filepath: path of the output file.
+    :param sink_format: format of the output.
+    :param kwargs: keyword arguments given to the sink, see `ResultSink`.
+    :returns: `ResultSink`.
+    """
+    return SINKS[sink_format](filepath, **kwargs)
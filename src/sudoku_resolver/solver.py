@@ -0,0 +1,152 @@
+"""Module containing a pure solving function, safe to call from several threads at once, and
+reusable solving contexts for repeated solves."""
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+from numpy import typing as npt
+
+from .constraints import CLASSIC, ConstraintModel
+from .engines import EngineName, get_engine
+from .exceptions import InvalidSudokuError, SearchCancelledError, UnsolvableSudokuError
+from .grid import Grid
+from .precheck import Rejection, precheck
+from .profiling import Stage, StageProfiler, profile_stage
+
+
+@dataclass(frozen=True)
+class SolveResult:
+    """Result of a call to `solve`.
+
+    :param values: read-only array of the solved values, the puzzle's values if it hasn't been
+        solved.
+    :param solved: whether the puzzle has been solved.
+    :param engine: engine used to solve the puzzle.
+    :param elapsed: time spent solving the puzzle, in seconds.
+    :param rejection: reason the puzzle was rejected for before any search, if it was.
+    """
+
+    values: npt.NDArray[np.uint8]
+    solved: bool
+    engine: EngineName
+    elapsed: float
+    rejection: Rejection | None = None
+
+    def to_string(self) -> str:
+        """Converts the values to a string of 81 characters."""
+        return "".join(str(value) for value in self.values.ravel())
+
+
+def solve(
+    values: npt.ArrayLike,
+    *,
+    engine: EngineName = EngineName.BACKTRACKING,
+    should_stop: Callable[[], bool] | None = None,
+    model: ConstraintModel = CLASSIC,
+) -> SolveResult:
+    """Solves a sudoku without modifying its values.
+
+    Every call works on its own copy of the values, with its own grid and domains, so that
+    concurrent calls share no mutable state.
+
+    :param values: sudoku values of shape (9, 9) or (81,), 0 standing for an empty cell.
+    :param engine: engine solving the sudoku.
+    :param should_stop: callable polled during the search, returning `True` to stop it.
+    :param model: `ConstraintModel` of the sudoku variant, classic by default.
+    :returns: `SolveResult`, not solved if the sudoku has no solution or the search was stopped.
+    """
+    start = time.perf_counter()
+    array = np.array(values, dtype=np.uint8)
+    if array.size != 81:  # noqa: PLR2004
+        error_msg = f"Expected 81 values, got '{array.size}'"
+        raise ValueError(error_msg)
+    array = array.reshape(9, 9)
+    rejection = None
+    try:
+        precheck(array, model=model)
+        get_engine(engine)(Grid(array, model=model), should_stop=should_stop)
+        solved = True
+    except (UnsolvableSudokuError, SearchCancelledError) as ex:
+        if isinstance(ex, InvalidSudokuError):
+            rejection = ex.rejection
+        array = np.array(values, dtype=np.uint8).reshape(9, 9)
+        solved = False
+    array.setflags(write=False)
+    return SolveResult(
+        values=array,
+        solved=solved,
+        engine=engine,
+        elapsed=time.perf_counter() - start,
+        rejection=rejection,
+    )
+
+
+class SolverContext:
+    """Reusable solving context, owning a grid whose buffers are reset for every sudoku.
+
+    Solving many sudokus through a context allocates no new grid nor domains. A context holds
+    mutable state: it must not be shared between threads, use one per thread or process.
+    """
+
+    def __init__(
+        self,
+        *,
+        engine: EngineName = EngineName.BACKTRACKING,
+        model: ConstraintModel = CLASSIC,
+    ) -> None:
+        """Initializes the context.
+
+        :param engine: engine solving the sudokus.
+        :param model: `ConstraintModel` of the sudoku variant, classic by default.
+        """
+        self.engine = engine
+        self.model = model
+        self._engine = get_engine(engine)
+        self._grid = Grid(np.zeros((9, 9), dtype=np.uint8), model=model)
+
+    def solve(
+        self,
+        values: npt.ArrayLike,
+        *,
+        should_stop: Callable[[], bool] | None = None,
+        profiler: StageProfiler | None = None,
+    ) -> SolveResult:
+        """Solves a sudoku without modifying its values.
+
+        :param values: sudoku values of shape (9, 9) or (81,), 0 standing for an empty cell.
+        :param should_stop: callable polled during the search, returning `True` to stop it.
+        :param profiler: `StageProfiler` measuring the precheck, the grid reset, with the domains
+            preprocessing, and the search.
+        :returns: `SolveResult`, not solved if the sudoku has no solution or the search was
+            stopped.
+        """
+        start = time.perf_counter()
+        if np.size(values) != 81:  # noqa: PLR2004
+            error_msg = f"Expected 81 values, got '{np.size(values)}'"
+            raise ValueError(error_msg)
+        rejection = None
+        self._grid.profiler = profiler
+        try:
+            with profile_stage(profiler, Stage.PRECHECK):
+                precheck(values, model=self.model)
+            with profile_stage(profiler, Stage.GRID):
+                self._grid.reset(values)
+            with profile_stage(profiler, Stage.SEARCH):
+                self._engine(self._grid, should_stop=should_stop)
+            result = self._grid.values.copy()
+            solved = True
+        except (UnsolvableSudokuError, SearchCancelledError) as ex:
+            if isinstance(ex, InvalidSudokuError):
+                rejection = ex.rejection
+            result = np.array(values, dtype=np.uint8).reshape(9, 9)
+            solved = False
+        result.setflags(write=False)
+        return SolveResult(
+            values=result,
+            solved=solved,
+            engine=self.engine,
+            elapsed=time.perf_counter() - start,
+            rejection=rejection,
+        )
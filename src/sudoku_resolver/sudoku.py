@@ -4,29 +4,51 @@ import numpy as np
 from numpy import typing as npt
 
 from .backtracking import backtracking
+from .constraints import ConstraintModel
+from .engines import EngineName, get_engine
 from .exceptions import ConsistencyError
 from .grid import Grid
+from .parallel import parallel_backtracking
+from .portfolio import SolverConfiguration, portfolio_solve
+from .precheck import precheck
+from .profiling import Stage, StageProfiler, profile_stage
+from .trace import SearchTracer
+from .validation import validate
 
 
 class Sudoku:
     """Represents a Sudoku."""
 
-    def __init__(self, *, values: str | None = None, filepath: str | Path | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        values: str | None = None,
+        filepath: str | Path | None = None,
+        model: ConstraintModel | None = None,
+        profiler: StageProfiler | None = None,
+    ) -> None:
         """Initializes the Sudoku object.
 
         :param values: Sudoku grid as a string.
         :param filepath: Path to the file containing the Sudoku grid.
+        :param model: `ConstraintModel` of the sudoku variant, classic by default.
+        :param profiler: `StageProfiler` measuring every stage, from parsing to the consistency
+            check.
         """
-        if values is not None:
-            self._values = np.array(list(values), dtype=np.uint8).reshape(9, 9)
-        elif filepath is not None:
-            if isinstance(filepath, str):
-                filepath = Path(filepath)
-            self._values = self._parse_file(filepath)
-        else:
-            raise ValueError("Either values or filepath must be provided")
-
-        self._grid = Grid(self._values)
+        self.profiler = profiler
+        with profile_stage(profiler, Stage.PARSE):
+            if values is not None:
+                self._values = np.array(list(values), dtype=np.uint8).reshape(9, 9)
+            elif filepath is not None:
+                if isinstance(filepath, str):
+                    filepath = Path(filepath)
+                self._values = self._parse_file(filepath)
+            else:
+                raise ValueError("Either values or filepath must be provided")
+
+        with profile_stage(profiler, Stage.GRID):
+            self._grid = Grid(self._values, model=model, profiler=profiler)
+        self.winning_configuration: SolverConfiguration | None = None
 
     @property
     def grid(self) -> Grid:
@@ -34,22 +56,24 @@ class Sudoku:
         return self._grid
 
     @classmethod
-    def from_file(cls, filepath: str | Path) -> "Sudoku":
+    def from_file(cls, filepath: str | Path, *, model: ConstraintModel | None = None) -> "Sudoku":
         """Alternative constructor to create a Sudoku from a file.
 
         :param filepath: Path to the file containing the Sudoku.
+        :param model: `ConstraintModel` of the sudoku variant, classic by default.
         :returns: `Sudoku`.
         """
-        return cls(filepath=filepath)
+        return cls(filepath=filepath, model=model)
 
     @classmethod
-    def from_string(cls, values: str) -> "Sudoku":
+    def from_string(cls, values: str, *, model: ConstraintModel | None = None) -> "Sudoku":
         """Alternative constructor to create a Sudoku from a string.
 
         :param values: Sudoku grid as a string.
+        :param model: `ConstraintModel` of the sudoku variant, classic by default.
         :returns: `Sudoku`.
         """
-        return cls(values=values)
+        return cls(values=values, model=model)
 
     def _parse_file(self, filepath: Path) -> npt.NDArray[np.uint8]:
         """Gets values contained in raw file.
@@ -70,13 +94,65 @@ class Sudoku:
             raise ValueError(error_message)
         return array
 
-    def solve(self) -> None:
-        """Calls backtracking algorithm to solve the sudoku."""
-        backtracking(
-            grid=self._grid,
-            domains=self._grid.domains,
-            initial_domains=self._grid.initial_domains,
-        )
+    def solve(
+        self,
+        *,
+        engine: EngineName = EngineName.BACKTRACKING,
+        workers: int = 1,
+        portfolio: bool = False,
+        tracer: SearchTracer | None = None,
+    ) -> None:
+        """Calls the given engine to solve the sudoku.
+
+        :param engine: engine solving the sudoku. Only backtracking can search in parallel.
+        :param workers: number of processes searching the tree. When greater than 1, the top levels
+            of the search tree are split into subproblems solved in parallel by backtracking, which
+            excludes any other engine.
+        :param portfolio: whether to race several solver configurations instead. When greater than
+            1, `workers` then bounds the number of configurations running at once.
+        :param tracer: `SearchTracer` recording the search. Only a sequential backtracking search
+            can be traced.
+        :raises: `InvalidSudokuError` when the sudoku is rejected before any search.
+        :raises: `ValueError` when a tracer is given for another search, or another engine than
+            backtracking is asked for a parallel search.
+        """
+        if tracer is not None and (engine != EngineName.BACKTRACKING or workers > 1 or portfolio):
+            error_msg = "Only a sequential backtracking search can be traced"
+            raise ValueError(error_msg)
+        if engine != EngineName.BACKTRACKING and workers > 1 and not portfolio:
+            error_msg = f"Only backtracking can search in parallel, got engine '{engine.value}'"
+            raise ValueError(error_msg)
+        with profile_stage(self.profiler, Stage.PRECHECK):
+            precheck(self._values, model=self._grid.model)
+        with profile_stage(self.profiler, Stage.SEARCH):
+            self._search(engine=engine, workers=workers, portfolio=portfolio, tracer=tracer)
+
+    def _search(
+        self,
+        *,
+        engine: EngineName,
+        workers: int,
+        portfolio: bool,
+        tracer: SearchTracer | None,
+    ) -> None:
+        """Dispatches the search to the engine, pool or portfolio asked for by `solve`."""
+        if tracer is not None:
+            backtracking(
+                grid=self._grid,
+                domains=self._grid.domains,
+                initial_domains=self._grid.initial_domains,
+                tracer=tracer,
+            )
+            return
+        if portfolio:
+            self.winning_configuration = portfolio_solve(
+                self._grid, max_workers=workers if workers > 1 else None
+            )
+            return
+        if workers > 1:
+            parallel_backtracking(self._grid, max_workers=workers)
+            return
+        get_engine(engine)(self._grid)
 
     def check_consistency(self) -> bool:
         """Checks if the sudoku is consistent.
@@ -84,10 +160,10 @@ class Sudoku:
         :returns: `True` if the sudoku is consistent, `False` otherwise.
         :raises: `ConsistencyError` if sudoku is inconsistent.
         """
-        for index in self.grid.assigned_values_indexes:
-            value = self.grid.get_value(index)
-            if not self.grid.check_constraints(value=value, value_index=index):
-                raise ConsistencyError(value_index=index)  # type:ignore
+        with profile_stage(self.profiler, Stage.CHECK):
+            result = validate(self._values, complete=False, model=self._grid.model)
+        if not result.valid:
+            raise ConsistencyError(value_index=result.offending_indexes[0])
         return True
 
     def humanize(self) -> str:
@@ -125,9 +201,9 @@ class Sudoku:
         path = Path(filepath) if isinstance(filepath, str) else filepath
         path.parent.mkdir(parents=True, exist_ok=True)
 
-        formatted = ""
-        for row in self._values:
-            formatted += "".join(str(val) if val != 0 else "." for val in row) + "\n"
+        formatted = "".join(
+            "".join(str(val) if val != 0 else "." for val in row) + "\n" for row in self._values
+        )
 
         with Path.open(path, "w", encoding="utf-8") as f:
             f.write(formatted)
@@ -0,0 +1,289 @@
+"""Module containing the throughput and latency telemetry of batch runs, and its export in the
+Prometheus and OpenMetrics text formats."""
+
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TextIO
+
+from .puzzles import is_puzzle
+from .sinks import SolveRecord
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (
+    *(mantissa * 10.0**exponent for exponent in range(-5, 2) for mantissa in (1, 2, 5)),
+    100.0,
+)
+# Number of seconds between two progress reports
+DEFAULT_REPORT_INTERVAL = 5.0
+QUANTILES = (0.5, 0.95, 0.99)
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+_OUTCOMES = ("solved", "unsolved", "malformed", "duplicate")
+
+
+@dataclass(frozen=True)
+class TelemetrySnapshot:
+    """Metrics of a batch run at a point in time.
+
+    :param puzzles: number of puzzles handled, duplicates included.
+    :param outcomes: number of puzzles per outcome: solved, unsolved, malformed line that isn't a
+        puzzle, or duplicate of a puzzle handled before.
+    :param elapsed: seconds since the run started.
+    :param busy: seconds spent solving puzzles, summed over every worker.
+    :param workers: number of workers solving puzzles.
+    :param quantiles: estimated latency of a solve, in seconds, for each of `QUANTILES`.
+    """
+
+    puzzles: int
+    outcomes: dict[str, int]
+    elapsed: float
+    busy: float
+    workers: int
+    quantiles: dict[float, float]
+
+    @property
+    def throughput(self) -> float:
+        """Returns the number of puzzles handled per second."""
+        return self.puzzles / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Returns the share of the workers' time spent solving puzzles."""
+        return min(self.busy / (self.elapsed * self.workers), 1.0) if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        latencies = " ".join(
+            f"p{quantile * 100:g}={latency * 1000:.2f}ms"
+            for quantile, latency in self.quantiles.items()
+        )
+        outcomes = " ".join(f"{outcome}={count}" for outcome, count in self.outcomes.items())
+        return (
+            f"{self.puzzles} puzzles in {self.elapsed:.1f}s ({self.throughput:.1f}/s) "
+            f"{latencies} {outcomes} utilization={self.utilization:.0%}"
+        )
+
+
+class BatchTelemetry:
+    """Measures the throughput and latencies of a batch run.
+
+    Solve times are measured by the workers themselves and travel back with the records, so that
+    the counters are only ever updated by the thread consuming the results. They need no lock,
+    and reading them while they are updated, e.g. to serve them, may only lag one puzzle behind.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        workers: int = 1,
+        report_interval: float | None = DEFAULT_REPORT_INTERVAL,
+        stream: TextIO | None = sys.stderr,
+        metrics_path: str | Path | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initializes the telemetry and starts measuring the elapsed time.
+
+        :param workers: number of workers solving puzzles.
+        :param report_interval: number of seconds between two progress reports, reports being
+            only written on `close` if `None`.
+        :param stream: stream progress reports are written to, none being written if `None`.
+        :param metrics_path: path of a file the metrics are written to in the Prometheus text
+            format on every report.
+        :param clock: function returning the current time in seconds.
+        """
+        self.workers = workers
+        self.report_interval = report_interval
+        self.stream = stream
+        self.metrics_path = None if metrics_path is None else Path(metrics_path)
+        self._clock = clock
+        self._start = clock()
+        self._next_report = (
+            float("inf") if report_interval is None else self._start + report_interval
+        )
+        self._outcomes = dict.fromkeys(_OUTCOMES, 0)
+        self._buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._busy = 0.0
+        self._server: ThreadingHTTPServer | None = None
+
+    @property
+    def solves(self) -> int:
+        """Returns the number of puzzles solved by an engine, whatever the outcome."""
+        return self._outcomes["solved"] + self._outcomes["unsolved"]
+
+    @property
+    def handled(self) -> int:
+        """Returns the number of puzzles accounted for, whatever the outcome."""
+        return sum(self._outcomes.values())
+
+    def observe(self, record: SolveRecord) -> None:
+        """Accounts for a puzzle solved by an engine.
+
+        Lines that aren't puzzles are counted as malformed, out of the latency histogram.
+
+        :param record: `SolveRecord` of the puzzle.
+        """
+        if record.solved or is_puzzle(record.puzzle):
+            self._outcomes["solved" if record.solved else "unsolved"] += 1
+            self._buckets[bisect_left(LATENCY_BUCKETS, record.elapsed)] += 1
+            self._busy += record.elapsed
+        else:
+            self._outcomes["malformed"] += 1
+        if self._clock() >= self._next_report:
+            self.report()
+
+    def observe_many(self, records: Iterable[SolveRecord]) -> Iterator[SolveRecord]:
+        """Accounts for puzzles solved by an engine as they are consumed.
+
+        :param records: `SolveRecord`s of the puzzles.
+        :returns: iterator over the same records.
+        """
+        for record in records:
+            self.observe(record)
+            yield record
+
+    def observe_duplicates(self, count: int) -> None:
+        """Accounts for puzzles given the solution of a duplicate instead of being solved.
+
+        :param count: number of puzzles.
+        """
+        self._outcomes["duplicate"] += count
+
+    def quantile(self, quantile: float) -> float:
+        """Estimates a quantile of the solve latencies from the histogram.
+
+        Latencies are assumed to be evenly spread within their bucket, latencies above the last
+        bucket being reported as its upper bound.
+
+        :param quantile: quantile, between 0 and 1.
+        :returns: latency in seconds, 0 if no puzzle has been solved.
+        """
+        rank = quantile * self.solves
+        cumulated = 0
+        for i, count in enumerate(self._buckets):
+            if count and cumulated + count >= rank:
+                if i == len(LATENCY_BUCKETS):
+                    return LATENCY_BUCKETS[-1]
+                lower = LATENCY_BUCKETS[i - 1] if i else 0.0
+                return lower + (LATENCY_BUCKETS[i] - lower) * (rank - cumulated) / count
+            cumulated += count
+        return 0.0
+
+    def snapshot(self) -> TelemetrySnapshot:
+        """Takes a snapshot of the metrics.
+
+        :returns: `TelemetrySnapshot`.
+        """
+        outcomes = dict(self._outcomes)
+        return TelemetrySnapshot(
+            puzzles=sum(outcomes.values()),
+            outcomes=outcomes,
+            elapsed=self._clock() - self._start,
+            busy=self._busy,
+            workers=self.workers,
+            quantiles={quantile: self.quantile(quantile) for quantile in QUANTILES},
+        )
+
+    def render(self, *, openmetrics: bool = False) -> str:
+        """Renders the metrics in the Prometheus text format.
+
+        :param openmetrics: whether to follow the OpenMetrics text format instead.
+        :returns: exposition text.
+        """
+        snapshot = self.snapshot()
+        puzzles_name = "sudoku_batch_puzzles" if openmetrics else "sudoku_batch_puzzles_total"
+        busy_name = (
+            "sudoku_batch_busy_seconds" if openmetrics else "sudoku_batch_busy_seconds_total"
+        )
+        lines = [
+            f"# HELP {puzzles_name} Puzzles handled, by outcome.",
+            f"# TYPE {puzzles_name} counter",
+            *(
+                f'sudoku_batch_puzzles_total{{outcome="{outcome}"}} {count}'
+                for outcome, count in snapshot.outcomes.items()
+            ),
+            "# HELP sudoku_batch_solve_seconds Time spent solving a puzzle.",
+            "# TYPE sudoku_batch_solve_seconds histogram",
+        ]
+        cumulated = 0
+        for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), self._buckets, strict=True):
+            cumulated += count
+            lines.append(f'sudoku_batch_solve_seconds_bucket{{le="{bound}"}} {cumulated}')
+        lines += [
+            f"sudoku_batch_solve_seconds_sum {snapshot.busy}",
+            f"sudoku_batch_solve_seconds_count {cumulated}",
+            f"# HELP {busy_name} Time spent solving puzzles, summed over every worker.",
+            f"# TYPE {busy_name} counter",
+            f"sudoku_batch_busy_seconds_total {snapshot.busy}",
+            "# HELP sudoku_batch_solve_quantile_seconds Estimated quantiles of the solve time.",
+            "# TYPE sudoku_batch_solve_quantile_seconds gauge",
+            *(
+                f'sudoku_batch_solve_quantile_seconds{{quantile="{quantile}"}} {latency}'
+                for quantile, latency in snapshot.quantiles.items()
+            ),
+        ]
+        for name, description, value in (
+            ("elapsed_seconds", "Time since the batch run started.", snapshot.elapsed),
+            ("throughput", "Puzzles handled per second.", snapshot.throughput),
+            ("workers", "Workers solving puzzles.", snapshot.workers),
+            ("utilization", "Share of the workers' time spent solving.", snapshot.utilization),
+        ):
+            lines += [
+                f"# HELP sudoku_batch_{name} {description}",
+                f"# TYPE sudoku_batch_{name} gauge",
+                f"sudoku_batch_{name} {value}",
+            ]
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def report(self) -> None:
+        """Writes a progress report to the stream and the metrics to their file."""
+        if self.report_interval is not None:
+            self._next_report = self._clock() + self.report_interval
+        if self.stream is not None:
+            print(self.snapshot(), file=self.stream, flush=True)
+        if self.metrics_path is not None:
+            # Written to a temporary file first, so that a scraper never reads a partial file
+            temporary_path = self.metrics_path.with_name(self.metrics_path.name + ".tmp")
+            temporary_path.write_text(self.render(), encoding="utf-8")
+            temporary_path.replace(self.metrics_path)
+
+    def serve(self, port: int, *, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serves the metrics in the OpenMetrics text format from a background thread.
+
+        :param port: port to listen on, 0 picking a free one.
+        :param host: address to listen on.
+        :returns: running server, shut down on `close`.
+        """
+        telemetry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            """Handler answering every GET request with the metrics."""
+
+            def do_GET(self) -> None:
+                body = telemetry.render(openmetrics=True).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                return
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server
+
+    def close(self) -> None:
+        """Writes a last report and shuts the metrics server down."""
+        self.report()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,164 @@
+"""Module containing the digit templates of a sudoku and a pattern overlay engine searching them.
+
+A template is a valid placement of a single digit: one cell in every unit. A classic sudoku has
+46,656 of them, and a solution is 9 disjoint templates, one per digit. Templates are stored as
+81-bit masks split in two 64-bit words, bit `row * 9 + column` standing for a cell, so that
+checking them against givens or against each other is a couple of bitwise operations, run on
+whole tables at once.
+"""
+
+from collections.abc import Callable
+from functools import lru_cache
+
+import numpy as np
+from numpy import typing as npt
+
+from .constraints import CLASSIC, ConstraintModel
+from .exceptions import SearchCancelledError, UnsolvableSudokuError
+from .grid import Grid
+
+_ROWS = np.arange(9)
+_COLUMNS = np.arange(9)
+_BITS = np.left_shift(np.uint64(1), np.arange(64, dtype=np.uint64))
+# Masks of every cell of the grid
+_FULL = np.array([2**64 - 1, 2 ** (81 - 64) - 1], dtype=np.uint64)
+# Number of models whose templates are kept, a table weighing up to a megabyte
+TEMPLATES_CACHE_SIZE = 4
+
+
+def _to_masks(selected: npt.NDArray[np.bool_]) -> npt.NDArray[np.uint64]:
+    """Packs selections of cells into 81-bit masks.
+
+    :param selected: boolean array of shape (N, 81).
+    :returns: masks of shape (N, 2), cells 0 to 63 in the first word and 64 to 80 in the second.
+    """
+    # Bits are distinct, so that summing them is the same as or-ing them
+    return np.stack(
+        [
+            (selected[:, :64] * _BITS[:64]).sum(axis=1, dtype=np.uint64),
+            (selected[:, 64:] * _BITS[: 81 - 64]).sum(axis=1, dtype=np.uint64),
+        ],
+        axis=1,
+    )
+
+
+def compile_templates(model: ConstraintModel = CLASSIC) -> npt.NDArray[np.uint64]:
+    """Enumerates the templates of a constraint model.
+
+    Templates are built row by row, one column per row, dropping partial placements that put a
+    digit twice in a column or in one of the other units. The model's first 18 units must be its
+    rows and columns, as in every predefined model.
+
+    :param model: `ConstraintModel` whose templates to enumerate.
+    :returns: read-only masks of every template, of shape (N, 2).
+    """
+    others = model.membership[18:]
+    columns = np.zeros((1, 0), dtype=np.intp)
+    used_columns = np.zeros(1, dtype=np.intp)
+    # Number of cells of every partial placement in each of the other units
+    counts = np.zeros((1, len(others)), dtype=np.intp)
+    for row in _ROWS:
+        placements, column = np.nonzero((used_columns[:, None] >> _COLUMNS & 1) == 0)
+        new_counts = counts[placements] + others[:, row * 9 + column].T
+        valid = (new_counts <= 1).all(axis=1)
+        placements, column, counts = placements[valid], column[valid], new_counts[valid]
+        columns = np.concatenate([columns[placements], column[:, None]], axis=1)
+        used_columns = used_columns[placements] | 1 << column
+    columns = columns[(counts == 1).all(axis=1)]
+    selected = np.zeros((len(columns), 81), dtype=np.bool_)
+    selected[np.arange(len(columns))[:, None], _ROWS * 9 + columns] = True
+    masks = _to_masks(selected)
+    masks.setflags(write=False)
+    return masks
+
+
+@lru_cache(maxsize=TEMPLATES_CACHE_SIZE)
+def get_templates(model: ConstraintModel) -> npt.NDArray[np.uint64]:
+    """Gets the templates of a constraint model, enumerated on first use.
+
+    The templates of the most recently used models are kept, see `TEMPLATES_CACHE_SIZE`.
+
+    :param model: `ConstraintModel` whose templates to get.
+    :returns: read-only masks of every template, of shape (N, 2).
+    """
+    return compile_templates(model)
+
+
+def _disjoint(templates: npt.NDArray[np.uint64], mask: npt.NDArray[np.uint64]) -> npt.NDArray:
+    """Selects the templates sharing no cell with a mask."""
+    return templates[((templates & mask) == 0).all(axis=1)]
+
+
+def _search(
+    candidates: dict[int, npt.NDArray[np.uint64]],
+    placed: npt.NDArray[np.uint64],
+    should_stop: Callable[[], bool] | None,
+) -> dict[int, npt.NDArray[np.uint64]] | None:
+    """Picks a template for every digit, none of them sharing a cell.
+
+    The digit with the fewest candidate templates is tried first. Once a template is picked, the
+    templates overlapping it are dropped from the other digits, and the branch is cut as soon as
+    a digit has no template left or a cell can't be covered by any digit anymore.
+
+    :param candidates: candidate templates of every digit left to place.
+    :param placed: mask of the cells covered by the templates picked so far.
+    :param should_stop: callback polled at every node, the search being cancelled as soon as it
+        returns `True`.
+    :returns: picked template of every digit, `None` if there is none.
+    :raises: `SearchCancelledError` when `should_stop` asked for the search to stop.
+    """
+    if not candidates:
+        return {}
+    digit = min(candidates, key=lambda d: len(candidates[d]))
+    for template in candidates[digit]:
+        if should_stop is not None and should_stop():
+            raise SearchCancelledError
+        remaining = {
+            other: _disjoint(templates, template)
+            for other, templates in candidates.items()
+            if other != digit
+        }
+        if any(not len(templates) for templates in remaining.values()):
+            continue
+        covered = placed | template
+        for templates in remaining.values():
+            covered = covered | np.bitwise_or.reduce(templates, axis=0)
+        if (covered != _FULL).any():
+            continue
+        if (solution := _search(remaining, placed | template, should_stop)) is not None:
+            solution[digit] = template
+            return solution
+    return None
+
+
+def template_solve(grid: Grid, *, should_stop: Callable[[], bool] | None = None) -> None:
+    """Solves a sudoku by overlaying one template per digit.
+
+    Every digit's templates are first filtered against the givens: a template must cover the
+    givens of its digit and none of the other givens.
+
+    :param grid: `Grid` containing the sudoku to solve. It is filled in place.
+    :param should_stop: callback polled at every node of the search, see `_search`.
+    :raises: `UnsolvableSudokuError` when no combination of templates fits the givens.
+    :raises: `SearchCancelledError` when `should_stop` asked for the search to stop.
+    """
+    templates = get_templates(grid.model)
+    cells = grid.values.reshape(81)
+    givens = _to_masks(cells == np.arange(1, 10)[:, None])
+    occupied = np.bitwise_or.reduce(givens, axis=0)
+    candidates = {
+        digit: templates[
+            ((templates & mask) == mask).all(axis=1)
+            & ((templates & (occupied ^ mask)) == 0).all(axis=1)
+        ]
+        for digit, mask in enumerate(givens, start=1)
+    }
+    if any(not len(digit_templates) for digit_templates in candidates.values()):
+        raise UnsolvableSudokuError
+    solution = _search(candidates, np.zeros(2, dtype=np.uint64), should_stop)
+    if solution is None:
+        raise UnsolvableSudokuError
+    for digit, template in solution.items():
+        for cell in range(81):
+            if int(template[cell // 64]) >> (cell % 64) & 1 and not cells[cell]:
+                grid.set_value(digit, (cell // 9, cell % 9))
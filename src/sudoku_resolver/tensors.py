@@ -0,0 +1,93 @@
+"""Module containing vectorized methods working on candidates tensors of one or many grids.
+
+A candidates tensor has a (9, 9, 9) shape for a single grid, or (N, 9, 9, 9) for a batch of N
+grids: `candidates[..., i, j, d - 1]` is `True` if digit d can be placed at (i, j). The same
+candidates are packed in a bitmask of shape (9, 9) or (N, 9, 9), bit d standing for digit d.
+"""
+
+import numpy as np
+from numpy import typing as npt
+
+from .constraints import CLASSIC, ConstraintModel
+
+_DIGITS = np.arange(1, 10, dtype=np.uint16)
+_BITS = (1 << _DIGITS).astype(np.uint16)
+
+
+def _check_shape(array: npt.NDArray, shape: tuple[int, ...], name: str) -> None:
+    """Checks that the trailing dimensions of an array match those of a single grid."""
+    if array.shape[array.ndim - len(shape) :] != shape or array.ndim > len(shape) + 1:
+        error_msg = f"Expected {name} of shape {shape} or (N, *{shape}), got '{array.shape}'"
+        raise ValueError(error_msg)
+
+
+def to_bitmasks(candidates: npt.ArrayLike) -> npt.NDArray[np.uint16]:
+    """Packs a candidates tensor into bitmasks.
+
+    :param candidates: boolean tensor of shape (9, 9, 9) or (N, 9, 9, 9).
+    :returns: bitmasks of shape (9, 9) or (N, 9, 9).
+    """
+    tensor = np.asarray(candidates, dtype=np.bool_)
+    _check_shape(tensor, (9, 9, 9), "candidates")
+    return (tensor * _BITS).sum(axis=-1, dtype=np.uint16)
+
+
+def from_bitmasks(bitmasks: npt.ArrayLike) -> npt.NDArray[np.bool_]:
+    """Unpacks bitmasks into a candidates tensor.
+
+    :param bitmasks: bitmasks of shape (9, 9) or (N, 9, 9).
+    :returns: boolean tensor of shape (9, 9, 9) or (N, 9, 9, 9).
+    """
+    masks = np.asarray(bitmasks, dtype=np.uint16)
+    _check_shape(masks, (9, 9), "bitmasks")
+    return (masks[..., None] & _BITS) != 0
+
+
+def candidates_from_values(
+    values: npt.ArrayLike, *, model: ConstraintModel = CLASSIC
+) -> npt.NDArray[np.bool_]:
+    """Computes the candidates of one or many grids from their values only.
+
+    Assigned cells hold their value as single candidate, empty cells every digit no peer holds.
+
+    :param values: grid of shape (9, 9) or batch of grids of shape (N, 9, 9), 0 standing for an
+        empty cell.
+    :param model: `ConstraintModel` giving the units, rows, columns and subgrids by default.
+    :returns: boolean tensor of shape (9, 9, 9) or (N, 9, 9, 9).
+    """
+    array = np.asarray(values)
+    _check_shape(array, (9, 9), "values")
+    cells = array.reshape(-1, 81)
+    placed = cells[:, :, None] == _DIGITS
+    membership = model.membership.astype(np.intp)
+    units_placed = membership @ placed
+    candidates = (membership.T @ units_placed == 0) & (cells == 0)[:, :, None]
+    return (candidates | placed).reshape(*array.shape, 9)
+
+
+def propagate(
+    candidates: npt.ArrayLike, *, model: ConstraintModel = CLASSIC
+) -> npt.NDArray[np.bool_]:
+    """Removes the digit of every single-candidate cell from its peers, until a fixpoint.
+
+    This is the arc consistency `Grid.enforce_arc_consistency` enforces, run on whole batches
+    at once. Cells left without candidates are kept empty rather than reported.
+
+    :param candidates: boolean tensor of shape (9, 9, 9) or (N, 9, 9, 9). It isn't modified.
+    :param model: `ConstraintModel` giving the units, rows, columns and subgrids by default.
+    :returns: propagated boolean tensor of the same shape.
+    """
+    tensor = np.asarray(candidates, dtype=np.bool_)
+    _check_shape(tensor, (9, 9, 9), "candidates")
+    cells = tensor.reshape(-1, 81, 9).copy()
+    membership = model.membership.astype(np.intp)
+    # Number of units of every cell, shape (81, 1)
+    cells_units_counts = membership.sum(axis=0)[:, None]
+    while True:
+        singles = cells & (cells.sum(axis=2, keepdims=True) == 1)
+        units_singles = membership @ singles
+        # Digits held as single candidate by another cell of one of the cell's units
+        taken = (membership.T @ units_singles - cells_units_counts * singles) > 0
+        if not (cells & taken).any():
+            return cells.reshape(tensor.shape)
+        cells &= ~taken
@@ -0,0 +1,288 @@
+"""Module containing a compact binary log of the search, and tools to analyse it offline.
+
+A trace file starts with a header holding a magic number, a format version and the 81 values of
+the searched sudoku. It is followed by fixed-size records of 4 bytes: event kind, cell number
+(row * 9 + column), value and depth of the search, i.e. the number of assignments on the stack,
+when the event happened.
+"""
+
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+import numpy as np
+from numpy import typing as npt
+
+from .domains import Domain
+from .exceptions import TraceError
+from .grid import Index
+
+TRACE_MAGIC = b"SDKT"
+TRACE_VERSION = 1
+# Number of records buffered in memory between two writes to the file
+DEFAULT_BUFFER_RECORDS = 1 << 16
+
+_HEADER = struct.Struct("<4sB81s")
+_RECORD = struct.Struct("<4B")
+_RECORD_DTYPE = np.dtype([("event", "u1"), ("cell", "u1"), ("value", "u1"), ("depth", "u1")])
+
+
+class TraceEvent(IntEnum):
+    """Enumeration of the events recorded during the search."""
+
+    ASSIGN = 1
+    BACKTRACK = 2
+    DEAD_END = 3
+    PRUNE = 4
+
+
+class SearchTracer:
+    """Records search events in a memory buffer, flushed to a file once full.
+
+    Each event costs a single `struct.pack_into` in a preallocated buffer, so that tracing a
+    search keeps it almost as fast as an untraced one.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        values: npt.ArrayLike,
+        *,
+        buffer_records: int = DEFAULT_BUFFER_RECORDS,
+    ) -> None:
+        """Initializes the tracer and writes the header of the trace file.
+
+        :param path: path of the trace file, overwritten if it exists.
+        :param values: values of the searched sudoku, 0 standing for an empty cell.
+        :param buffer_records: number of records buffered before writing them to the file.
+        """
+        if buffer_records < 1:
+            error_msg = f"Expected a positive number of buffered records, got '{buffer_records}'"
+            raise ValueError(error_msg)
+        self.path = Path(path)
+        self.records = 0
+        self._buffer = bytearray(buffer_records * _RECORD.size)
+        self._offset = 0
+        self._stream = self.path.open("wb")
+        self._stream.write(
+            _HEADER.pack(
+                TRACE_MAGIC, TRACE_VERSION, np.asarray(values, dtype=np.uint8).reshape(81).tobytes()
+            )
+        )
+
+    def record(self, event: TraceEvent, value_index: Index, value: int, depth: int) -> None:
+        """Records an event.
+
+        :param event: kind of the event.
+        :param value_index: index of the cell the event happened at.
+        :param value: value assigned, undone or pruned, 0 for a dead end.
+        :param depth: number of assignments on the stack when the event happened.
+        """
+        if self._offset == len(self._buffer):
+            self.flush()
+        _RECORD.pack_into(
+            self._buffer,
+            self._offset,
+            event,
+            value_index[0] * 9 + value_index[1],
+            int(value),
+            depth,
+        )
+        self._offset += _RECORD.size
+        self.records += 1
+
+    def record_prunings(
+        self,
+        previous_domains: list[list[Domain | None]],
+        domains: list[list[Domain | None]],
+        *,
+        depth: int,
+    ) -> None:
+        """Records a pruning for every value removed from a domain between two snapshots.
+
+        :param previous_domains: domains before propagation.
+        :param domains: domains after propagation.
+        :param depth: number of assignments on the stack during propagation.
+        """
+        for i, (previous_row, row) in enumerate(zip(previous_domains, domains, strict=True)):
+            for j, (previous_domain, domain) in enumerate(zip(previous_row, row, strict=True)):
+                for value in sorted((previous_domain or set()) - (domain or set())):
+                    self.record(TraceEvent.PRUNE, (i, j), value, depth)
+
+    def flush(self) -> None:
+        """Writes the buffered records to the file."""
+        self._stream.write(memoryview(self._buffer)[: self._offset])
+        self._offset = 0
+
+    def close(self) -> None:
+        """Flushes the buffered records and closes the file."""
+        if self._stream.closed:
+            return
+        self.flush()
+        self._stream.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+@dataclass(frozen=True)
+class Trace:
+    """Search trace read back from a file.
+
+    :param values: values of the searched sudoku, of shape (9, 9).
+    :param events: structured array of the records, with `event`, `cell`, `value` and `depth`
+        fields.
+    """
+
+    values: npt.NDArray[np.uint8]
+    events: npt.NDArray[np.void]
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Trace":
+        """Reads a trace file.
+
+        :param path: path of the trace file.
+        :returns: `Trace`.
+        :raises: `TraceError` when the file isn't a trace, has an unsupported version or is
+            truncated.
+        """
+        data = Path(path).read_bytes()
+        if len(data) < _HEADER.size:
+            error_msg = "file is shorter than the header"
+            raise TraceError(error_msg)
+        magic, version, values = _HEADER.unpack_from(data)
+        if magic != TRACE_MAGIC:
+            error_msg = "file isn't a search trace"
+            raise TraceError(error_msg)
+        if version != TRACE_VERSION:
+            error_msg = f"unsupported version '{version}'"
+            raise TraceError(error_msg)
+        if (len(data) - _HEADER.size) % _RECORD.size:
+            error_msg = "last record is truncated"
+            raise TraceError(error_msg)
+        return cls(
+            values=np.frombuffer(values, dtype=np.uint8).reshape(9, 9),
+            events=np.frombuffer(data, dtype=_RECORD_DTYPE, offset=_HEADER.size),
+        )
+
+    def replay(self) -> npt.NDArray[np.uint8]:
+        """Applies the recorded assignments and backtracks to the sudoku.
+
+        :returns: values of the grid once every event has been applied.
+        """
+        values = self.values.copy().reshape(81)
+        for event, cell, value, _ in self.events.tolist():
+            if event == TraceEvent.ASSIGN:
+                values[cell] = value
+            elif event == TraceEvent.BACKTRACK:
+                values[cell] = 0
+        return values.reshape(9, 9)
+
+
+@dataclass
+class SearchNode:
+    """Node of the search tree, standing for an assignment.
+
+    :param value_index: index of the assigned cell, `None` for the root.
+    :param value: assigned value, 0 for the root.
+    :param failed: whether the assignment has been undone.
+    :param children: assignments made under this one, in order.
+    """
+
+    value_index: Index | None
+    value: int
+    failed: bool = False
+    children: list["SearchNode"] = field(default_factory=list)
+
+    def walk(self, depth: int = 0) -> Iterator[tuple[int, "SearchNode"]]:
+        """Iterates over the nodes of the subtree in depth-first order.
+
+        :param depth: depth of this node.
+        :returns: iterator over every node and its depth, this node included.
+        """
+        stack = [(depth, self)]
+        while stack:
+            node_depth, node = stack.pop()
+            yield node_depth, node
+            stack.extend((node_depth + 1, child) for child in reversed(node.children))
+
+
+def build_search_tree(trace: Trace) -> SearchNode:
+    """Rebuilds the search tree from the assignments and backtracks of a trace.
+
+    :param trace: `Trace`.
+    :returns: root of the tree, whose children are the assignments made at depth 0.
+    """
+    path = [SearchNode(None, 0)]
+    for event, cell, value, depth in trace.events.tolist():
+        if event == TraceEvent.ASSIGN:
+            del path[depth + 1 :]
+            node = SearchNode((cell // 9, cell % 9), value)
+            path[-1].children.append(node)
+            path.append(node)
+        elif event == TraceEvent.BACKTRACK:
+            path[depth + 1].failed = True
+            del path[depth + 1 :]
+    return path[0]
+
+
+@dataclass(frozen=True)
+class TraceSummary:
+    """Statistics of a search trace.
+
+    :param events: number of events of every kind.
+    :param max_depth: deepest assignment, as a number of assignments on the stack.
+    :param depth_histogram: number of assignments made at every depth.
+    :param hot_cells: cells whose assignments have been undone the most, with the number of
+        backtracks, most first.
+    """
+
+    events: dict[TraceEvent, int]
+    max_depth: int
+    depth_histogram: list[int]
+    hot_cells: list[tuple[Index, int]]
+
+    def __str__(self) -> str:
+        lines = [f"{event.name}: {count}" for event, count in self.events.items()]
+        lines.append(f"MAX DEPTH: {self.max_depth}")
+        lines.append("DEPTH HISTOGRAM:")
+        lines.extend(
+            f"  {depth:>2} {count}" for depth, count in enumerate(self.depth_histogram) if count
+        )
+        lines.append("HOT CELLS:")
+        lines.extend(f"  {index} {count}" for index, count in self.hot_cells)
+        return "\n".join(lines)
+
+
+def summarize(trace: Trace, *, hot_cells: int = 10) -> TraceSummary:
+    """Computes statistics of a search trace.
+
+    :param trace: `Trace`.
+    :param hot_cells: number of hot cells reported.
+    :returns: `TraceSummary`.
+    """
+    events = trace.events
+    assignments = events[events["event"] == TraceEvent.ASSIGN]
+    backtracks = np.bincount(events["cell"][events["event"] == TraceEvent.BACKTRACK], minlength=81)
+    depth_histogram = np.bincount(assignments["depth"]).tolist()
+    hot = [int(cell) for cell in np.argsort(-backtracks, kind="stable")[:hot_cells]]
+    return TraceSummary(
+        events={event: int((events["event"] == event).sum()) for event in TraceEvent},
+        max_depth=max(len(depth_histogram) - 1, 0),
+        depth_histogram=depth_histogram,
+        hot_cells=[
+            ((cell // 9, cell % 9), int(backtracks[cell])) for cell in hot if backtracks[cell]
+        ],
+    )
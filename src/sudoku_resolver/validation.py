@@ -0,0 +1,97 @@
+"""Module containing vectorized methods to validate one or many sudoku grids at once."""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy import typing as npt
+
+from .constraints import CLASSIC, ConstraintModel
+
+if TYPE_CHECKING:
+    from .grid import Index
+
+# Flat indexes of the cells of every row, column and subgrid, shape (27, 9)
+UNITS = CLASSIC.units
+
+
+@dataclass(frozen=True)
+class ValidationResult:
+    """Result of the validation of one or many grids.
+
+    For a single grid, `valid` is a 0-d array and `offending_cells` has a (9, 9) shape. For a
+    batch of N grids, they respectively have (N,) and (N, 9, 9) shapes.
+    """
+
+    valid: npt.NDArray[np.bool_]
+    offending_cells: npt.NDArray[np.bool_]
+
+    @property
+    def offending_indexes(self) -> list["Index"]:
+        """Returns the indexes of the offending cells of a single grid, in row-major order."""
+        if self.offending_cells.ndim != 2:  # noqa: PLR2004
+            error_msg = "Offending indexes are only available for a single grid"
+            raise ValueError(error_msg)
+        return [(int(i), int(j)) for i, j in np.argwhere(self.offending_cells)]
+
+
+def _find_offending_cells(
+    grids: npt.NDArray[np.uint8], *, complete: bool, model: ConstraintModel
+) -> npt.NDArray[np.bool_]:
+    """Finds the cells breaking a constraint, using digits counts per unit.
+
+    :param grids: flattened grids, shape (N, 81).
+    :param complete: whether empty cells are offending.
+    :param model: `ConstraintModel` giving the units.
+    :returns: mask of the offending cells, shape (N, 81).
+    """
+    # Values out of range are all counted as 10
+    units = np.minimum(grids[:, model.units], 10).reshape(-1, 9).astype(np.intp)
+    keys = units + 11 * np.arange(len(units))[:, None]
+    duplicates = np.bincount(keys.ravel(), minlength=11 * len(units)).reshape(-1, 11) > 1
+    duplicates[:, 0] = False
+    offending_positions = np.take_along_axis(duplicates, units, axis=1).reshape(len(grids), -1)
+    offending = np.zeros(grids.shape, dtype=np.bool_)
+    grid_indexes, positions = np.nonzero(offending_positions)
+    offending[grid_indexes, model.units.ravel()[positions]] = True
+    offending |= grids > 9  # noqa: PLR2004
+    if complete:
+        offending |= grids == 0
+    return offending
+
+
+def validate(
+    values: npt.ArrayLike, *, complete: bool = True, model: ConstraintModel = CLASSIC
+) -> ValidationResult:
+    """Checks every unit of one or many grids at once.
+
+    Duplicates are found by sorting every unit, and the offending cells are only computed for
+    the grids that failed, so validating a batch of valid grids costs a gather and a sort.
+
+    :param values: grid of shape (9, 9) or batch of grids of shape (N, 9, 9), 0 standing for an
+        empty cell.
+    :param complete: whether empty cells make a grid invalid, e.g. to verify solutions.
+    :param model: `ConstraintModel` giving the units, rows, columns and subgrids by default.
+    :returns: `ValidationResult`.
+    """
+    array = np.asarray(values)
+    if array.shape[-2:] != (9, 9):
+        error_msg = f"Expected grids of shape (9, 9) or (N, 9, 9), got '{array.shape}'"
+        raise ValueError(error_msg)
+    grids = array.reshape(-1, 81)
+
+    units = np.sort(grids[:, model.units], axis=2)
+    duplicates = (units[..., 1:] == units[..., :-1]) & (units[..., 1:] != 0)
+    invalid = duplicates.any(axis=(1, 2)) | (grids > 9).any(axis=1)  # noqa: PLR2004
+    if complete:
+        invalid |= (grids == 0).any(axis=1)
+
+    offending = np.zeros(grids.shape, dtype=np.bool_)
+    if (invalid_indexes := np.flatnonzero(invalid)).size:
+        offending[invalid_indexes] = _find_offending_cells(
+            grids[invalid_indexes], complete=complete, model=model
+        )
+    return ValidationResult(
+        valid=~invalid.reshape(array.shape[:-2]),
+        offending_cells=offending.reshape(array.shape),
+    )
@@ -2,4 +2,22 @@
 
 from pathlib import Path
 
+import numpy as np
+
 SUDOKU_PATH = Path(__file__).parent / "data" / "sudoku.txt"
+SOLVED_SUDOKU = np.asarray(
+    [
+        [6, 7, 5, 8, 4, 2, 1, 3, 9],
+        [8, 2, 4, 1, 3, 9, 6, 7, 5],
+        [1, 9, 3, 5, 7, 6, 4, 8, 2],
+        [3, 5, 2, 7, 8, 4, 9, 6, 1],
+        [9, 4, 6, 2, 1, 3, 8, 5, 7],
+        [7, 1, 8, 9, 6, 5, 2, 4, 3],
+        [5, 3, 1, 4, 2, 8, 7, 9, 6],
+        [2, 8, 9, 6, 5, 7, 3, 1, 4],
+        [4, 6, 7, 3, 9, 1, 5, 2, 8],
+    ],
+    dtype=np.uint8,
+)
+HARD_SUDOKU = "800000006700000501956000020080000000007900040400005192000810007100090200000600000"
+UNSOLVABLE_SUDOKU = "123456780" + "000000009" + "0" * 63
@@ -0,0 +1,97 @@
+"""Backtracking tests module."""
+
+from random import Random
+
+import pytest
+
+from sudoku_resolver.backtracking import (
+    VALUE_ORDERINGS,
+    ValueOrdering,
+    backtracking,
+    conflict_directed_backjumping,
+    luby,
+    restarting_backtracking,
+)
+from sudoku_resolver.engines import EngineName
+from sudoku_resolver.exceptions import SearchCutoffError, UnsolvableSudokuError
+from sudoku_resolver.sudoku import Sudoku
+from tests import HARD_SUDOKU, SOLVED_SUDOKU, SUDOKU_PATH, UNSOLVABLE_SUDOKU
+
+
+def test_luby() -> None:
+    assert [luby(i) for i in range(1, 16)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+
+
+@pytest.mark.parametrize(
+    "value_ordering,expected_values",
+    [
+        (ValueOrdering.LEAST_CONSTRAINING, [7, 5, 8, 9]),
+        (ValueOrdering.NATURAL, [5, 7, 8, 9]),
+        (ValueOrdering.RANDOM, [8, 5, 7, 9]),
+    ],
+)
+def test_value_orderings(value_ordering: ValueOrdering, expected_values: list[int]) -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+
+    assert VALUE_ORDERINGS[value_ordering](sudoku.grid, (2, 4), Random(0)) == expected_values
+
+
+@pytest.mark.parametrize("value_ordering", list(ValueOrdering))
+def test_backtracking_value_ordering(value_ordering: ValueOrdering) -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    backtracking(
+        grid=sudoku.grid,
+        domains=sudoku.grid.domains,
+        initial_domains=sudoku.grid.initial_domains,
+        value_ordering=value_ordering,
+        rng=Random(0),
+    )
+
+    assert (sudoku.grid.values == SOLVED_SUDOKU).all()
+
+
+def test_backtracking_unsolvable() -> None:
+    sudoku = Sudoku.from_string(UNSOLVABLE_SUDOKU)
+
+    with pytest.raises(UnsolvableSudokuError):
+        sudoku.solve()
+
+
+def test_backtracking_cutoff() -> None:
+    sudoku = Sudoku.from_string(HARD_SUDOKU)
+
+    with pytest.raises(SearchCutoffError):
+        backtracking(
+            grid=sudoku.grid,
+            domains=sudoku.grid.domains,
+            initial_domains=sudoku.grid.initial_domains,
+            max_backtracks=0,
+        )
+
+
+def test_restarting_backtracking() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    restarting_backtracking(grid=sudoku.grid, restart_base=1, rng=Random(0))
+
+    assert (sudoku.grid.values == SOLVED_SUDOKU).all()
+
+
+@pytest.mark.parametrize("max_nogoods", [0, 4096])
+def test_conflict_directed_backjumping(max_nogoods: int) -> None:
+    sudoku = Sudoku.from_string(HARD_SUDOKU)
+    conflict_directed_backjumping(
+        grid=sudoku.grid,
+        domains=sudoku.grid.domains,
+        initial_domains=sudoku.grid.initial_domains,
+        max_nogoods=max_nogoods,
+    )
+
+    assert not (sudoku.grid.values == 0).any()
+    assert sudoku.check_consistency()
+
+
+def test_conflict_directed_backjumping_unsolvable() -> None:
+    sudoku = Sudoku.from_string(UNSOLVABLE_SUDOKU)
+
+    with pytest.raises(UnsolvableSudokuError):
+        sudoku.solve(engine=EngineName.BACKJUMPING)
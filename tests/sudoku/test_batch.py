@@ -0,0 +1,197 @@
+"""Batch tests module."""
+
+import gzip
+from pathlib import Path
+
+import pytest
+
+from sudoku_resolver.batch import CHECKPOINT_SUFFIX, Checkpoint, solve_batch, solve_puzzle
+from sudoku_resolver.dedup import DedupMode
+from sudoku_resolver.exceptions import CheckpointError
+from sudoku_resolver.profiling import Stage, StageProfiler
+from sudoku_resolver.sinks import Compression, SinkFormat
+from sudoku_resolver.sudoku import Sudoku
+from sudoku_resolver.telemetry import BatchTelemetry
+from tests import SOLVED_SUDOKU, SUDOKU_PATH, UNSOLVABLE_SUDOKU
+
+SUDOKU = Sudoku.from_file(SUDOKU_PATH).to_string()
+SOLUTION = "".join(map(str, SOLVED_SUDOKU.ravel()))
+
+
+@pytest.fixture
+def input_path(tmp_path: Path) -> Path:
+    path = tmp_path / "input.txt"
+    path.write_text(
+        "\n".join([SUDOKU, SUDOKU.replace("0", "."), "", UNSOLVABLE_SUDOKU, SUDOKU, "0" * 81]),
+        encoding="utf-8",
+    )
+    return path
+
+
+def _read_solutions(path: Path) -> list[str]:
+    return path.read_text(encoding="utf-8").splitlines()
+
+
+@pytest.mark.parametrize(
+    "puzzle,expected_solution",
+    [
+        (SUDOKU, SOLUTION),
+        (SUDOKU.replace("0", "."), SOLUTION),
+        (UNSOLVABLE_SUDOKU, UNSOLVABLE_SUDOKU),
+    ],
+)
+def test_solve_puzzle(puzzle: str, expected_solution: str) -> None:
+    record = solve_puzzle(puzzle)
+
+    assert record.puzzle == puzzle
+    assert (record.solution or record.puzzle) == expected_solution
+    assert record.solved == (expected_solution == SOLUTION)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_solve_batch(tmp_path: Path, input_path: Path, workers: int) -> None:
+    output_path = tmp_path / "output.txt"
+    checkpoint = solve_batch(input_path, output_path, workers=workers, checkpoint_interval=2)
+    solutions = _read_solutions(output_path)
+
+    assert checkpoint.puzzles == 5
+    assert checkpoint.input_offset == input_path.stat().st_size
+    assert checkpoint.output_size == output_path.stat().st_size
+    assert Checkpoint.load(tmp_path / f"output.txt{CHECKPOINT_SUFFIX}") == checkpoint
+    assert solutions[:4] == [SOLUTION, SOLUTION, UNSOLVABLE_SUDOKU, SOLUTION]
+    assert Sudoku.from_string(solutions[4]).check_consistency()
+
+
+def test_solve_batch_resume(tmp_path: Path, input_path: Path) -> None:
+    expected_path = tmp_path / "expected.txt"
+    solve_batch(input_path, expected_path, checkpoint_interval=2)
+
+    # Simulate a run killed after its first checkpoint, in the middle of its second block
+    output_path = tmp_path / "output.txt"
+    partial_input_path = tmp_path / "partial.txt"
+    partial_input_path.write_text(
+        "\n".join(input_path.read_text(encoding="utf-8").splitlines()[:2]), encoding="utf-8"
+    )
+    solve_batch(partial_input_path, output_path, checkpoint_interval=2)
+    with Path.open(output_path, "a", encoding="utf-8") as f:
+        f.write(SOLUTION[:40])
+
+    checkpoint = solve_batch(input_path, output_path, checkpoint_interval=2, resume=True)
+
+    assert checkpoint.puzzles == 5
+    assert output_path.read_bytes() == expected_path.read_bytes()
+
+
+def test_solve_batch_resume_mismatch(tmp_path: Path, input_path: Path) -> None:
+    output_path = tmp_path / "output.txt"
+    solve_batch(input_path, output_path, checkpoint_interval=2)
+    output_path.write_text(UNSOLVABLE_SUDOKU, encoding="utf-8")
+
+    with pytest.raises(CheckpointError, match="shorter than its checkpoint"):
+        solve_batch(input_path, output_path, resume=True)
+
+    output_path.write_text(UNSOLVABLE_SUDOKU * 6, encoding="utf-8")
+
+    with pytest.raises(CheckpointError, match="doesn't match its checkpoint digest"):
+        solve_batch(input_path, output_path, resume=True)
+
+
+def test_solve_batch_resume_without_checkpoint(tmp_path: Path, input_path: Path) -> None:
+    output_path = tmp_path / "output.txt"
+    output_path.write_text("garbage\n", encoding="utf-8")
+    checkpoint = solve_batch(input_path, output_path, resume=True)
+
+    assert checkpoint.puzzles == 5
+    assert _read_solutions(output_path)[0] == SOLUTION
+
+
+def test_solve_batch_resume_compressed(tmp_path: Path, input_path: Path) -> None:
+    expected_path = tmp_path / "expected.txt"
+    solve_batch(input_path, expected_path, checkpoint_interval=2)
+
+    output_path = tmp_path / "output.txt.gz"
+    partial_input_path = tmp_path / "partial.txt"
+    partial_input_path.write_text(
+        "\n".join(input_path.read_text(encoding="utf-8").splitlines()[:2]), encoding="utf-8"
+    )
+    solve_batch(
+        partial_input_path, output_path, checkpoint_interval=2, compression=Compression.GZIP
+    )
+    with Path.open(output_path, "ab") as f:
+        f.write(b"\x1f\x8b garbage")
+
+    checkpoint = solve_batch(
+        input_path, output_path, checkpoint_interval=2, resume=True, compression=Compression.GZIP
+    )
+
+    assert checkpoint.output_size == output_path.stat().st_size
+    assert gzip.decompress(output_path.read_bytes()) == expected_path.read_bytes()
+
+
+def test_solve_batch_telemetry(tmp_path: Path, input_path: Path) -> None:
+    telemetry = BatchTelemetry(report_interval=None, stream=None)
+    solve_batch(
+        input_path,
+        tmp_path / "output.txt",
+        checkpoint_interval=2,
+        dedup=DedupMode.RAW,
+        telemetry=telemetry,
+    )
+
+    assert telemetry.snapshot().outcomes == {
+        "solved": 2,
+        "unsolved": 1,
+        "malformed": 0,
+        "duplicate": 2,
+    }
+
+
+@pytest.mark.parametrize("dedup", list(DedupMode))
+def test_solve_batch_malformed_lines(tmp_path: Path, dedup: DedupMode) -> None:
+    input_path = tmp_path / "input.txt"
+    malformed = [SUDOKU[:80], SUDOKU[:80] + "x", "é" * 81]
+    input_path.write_text("\n".join([SUDOKU, *malformed, SUDOKU]), encoding="utf-8")
+    output_path = tmp_path / "output.txt"
+    telemetry = BatchTelemetry(report_interval=None, stream=None)
+    checkpoint = solve_batch(input_path, output_path, dedup=dedup, telemetry=telemetry)
+    solutions = _read_solutions(output_path)
+    outcomes = telemetry.snapshot().outcomes
+
+    assert checkpoint.puzzles == 5
+    assert solutions[0] == solutions[4] == SOLUTION
+    assert solutions[1:3] == malformed[:2]
+    assert outcomes["malformed"] == 3
+    assert outcomes["unsolved"] == 0
+    assert outcomes["solved"] + outcomes["duplicate"] == 2
+    assert not solve_puzzle(SUDOKU[:80]).solved
+
+
+def test_solve_batch_malformed_lines_binary(tmp_path: Path) -> None:
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("\n".join([SUDOKU[:80], SUDOKU]), encoding="utf-8")
+    output_path = tmp_path / "output.bin"
+    solve_batch(input_path, output_path, output_format=SinkFormat.BINARY)
+    output = output_path.read_bytes()
+
+    assert output[:81] == bytes(81)
+    assert output[81:] == bytes(map(int, SOLUTION))
+
+
+def test_solve_batch_profile(tmp_path: Path, input_path: Path) -> None:
+    with StageProfiler(trace_memory=False) as profiler:
+        solve_batch(input_path, tmp_path / "output.txt", checkpoint_interval=2, profiler=profiler)
+    report = profiler.report()
+
+    assert report.stages[Stage.PARSE].calls == 5
+    assert report.stages[Stage.PRECHECK].calls == 5
+    assert 0 < report.stages[Stage.SEARCH].calls <= 5
+    assert Stage.ARC_CONSISTENCY in report.stages
+    assert Stage.CHECK not in report.stages
+
+
+def test_solve_batch_profile_workers(tmp_path: Path, input_path: Path) -> None:
+    with (
+        StageProfiler(trace_memory=False) as profiler,
+        pytest.raises(ValueError, match="single worker"),
+    ):
+        solve_batch(input_path, tmp_path / "output.txt", workers=2, profiler=profiler)
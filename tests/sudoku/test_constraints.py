@@ -0,0 +1,166 @@
+"""Constraints tests module."""
+
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+from sudoku_resolver.constraints import CLASSIC, VARIANTS, ConstraintModel, Variant
+from sudoku_resolver.engines import EngineName
+from sudoku_resolver.precheck import RejectionReason, find_rejection
+from sudoku_resolver.solver import solve
+from sudoku_resolver.sudoku import Sudoku
+from sudoku_resolver.tensors import candidates_from_values, propagate
+from sudoku_resolver.validation import validate
+from tests import SOLVED_SUDOKU
+
+# Boxes shifted down by one row in the middle stack, so that regions aren't subgrids
+REGIONS = np.array([[((i + j // 3) % 9) // 3 * 3 + j // 3 for j in range(9)] for i in range(9)])
+
+
+def _puzzle(model: ConstraintModel) -> tuple[np.ndarray, np.ndarray]:
+    """Builds a puzzle of the model from a solution found by the SAT engine."""
+    solution = solve(np.zeros((9, 9), dtype=np.uint8), engine=EngineName.SAT, model=model).values
+    puzzle = solution.copy()
+    puzzle.ravel()[::2] = 0
+    return puzzle, solution
+
+
+def test_classic_model() -> None:
+    assert len(CLASSIC) == 27
+    assert all(len(peers) == 20 for peers in CLASSIC.peers.values())
+    assert all(len(units) == 3 for units in CLASSIC.cells_units.values())
+    assert CLASSIC.peer_masks[0] == sum(1 << (i * 9 + j) for i, j in CLASSIC.peers[(0, 0)])
+    assert CLASSIC.overlaps[(0, 0)] == (((0, 1), 1), ((0, 2), 1), ((1, 0), 1), ((2, 0), 1))
+
+
+def test_x_sudoku_model() -> None:
+    model = VARIANTS[Variant.X]
+
+    assert len(model) == 29
+    assert len(model.peers[(0, 0)]) == 26
+    assert len(model.peers[(4, 4)]) == 32
+    assert len(model.peers[(0, 1)]) == 20
+
+
+def test_hyper_model() -> None:
+    model = VARIANTS[Variant.HYPER]
+
+    assert len(model) == 31
+    assert len(model.cells_units[(1, 1)]) == 4
+    assert len(model.cells_units[(0, 0)]) == 3
+
+
+def test_irregular_model() -> None:
+    model = ConstraintModel.irregular(REGIONS)
+
+    assert len(model) == 27
+    assert (model.units[:18] == CLASSIC.units[:18]).all()
+    assert model.membership.sum(axis=0).tolist() == [3] * 81
+
+
+@pytest.mark.parametrize(
+    "regions",
+    [np.zeros((9, 9)), np.arange(81).reshape(9, 9) // 9 % 8, np.arange(72).reshape(8, 9) // 8],
+)
+def test_irregular_model_invalid_regions(regions: np.ndarray) -> None:
+    with pytest.raises(ValueError, match="Expected 9 regions of 9 cells"):
+        ConstraintModel.irregular(regions)
+
+
+@pytest.mark.parametrize("units", [np.zeros((3, 8)), np.zeros((3, 9)), np.full((3, 9), 81)])
+def test_invalid_units(units: np.ndarray) -> None:
+    with pytest.raises(ValueError):  # noqa: PT011
+        ConstraintModel(units)
+
+
+def test_model_read_only() -> None:
+    with pytest.raises(ValueError):  # noqa: PT011
+        CLASSIC.units[0, 0] = 1
+
+
+def test_model_copy_and_pickle() -> None:
+    model = VARIANTS[Variant.X]
+
+    assert copy.deepcopy(model) is model
+    assert pickle.loads(pickle.dumps(model)) is model  # noqa: S301
+    irregular = pickle.loads(pickle.dumps(ConstraintModel.irregular(REGIONS)))  # noqa: S301
+    assert (irregular.units == ConstraintModel.irregular(REGIONS).units).all()
+
+
+def test_validate_with_model() -> None:
+    assert validate(SOLVED_SUDOKU).valid
+    result = validate(SOLVED_SUDOKU, model=VARIANTS[Variant.X])
+
+    assert not result.valid
+    assert (3, 3) in result.offending_indexes
+    assert (0, 1) not in result.offending_indexes
+
+
+def test_find_rejection_in_extra_unit() -> None:
+    values = np.zeros((9, 9), dtype=np.uint8)
+    values[0, 0] = values[8, 8] = 5
+    rejection = find_rejection(values, model=VARIANTS[Variant.X])
+
+    assert find_rejection(values) is None
+    assert rejection is not None
+    assert rejection.reason is RejectionReason.DUPLICATE_GIVEN
+    assert str(rejection) == "duplicate given '5' at index '(8, 8)' in diagonal '0'"
+
+
+@pytest.mark.parametrize(
+    "model,unit,expected_label",
+    [
+        (CLASSIC, 9, ("column", 0)),
+        (VARIANTS[Variant.HYPER], 30, ("window", 3)),
+        (ConstraintModel.irregular(REGIONS), 26, ("region", 8)),
+        (ConstraintModel(CLASSIC.units), 26, ("unit", 26)),
+    ],
+)
+def test_unit_labels(model: ConstraintModel, unit: int, expected_label: tuple[str, int]) -> None:
+    assert model.unit_labels[unit] == expected_label
+    assert pickle.loads(pickle.dumps(model)).unit_labels == model.unit_labels  # noqa: S301
+
+
+def test_find_rejection_in_region() -> None:
+    values = np.zeros((9, 9), dtype=np.uint8)
+    values[3, 0] = values[4, 1] = 5
+    rejection = find_rejection(values, model=ConstraintModel.irregular(REGIONS))
+
+    assert rejection is not None
+    assert str(rejection) == "duplicate given '5' at index '(4, 1)' in region '3'"
+
+
+@pytest.mark.parametrize("engine", list(EngineName))
+@pytest.mark.parametrize("variant", list(Variant))
+def test_solve_variant(engine: EngineName, variant: Variant) -> None:
+    model = VARIANTS[variant]
+    puzzle, _ = _puzzle(model)
+    result = solve(puzzle, engine=engine, model=model)
+
+    assert result.solved
+    assert validate(result.values, model=model).valid
+    assert (result.values[puzzle != 0] == puzzle[puzzle != 0]).all()
+
+
+def test_solve_irregular() -> None:
+    model = ConstraintModel.irregular(REGIONS)
+    puzzle, _ = _puzzle(model)
+    sudoku = Sudoku.from_string("".join(map(str, puzzle.ravel())), model=model)
+    sudoku.solve()
+
+    assert sudoku.check_consistency()
+    assert validate(sudoku.grid.values, model=model).valid
+    assert not validate(sudoku.grid.values).valid
+
+
+def test_propagate_with_model() -> None:
+    model = VARIANTS[Variant.X]
+    _, solution = _puzzle(model)
+    puzzle = solution.copy()
+    puzzle[0, 0] = 0
+    candidates = propagate(candidates_from_values(puzzle, model=model), model=model)
+
+    assert candidates[0, 0].sum() == 1
+    assert candidates[0, 0, solution[0, 0] - 1]
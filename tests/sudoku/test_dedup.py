@@ -0,0 +1,155 @@
+"""Dedup tests module."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from sudoku_resolver.batch import _solve_deduplicated, solve_batch, solve_puzzle
+from sudoku_resolver.dedup import CanonicalForm, DedupIndex, DedupMode, RawForm, dedup_form
+from sudoku_resolver.engines import EngineName
+from sudoku_resolver.sinks import SolveRecord
+from sudoku_resolver.sudoku import Sudoku
+from tests import SOLVED_SUDOKU, SUDOKU_PATH, UNSOLVABLE_SUDOKU
+
+SUDOKU = Sudoku.from_file(SUDOKU_PATH).to_string()
+SOLUTION = "".join(map(str, SOLVED_SUDOKU.ravel()))
+
+
+def _transform(puzzle: str) -> str:
+    """Transposes a puzzle, swaps its first two bands and relabels its digits."""
+    values = np.array(list(puzzle), dtype=np.uint8).reshape(9, 9).T
+    values = np.concatenate([values[3:6], values[:3], values[6:]])
+    labels = np.array([0, 5, 3, 9, 1, 2, 8, 7, 4, 6], dtype=np.uint8)
+    return "".join(map(str, labels[values].ravel()))
+
+
+def test_dedup_form() -> None:
+    assert dedup_form(SUDOKU.replace("0", "."), DedupMode.RAW) == RawForm(SUDOKU)
+    assert isinstance(dedup_form(SUDOKU, DedupMode.CANONICAL), CanonicalForm)
+    assert dedup_form(SUDOKU[:80], DedupMode.CANONICAL) == RawForm(SUDOKU[:80])
+
+    with pytest.raises(ValueError, match="aren't deduplicated"):
+        dedup_form(SUDOKU, DedupMode.NONE)
+    with pytest.raises(ValueError, match="Expected a puzzle"):
+        CanonicalForm.from_puzzle(SUDOKU[:80] + "x")
+
+
+def test_canonical_form_symmetries() -> None:
+    form = CanonicalForm.from_puzzle(SUDOKU)
+    transformed_form = CanonicalForm.from_puzzle(_transform(SUDOKU))
+
+    assert form.key == transformed_form.key
+    assert form.key != CanonicalForm.from_puzzle(UNSOLVABLE_SUDOKU).key
+
+
+def test_canonical_form_solution_round_trip() -> None:
+    form = CanonicalForm.from_puzzle(_transform(SUDOKU))
+    key_solution = CanonicalForm.from_puzzle(SUDOKU).to_key_space(SOLUTION)
+
+    assert form.from_key_space(key_solution) == _transform(SOLUTION)
+    assert form.to_key_space(_transform(SOLUTION)) == key_solution
+
+
+@pytest.mark.parametrize("approximate", [False, True])
+def test_dedup_index(approximate: bool) -> None:
+    index = DedupIndex(max_entries=2, approximate=approximate)
+    index["a"] = SOLUTION
+    index["b"] = None
+    assert index["a"] == SOLUTION
+    index["c"] = _transform(SOLUTION)
+
+    assert len(index) == 2
+    assert "a" in index
+    assert "b" not in index
+    assert index["c"] == _transform(SOLUTION)
+    assert all(len(packed) == 41 for packed in index._entries.values())
+
+
+def test_dedup_index_unsolved_collision(monkeypatch: pytest.MonkeyPatch) -> None:
+    index = DedupIndex(approximate=True)
+    monkeypatch.setattr(index, "_key", lambda key: b"collision")
+    index["a"] = None
+
+    assert "a" in index
+    assert index["a"] is None
+    assert "b" not in index
+    with pytest.raises(KeyError):
+        index["b"]
+
+
+def test_solve_batch_unsolved_collision(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    input_path = tmp_path / "input.txt"
+    input_path.write_text(f"{UNSOLVABLE_SUDOKU}\n{SUDOKU}", encoding="utf-8")
+    monkeypatch.setattr(DedupIndex, "_key", lambda self, key: b"collision")
+    solve_batch(
+        input_path,
+        tmp_path / "output.txt",
+        checkpoint_interval=1,
+        dedup=DedupMode.RAW,
+        dedup_index=DedupIndex(approximate=True),
+    )
+
+    assert (tmp_path / "output.txt").read_text(encoding="utf-8").splitlines() == [
+        UNSOLVABLE_SUDOKU,
+        SOLUTION,
+    ]
+
+
+@pytest.mark.parametrize("dedup", [DedupMode.RAW, DedupMode.CANONICAL])
+@pytest.mark.parametrize("max_entries", [0, 10])
+def test_solve_batch_dedup(tmp_path: Path, dedup: DedupMode, max_entries: int) -> None:
+    input_path = tmp_path / "input.txt"
+    input_path.write_text(
+        "\n".join(
+            [SUDOKU, UNSOLVABLE_SUDOKU, _transform(SUDOKU), SUDOKU, UNSOLVABLE_SUDOKU, SUDOKU]
+        ),
+        encoding="utf-8",
+    )
+    output_path = tmp_path / "output.txt"
+    checkpoint = solve_batch(
+        input_path,
+        output_path,
+        checkpoint_interval=4,
+        dedup=dedup,
+        dedup_index=DedupIndex(max_entries=max_entries, approximate=True),
+    )
+
+    assert checkpoint.puzzles == 6
+    assert output_path.read_text(encoding="utf-8").splitlines() == [
+        SOLUTION,
+        UNSOLVABLE_SUDOKU,
+        _transform(SOLUTION),
+        SOLUTION,
+        UNSOLVABLE_SUDOKU,
+        SOLUTION,
+    ]
+
+
+def test_solve_deduplicated_solves_once() -> None:
+    solved: list[str] = []
+
+    def solve_many(puzzles: list[str]) -> list[SolveRecord]:
+        solved.extend(puzzles)
+        return [solve_puzzle(puzzle) for puzzle in puzzles]
+
+    index = DedupIndex()
+    block = [SUDOKU, _transform(SUDOKU), SUDOKU]
+    records = _solve_deduplicated(
+        block,
+        solve_many=solve_many,
+        index=index,
+        mode=DedupMode.CANONICAL,
+        engine=EngineName.BACKTRACKING,
+    )
+    _solve_deduplicated(
+        block,
+        solve_many=solve_many,
+        index=index,
+        mode=DedupMode.CANONICAL,
+        engine=EngineName.BACKTRACKING,
+    )
+
+    assert solved == [SUDOKU]
+    assert [record.puzzle for record in records] == block
+    assert [record.elapsed == 0 for record in records] == [False, True, True]
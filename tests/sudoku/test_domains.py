@@ -73,3 +73,17 @@ def test_pop_value_from_domain(
     domain = sudoku.grid.domains.get_domain(domain_index)
 
     assert domain == expected_domain
+
+
+def test_counts() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    domains = sudoku.grid.domains
+    domains.set_domain({1, 2}, (0, 1))
+    domains.pop_value_from_domain(5, (3, 7))
+    domains.discard_values({1, 4, 6}, (3, 7))
+    sudoku.grid.enforce_arc_consistency()
+    counts = [row.copy() for row in domains.counts]
+    domains.recount()
+
+    assert counts == domains.counts
+    assert domains.counts[0][1] == sum(1 in (domains.get_domain((0, j)) or ()) for j in range(9))
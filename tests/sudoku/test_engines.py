@@ -0,0 +1,35 @@
+"""Engines tests module."""
+
+import pytest
+
+from sudoku_resolver.engines import ENGINES, EngineName, get_engine
+from sudoku_resolver.exceptions import UnsolvableSudokuError
+from sudoku_resolver.sudoku import Sudoku
+from tests import SOLVED_SUDOKU, SUDOKU_PATH, UNSOLVABLE_SUDOKU
+
+
+def test_engines_registry() -> None:
+    assert set(ENGINES) == set(EngineName)
+
+
+@pytest.mark.parametrize("engine", list(EngineName))
+def test_solve(engine: EngineName) -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    sudoku.solve(engine=engine)
+
+    assert (sudoku.grid.values == SOLVED_SUDOKU).all()
+
+
+@pytest.mark.parametrize("engine", list(EngineName))
+def test_solve_unsolvable(engine: EngineName) -> None:
+    sudoku = Sudoku.from_string(UNSOLVABLE_SUDOKU)
+
+    with pytest.raises(UnsolvableSudokuError):
+        sudoku.solve(engine=engine)
+
+
+def test_get_engine() -> None:
+    assert get_engine("sat") is ENGINES[EngineName.SAT]
+
+    with pytest.raises(ValueError, match="'unknown' is not a valid EngineName"):
+        get_engine("unknown")
@@ -7,7 +7,7 @@ import pytest
 from sudoku_resolver.exceptions import ValueAssignmentError
 from sudoku_resolver.grid import Index
 from sudoku_resolver.sudoku import Sudoku
-from tests import SUDOKU_PATH
+from tests import SUDOKU_PATH, UNSOLVABLE_SUDOKU
 
 
 @pytest.mark.parametrize(
@@ -415,13 +415,78 @@ def test_minimum_remaining_value() -> None:
 @pytest.mark.parametrize(
     "value_index,expected_lcv",
     [
-        ((0, 1), {7, 8, 9}),
-        ((2, 4), {5, 7, 8, 9}),
-        ((8, 4), {1, 6, 9}),
+        ((0, 1), [7, 8, 9]),
+        ((2, 4), [7, 5, 8, 9]),
+        ((8, 4), [1, 6, 9]),
     ],
 )
-def test_least_constraining_value(value_index: Index, expected_lcv: int) -> None:
+def test_least_constraining_value(value_index: Index, expected_lcv: list[int]) -> None:
     sudoku = Sudoku.from_file(SUDOKU_PATH)
     lcv = sudoku.grid.least_constraining_value(value_index)
 
     assert lcv == expected_lcv
+
+
+def test_enforce_arc_consistency() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    sudoku.grid.enforce_arc_consistency()
+    domains = sudoku.grid.domains
+
+    assert domains.get_domain((0, 8)) == {9}
+    assert domains.get_domain((0, 1)) == {7}
+    for index in sudoku.grid.unassigned_values_indexes:
+        for neighbour_index in sudoku.grid.get_neighbours_indexes(index):
+            neighbour_domain = domains.get_domain(neighbour_index)
+            if neighbour_domain is not None and len(neighbour_domain) == 1:
+                assert not neighbour_domain & domains.get_domain(index)  # type: ignore[operator]
+
+
+def test_enforce_arc_consistency_wipeout() -> None:
+    sudoku = Sudoku.from_string("123456700" + "000000089" + "0" * 63)
+    sudoku.grid.enforce_arc_consistency()
+
+    assert not all(sudoku.grid.domains.get_domain(index) for index in [(0, 7), (0, 8)])
+
+
+def test_reset() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    grid = Sudoku.from_string(UNSOLVABLE_SUDOKU).grid
+    grid.reset(sudoku.grid.values.ravel())
+    grid.reset(sudoku.grid.values)
+
+    assert (grid.values == sudoku.grid.values).all()
+    assert grid.domains.domains == sudoku.grid.domains.domains
+    assert grid.initial_domains == sudoku.grid.initial_domains
+    assert all(
+        domain is None or domain is not initial_domain
+        for row, initial_row in zip(grid.domains.domains, grid.initial_domains, strict=True)
+        for domain, initial_domain in zip(row, initial_row, strict=True)
+    )
+    with pytest.raises(ValueAssignmentError):
+        grid.set_value(1, (0, 0))
+    grid.set_value(9, (0, 8))
+
+
+def test_least_constraining_value_after_propagation() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    sudoku.grid.enforce_arc_consistency()
+    sudoku.grid.domains.set_domain({5, 7, 8}, (2, 4))
+    neighbours_values = sudoku.grid.get_neighbours_domains_values((2, 3))
+    lcv = sudoku.grid.least_constraining_value((2, 3))
+
+    assert sorted(lcv) == sorted(sudoku.grid.domains.get_domain((2, 3)) or ())
+    assert [neighbours_values.count(value) for value in lcv] == sorted(
+        neighbours_values.count(value) for value in lcv
+    )
+
+
+def test_least_constraining_value_counts_neighbours_once() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    grid = sudoku.grid
+
+    for index in grid.unassigned_values_indexes:
+        neighbours_values = grid.get_neighbours_domains_values(index)
+        assert grid.least_constraining_value(index) == sorted(
+            grid.domains.get_domain(index) or (),
+            key=lambda value: (neighbours_values.count(value), value),
+        )
@@ -0,0 +1,38 @@
+"""Nogoods tests module."""
+
+from sudoku_resolver.nogoods import NogoodStore
+from sudoku_resolver.sudoku import Sudoku
+from tests import SUDOKU_PATH
+
+
+def test_add() -> None:
+    store = NogoodStore(2, 2)
+    first, second, third = (frozenset({((0, 1), value)}) for value in (7, 8, 9))
+    for nogood in (first, second, third):
+        store.add(nogood)
+
+    assert len(store) == 2
+    assert first not in store
+    assert second in store
+    assert third in store
+
+
+def test_add_too_long() -> None:
+    store = NogoodStore(2, 1)
+    store.add(frozenset({((0, 1), 7), ((0, 3), 8)}))
+
+    assert len(store) == 0
+
+
+def test_find_violated() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    store = NogoodStore(8, 8)
+    nogood = frozenset({((0, 1), 7), ((0, 3), 8)})
+    store.add(nogood)
+
+    assert store.find_violated(grid=sudoku.grid, value=7, value_index=(0, 1)) is None
+
+    sudoku.grid.set_value(8, (0, 3))
+
+    assert store.find_violated(grid=sudoku.grid, value=7, value_index=(0, 1)) == nogood
+    assert store.find_violated(grid=sudoku.grid, value=9, value_index=(0, 1)) is None
@@ -0,0 +1,54 @@
+"""Parallel tests module."""
+
+import pytest
+
+from sudoku_resolver.engines import EngineName
+from sudoku_resolver.exceptions import UnsolvableSudokuError
+from sudoku_resolver.parallel import parallel_backtracking, split_search_tree
+from sudoku_resolver.sudoku import Sudoku
+from tests import SOLVED_SUDOKU, SUDOKU_PATH, UNSOLVABLE_SUDOKU
+
+
+@pytest.mark.parametrize("max_subproblems,expected_subproblems", [(1, 1), (4, 9), (32, 72)])
+def test_split_search_tree(max_subproblems: int, expected_subproblems: int) -> None:
+    sudoku = Sudoku.from_string("0" * 81)
+    subproblems = split_search_tree(sudoku.grid, max_subproblems=max_subproblems)
+
+    assert len(subproblems) == expected_subproblems
+    assert not sudoku.grid.values.any()
+    assert len({subproblem.values.tobytes() for subproblem in subproblems}) == len(subproblems)
+
+
+def test_split_search_tree_complete() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    subproblems = split_search_tree(sudoku.grid, max_subproblems=8)
+
+    assert len(subproblems) == 1
+    assert (subproblems[0].values == SOLVED_SUDOKU).all()
+
+
+def test_split_search_tree_unsolvable() -> None:
+    sudoku = Sudoku.from_string(UNSOLVABLE_SUDOKU)
+
+    assert split_search_tree(sudoku.grid, max_subproblems=8) == []
+
+
+def test_parallel_backtracking() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    parallel_backtracking(sudoku.grid, max_workers=2)
+
+    assert (sudoku.grid.values == SOLVED_SUDOKU).all()
+
+
+def test_parallel_backtracking_unsolvable() -> None:
+    sudoku = Sudoku.from_string(UNSOLVABLE_SUDOKU)
+
+    with pytest.raises(UnsolvableSudokuError):
+        parallel_backtracking(sudoku.grid, max_workers=2)
+
+
+def test_parallel_search_rejects_other_engines() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+
+    with pytest.raises(ValueError, match="Only backtracking can search in parallel"):
+        sudoku.solve(engine=EngineName.SAT, workers=2)
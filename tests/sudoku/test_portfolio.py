@@ -0,0 +1,35 @@
+"""Portfolio tests module."""
+
+import pytest
+
+from sudoku_resolver.backtracking import ValueOrdering
+from sudoku_resolver.exceptions import UnsolvableSudokuError
+from sudoku_resolver.portfolio import SolverConfiguration, portfolio_solve
+from sudoku_resolver.sudoku import Sudoku
+from tests import SOLVED_SUDOKU, SUDOKU_PATH, UNSOLVABLE_SUDOKU
+
+
+def test_portfolio_solve() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    sudoku.solve(portfolio=True)
+
+    assert sudoku.winning_configuration is not None
+    assert (sudoku.grid.values == SOLVED_SUDOKU).all()
+
+
+def test_portfolio_solve_configurations() -> None:
+    configuration = SolverConfiguration(
+        "restarts", value_ordering=ValueOrdering.RANDOM, restart_base=1, seed=0
+    )
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    winner = portfolio_solve(sudoku.grid, configurations=[configuration], max_workers=1)
+
+    assert winner == configuration
+    assert (sudoku.grid.values == SOLVED_SUDOKU).all()
+
+
+def test_portfolio_solve_unsolvable() -> None:
+    sudoku = Sudoku.from_string(UNSOLVABLE_SUDOKU)
+
+    with pytest.raises(UnsolvableSudokuError):
+        portfolio_solve(sudoku.grid, max_workers=2)
@@ -0,0 +1,66 @@
+"""Precheck tests module."""
+
+import numpy as np
+import pytest
+
+from sudoku_resolver.exceptions import InvalidSudokuError, UnsolvableSudokuError
+from sudoku_resolver.precheck import Rejection, RejectionReason, find_rejection, precheck
+from sudoku_resolver.solver import solve
+from sudoku_resolver.sudoku import Sudoku
+from tests import HARD_SUDOKU, SUDOKU_PATH, UNSOLVABLE_SUDOKU
+
+# Digit 1 has no place left in the first row, whose last cells are in the same subgrid as a 1
+NO_PLACE_SUDOKU = "234567000" + "000000001" + "0" * 63
+
+
+def _to_values(puzzle: str) -> np.ndarray:
+    return np.array(list(puzzle), dtype=np.uint8)
+
+
+@pytest.mark.parametrize(
+    "puzzle,expected_rejection",
+    [
+        (HARD_SUDOKU, None),
+        ("0" * 81, None),
+        (
+            "11" + "0" * 79,
+            Rejection(RejectionReason.DUPLICATE_GIVEN, value=1, value_index=(0, 1), unit=0),
+        ),
+        (
+            "1" + "0" * 8 + "1" + "0" * 71,
+            Rejection(RejectionReason.DUPLICATE_GIVEN, value=1, value_index=(1, 0), unit=9),
+        ),
+        (UNSOLVABLE_SUDOKU, Rejection(RejectionReason.EMPTY_DOMAIN, value_index=(0, 8))),
+        (NO_PLACE_SUDOKU, Rejection(RejectionReason.DIGIT_WITHOUT_PLACE, value=1, unit=0)),
+    ],
+)
+def test_find_rejection(puzzle: str, expected_rejection: Rejection | None) -> None:
+    assert find_rejection(_to_values(puzzle)) == expected_rejection
+
+
+def test_find_rejection_invalid_value() -> None:
+    values = np.zeros((9, 9), dtype=np.uint8)
+    values[2, 3] = 12
+
+    assert find_rejection(values) == Rejection(
+        RejectionReason.INVALID_VALUE, value=12, value_index=(2, 3)
+    )
+
+
+def test_precheck() -> None:
+    precheck(Sudoku.from_file(SUDOKU_PATH).grid.values)
+
+    with pytest.raises(InvalidSudokuError, match="digit without place '1' in row '0'"):
+        precheck(_to_values(NO_PLACE_SUDOKU))
+
+
+def test_sudoku_solve_rejected() -> None:
+    with pytest.raises(UnsolvableSudokuError, match="duplicate given '1' at index"):
+        Sudoku.from_string("11" + "0" * 79).solve()
+
+
+def test_solve_rejected() -> None:
+    result = solve(_to_values(UNSOLVABLE_SUDOKU))
+
+    assert not result.solved
+    assert result.rejection == Rejection(RejectionReason.EMPTY_DOMAIN, value_index=(0, 8))
@@ -0,0 +1,83 @@
+"""Profiling tests module."""
+
+import pstats
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from sudoku_resolver.engines import EngineName
+from sudoku_resolver.profiling import ProfileReport, Stage, StageProfiler, StageStats
+from sudoku_resolver.sudoku import Sudoku
+from tests import SOLVED_SUDOKU, SUDOKU_PATH
+
+
+def _solve(profiler: StageProfiler, engine: EngineName = EngineName.BACKTRACKING) -> Sudoku:
+    sudoku = Sudoku(filepath=SUDOKU_PATH, profiler=profiler)
+    sudoku.solve(engine=engine)
+    sudoku.check_consistency()
+    return sudoku
+
+
+def test_profile_pipeline() -> None:
+    with StageProfiler() as profiler:
+        sudoku = _solve(profiler)
+        _solve(profiler)
+    report = profiler.report()
+
+    assert (sudoku.grid.values == SOLVED_SUDOKU).all()
+    assert list(report.stages) == list(Stage)
+    assert all(stats.calls == 2 for stats in report.stages.values())
+    assert all(stats.elapsed > 0 for stats in report.stages.values())
+    assert report.stages[Stage.GRID].peak_memory > 0
+    assert report.stages[Stage.GRID].peak_memory >= report.stages[Stage.PREPROCESS].peak_memory
+    assert not tracemalloc.is_tracing()
+
+
+def test_profile_engine_without_arc_consistency() -> None:
+    with StageProfiler(trace_memory=False) as profiler:
+        _solve(profiler, EngineName.SAT)
+    report = profiler.report()
+
+    assert Stage.ARC_CONSISTENCY not in report.stages
+    assert report.stages[Stage.SEARCH].calls == 1
+    assert report.stages[Stage.SEARCH].peak_memory == 0
+
+
+def test_nested_stages_exclude_their_children() -> None:
+    clock = iter([0.0, 1.0, 3.0, 10.0])
+    profiler = StageProfiler(trace_memory=False)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr("sudoku_resolver.profiling.time.perf_counter", lambda: next(clock))
+        with profiler.stage(Stage.SEARCH), profiler.stage(Stage.ARC_CONSISTENCY):
+            pass
+    report = profiler.report()
+
+    assert report.stages[Stage.ARC_CONSISTENCY].elapsed == 2.0
+    assert report.stages[Stage.SEARCH].elapsed == 8.0
+    assert report.elapsed == 10.0
+
+
+def test_report_str() -> None:
+    report = ProfileReport(stages={Stage.PARSE: StageStats(calls=2, elapsed=0.5, peak_memory=2048)})
+    lines = str(report).splitlines()
+
+    assert lines[0].startswith("STAGE")
+    assert lines[0].endswith("PEAK (KiB)")
+    assert lines[1].split() == ["parse", "2", "0.5000", "250.000", "100.0%", "2.0"]
+
+
+def test_dump_stats(tmp_path: Path) -> None:
+    with StageProfiler(trace_memory=False, cprofile=True) as profiler:
+        _solve(profiler)
+    paths = profiler.dump_stats(tmp_path / "profiles")
+
+    assert {path.name for path in paths} == {f"{stage.value}.pstats" for stage in Stage}
+    stats = pstats.Stats(str(tmp_path / "profiles" / "ac3.pstats"))
+    functions = {name for _, _, name in stats.stats}  # type: ignore[attr-defined]
+    assert "pop_value_from_domain" in functions
+
+
+def test_dump_stats_without_cprofile(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="doesn't run cProfile"):
+        StageProfiler(trace_memory=False).dump_stats(tmp_path)
@@ -0,0 +1,30 @@
+"""Puzzles tests module."""
+
+import pytest
+
+from sudoku_resolver.puzzles import is_puzzle, parse_puzzle
+from tests import SOLVED_SUDOKU, UNSOLVABLE_SUDOKU
+
+SOLUTION = "".join(map(str, SOLVED_SUDOKU.ravel()))
+
+
+@pytest.mark.parametrize(
+    "line,expected_result",
+    [
+        (SOLUTION, True),
+        (UNSOLVABLE_SUDOKU.replace("0", "."), True),
+        (SOLUTION[:80], False),
+        (SOLUTION + "1", False),
+        (SOLUTION[:80] + "x", False),
+        ('garbage,line"x', False),
+    ],
+)
+def test_is_puzzle(line: str, expected_result: bool) -> None:
+    assert is_puzzle(line) == expected_result
+
+
+def test_parse_puzzle() -> None:
+    values = parse_puzzle(UNSOLVABLE_SUDOKU.replace("0", "."))
+
+    assert values.tolist() == list(map(int, UNSOLVABLE_SUDOKU))
+    assert (parse_puzzle(SOLUTION).reshape(9, 9) == SOLVED_SUDOKU).all()
@@ -0,0 +1,86 @@
+"""SAT tests module."""
+
+from pathlib import Path
+
+import pytest
+
+from sudoku_resolver.exceptions import UnsolvableSudokuError
+from sudoku_resolver.sat import CNF, CDCLSolver, sat_solve, variable
+from sudoku_resolver.sudoku import Sudoku
+from tests import HARD_SUDOKU, SOLVED_SUDOKU, SUDOKU_PATH, UNSOLVABLE_SUDOKU
+
+
+@pytest.mark.parametrize(
+    "row,column,digit,expected_variable",
+    [(0, 0, 1, 1), (0, 1, 1, 10), (1, 0, 1, 82), (8, 8, 9, 729)],
+)
+def test_variable(row: int, column: int, digit: int, expected_variable: int) -> None:
+    assert variable(row, column, digit) == expected_variable
+
+
+def test_cnf_from_grid() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    cnf = CNF.from_grid(sudoku.grid)
+
+    assert cnf.num_variables == 729
+    assert len(cnf.clauses) == 4 * 81 * (1 + 36) + len(sudoku.grid.assigned_values_indexes)
+    assert [variable(0, 0, 6)] in cnf.clauses
+
+
+def test_save_dimacs(tmp_path: Path) -> None:
+    cnf = CNF(num_variables=3, clauses=[[1, -2], [2, 3], [-3]])
+    cnf.save_dimacs(tmp_path / "formula.cnf")
+
+    assert (tmp_path / "formula.cnf").read_text(encoding="utf-8") == (
+        "p cnf 3 3\n1 -2 0\n2 3 0\n-3 0\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "clauses,expected_model",
+    [
+        ([[1, 2], [-1], [-2, 3]], [2, 3]),
+        ([[1, 2], [-1, 2], [1, -2], [-1, -2]], None),
+        ([[]], None),
+    ],
+)
+def test_cdcl_solver(clauses: list[list[int]], expected_model: list[int] | None) -> None:
+    model = CDCLSolver(CNF(num_variables=3, clauses=clauses)).solve()
+
+    assert model == expected_model
+
+
+def test_cdcl_solver_pigeonhole() -> None:
+    # 4 pigeons can't fit in 3 holes, which requires learning clauses to prove
+    pigeons, holes = 4, 3
+    clauses = [[p * holes + h + 1 for h in range(holes)] for p in range(pigeons)]
+    clauses.extend(
+        [-(p * holes + h + 1), -(q * holes + h + 1)]
+        for h in range(holes)
+        for p in range(pigeons)
+        for q in range(p + 1, pigeons)
+    )
+
+    assert CDCLSolver(CNF(num_variables=pigeons * holes, clauses=clauses)).solve() is None
+
+
+def test_sat_solve() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    sat_solve(sudoku.grid)
+
+    assert (sudoku.grid.values == SOLVED_SUDOKU).all()
+
+
+def test_sat_solve_hard() -> None:
+    sudoku = Sudoku.from_string(HARD_SUDOKU)
+    sat_solve(sudoku.grid)
+
+    assert not (sudoku.grid.values == 0).any()
+    assert sudoku.check_consistency()
+
+
+def test_sat_solve_unsolvable() -> None:
+    sudoku = Sudoku.from_string(UNSOLVABLE_SUDOKU)
+
+    with pytest.raises(UnsolvableSudokuError):
+        sat_solve(sudoku.grid)
@@ -0,0 +1,99 @@
+"""Session tests module."""
+
+import pytest
+
+from sudoku_resolver.exceptions import ValueAssignmentError
+from sudoku_resolver.grid import Index
+from sudoku_resolver.session import Deduction, SolverSession, Technique
+from sudoku_resolver.sudoku import Sudoku
+from tests import SOLVED_SUDOKU, SUDOKU_PATH
+
+
+def test_get_candidates() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    session = SolverSession(sudoku.grid.values)
+
+    assert session.get_candidates((0, 0)) == set()
+    assert session.get_candidates((0, 1)) == {7, 8, 9}
+    assert session.get_candidates((3, 7)) == {1, 5, 6, 9}
+
+
+def test_next_deduction() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    session = SolverSession(sudoku.grid.values)
+    deduction = session.next_deduction()
+
+    assert deduction == Deduction(
+        technique=Technique.NAKED_SINGLE,
+        value=9,
+        value_index=(0, 8),
+        eliminated_candidates=(
+            ((0, 1), 9),
+            ((0, 3), 9),
+            ((1, 6), 9),
+            ((1, 8), 9),
+            ((2, 6), 9),
+            ((2, 7), 9),
+            ((2, 8), 9),
+            ((3, 8), 9),
+            ((4, 8), 9),
+            ((5, 8), 9),
+            ((6, 8), 9),
+        ),
+    )
+    assert session.get_candidates((0, 8)) == {9}
+
+
+def test_step_until_solved() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    session = SolverSession(sudoku.grid.values)
+    while session.step() is not None:
+        pass
+
+    assert (session.values == SOLVED_SUDOKU).all()
+    assert (sudoku.grid.values != SOLVED_SUDOKU).any()
+
+
+def test_set_and_clear_value() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    session = SolverSession(sudoku.grid.values)
+    session.set_value(8, (0, 1))
+
+    assert session.get_candidates((0, 3)) == {9}
+    assert session.get_candidates((0, 1)) == set()
+
+    session.clear_value((0, 1))
+
+    assert session.get_candidates((0, 3)) == {8, 9}
+    assert session.get_candidates((0, 1)) == {7, 8, 9}
+
+
+@pytest.mark.parametrize(
+    "value,value_index",
+    [(1, (0, 0)), (6, (0, 1)), (0, (0, 1)), (10, (0, 1))],
+)
+def test_set_value_error(value: int, value_index: Index) -> None:
+    session = SolverSession(Sudoku.from_file(SUDOKU_PATH).grid.values)
+
+    with pytest.raises(ValueAssignmentError):
+        session.set_value(value, value_index)
+
+
+def test_locked_candidates() -> None:
+    # Digit 1 is confined to the first row of the first box
+    sudoku = Sudoku.from_string("0" * 9 + "234000000" + "567000000" + "0" * 54)
+    session = SolverSession(sudoku.grid.values)
+
+    assert session.next_deduction() == Deduction(
+        technique=Technique.LOCKED_CANDIDATES,
+        value=1,
+        value_index=None,
+        eliminated_candidates=(
+            ((0, 3), 1),
+            ((0, 4), 1),
+            ((0, 5), 1),
+            ((0, 6), 1),
+            ((0, 7), 1),
+            ((0, 8), 1),
+        ),
+    )
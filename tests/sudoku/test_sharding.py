@@ -0,0 +1,178 @@
+"""Sharding tests module."""
+
+import gzip
+import os
+import threading
+from pathlib import Path
+
+import pytest
+import zstandard
+
+from sudoku_resolver.batch import solve_batch
+from sudoku_resolver.sharding import (
+    JobDirectory,
+    ShardedJob,
+    claim_shard,
+    coordinate,
+    reap_expired_leases,
+    run_worker,
+    solve_shard,
+    split_input,
+)
+from sudoku_resolver.sinks import Compression, SinkFormat
+from sudoku_resolver.sudoku import Sudoku
+from tests import SUDOKU_PATH, UNSOLVABLE_SUDOKU
+
+SUDOKU = Sudoku.from_file(SUDOKU_PATH).to_string()
+
+
+@pytest.fixture
+def input_path(tmp_path: Path) -> Path:
+    path = tmp_path / "input.txt"
+    path.write_text(
+        "\n".join([SUDOKU, SUDOKU.replace("0", "."), "", UNSOLVABLE_SUDOKU, SUDOKU, "0" * 81]),
+        encoding="utf-8",
+    )
+    return path
+
+
+def _read_rows(path: Path, compression: Compression) -> list[list[str]]:
+    data = path.read_bytes()
+    if compression is Compression.GZIP:
+        data = gzip.decompress(data)
+    elif compression is Compression.ZSTD:
+        data = zstandard.ZstdDecompressor().stream_reader(data, read_across_frames=True).read()
+    # Elapsed times differ from one run to the next
+    return [row[:3] + row[4:] for row in (line.split(",") for line in data.decode().splitlines())]
+
+
+def _start_workers(job_path: Path, count: int) -> list[threading.Thread]:
+    threads = [
+        threading.Thread(
+            target=run_worker,
+            args=(job_path,),
+            kwargs={"worker_id": f"worker-{i}", "poll_interval": 0.01},
+        )
+        for i in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_split_input(tmp_path: Path, input_path: Path) -> None:
+    directory = JobDirectory(tmp_path / "job")
+    job = split_input(input_path, directory, shard_size=2, output_format=SinkFormat.CSV)
+
+    assert job == ShardedJob.load(directory.job_path)
+    assert job.shards == 3
+    assert job.output_format == "csv"
+    assert sorted(path.name for path in directory.pending.iterdir()) == [
+        "000000",
+        "000001",
+        "000002",
+    ]
+    assert (directory.pending / "000001").read_text(encoding="utf-8").splitlines() == [
+        UNSOLVABLE_SUDOKU,
+        SUDOKU,
+    ]
+    with pytest.raises(ValueError, match="already holds a job"):
+        split_input(input_path, directory)
+
+
+def test_claim_and_reap(tmp_path: Path, input_path: Path) -> None:
+    directory = JobDirectory(tmp_path / "job")
+    split_input(input_path, directory, shard_size=3)
+
+    assert [claim_shard(directory, worker_id="worker") for _ in range(3)] == [0, 1, None]
+    os.utime(directory.claim_path(0, "worker"), (0, 0))
+    assert reap_expired_leases(directory, 60.0) == [0]
+    assert claim_shard(directory, worker_id="other") == 0
+    assert directory.claim_path(0, "other").exists()
+    assert not reap_expired_leases(directory, 60.0)
+
+
+def test_solve_shard_after_reclaim(
+    tmp_path: Path, input_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    directory = JobDirectory(tmp_path / "job")
+    job = split_input(input_path, directory, shard_size=3)
+    claim_shard(directory, worker_id="slow")
+
+    def slow_solve_batch(claimed_path: Path, output_path: Path, **kwargs) -> None:
+        # The lease expires while solving, and the shard is claimed by another worker
+        solve_batch(claimed_path, output_path, **kwargs)
+        os.utime(claimed_path, (0, 0))
+        assert reap_expired_leases(directory, job.lease_timeout) == [0]
+        assert claim_shard(directory, worker_id="fast") == 0
+
+    monkeypatch.setattr("sudoku_resolver.sharding.solve_batch", slow_solve_batch)
+    solve_shard(directory, job, 0, worker_id="slow")
+
+    assert (directory.done / "000000").exists()
+    assert not directory.claim_path(0, "slow").exists()
+    assert directory.claim_path(0, "fast").exists()
+
+
+@pytest.mark.parametrize(
+    "output_format,compression",
+    [
+        (SinkFormat.TEXT, Compression.NONE),
+        (SinkFormat.CSV, Compression.NONE),
+        (SinkFormat.CSV, Compression.GZIP),
+        (SinkFormat.CSV, Compression.ZSTD),
+    ],
+)
+def test_coordinate(
+    tmp_path: Path, input_path: Path, output_format: SinkFormat, compression: Compression
+) -> None:
+    threads = _start_workers(tmp_path / "job", 2)
+    job = coordinate(
+        input_path,
+        tmp_path / "output",
+        tmp_path / "job",
+        shard_size=2,
+        output_format=output_format,
+        compression=compression,
+        poll_interval=0.01,
+    )
+    for thread in threads:
+        thread.join()
+    solve_batch(
+        input_path, tmp_path / "expected", output_format=output_format, compression=compression
+    )
+
+    assert job.shards == 3
+    assert _read_rows(tmp_path / "output", compression) == _read_rows(
+        tmp_path / "expected", compression
+    )
+
+
+def test_coordinate_dead_worker(tmp_path: Path, input_path: Path) -> None:
+    directory = JobDirectory(tmp_path / "job")
+    split_input(input_path, directory, shard_size=2)
+    # A worker claimed the first shard and died long ago
+    claim_shard(directory, worker_id="dead")
+    os.utime(directory.claim_path(0, "dead"), (0, 0))
+    directory.job_path.unlink()
+
+    threads = _start_workers(tmp_path / "job", 1)
+    coordinate(input_path, tmp_path / "output", tmp_path / "job", shard_size=2, poll_interval=0.01)
+    for thread in threads:
+        thread.join()
+    solve_batch(input_path, tmp_path / "expected")
+
+    assert (tmp_path / "output").read_bytes() == (tmp_path / "expected").read_bytes()
+
+
+def test_coordinate_empty_input(tmp_path: Path) -> None:
+    (tmp_path / "input.txt").write_text("\n", encoding="utf-8")
+    job = coordinate(
+        tmp_path / "input.txt",
+        tmp_path / "output.csv",
+        tmp_path / "job",
+        output_format=SinkFormat.CSV,
+    )
+
+    assert job.shards == 0
+    assert (tmp_path / "output.csv").read_text(encoding="utf-8").startswith("puzzle,solution")
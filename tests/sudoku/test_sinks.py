@@ -0,0 +1,144 @@
+"""Sinks tests module."""
+
+import csv
+import gzip
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from sudoku_resolver.sinks import (
+    BinarySink,
+    Compression,
+    CsvSink,
+    JsonlSink,
+    SinkFormat,
+    SolveRecord,
+    TextSink,
+    open_sink,
+    zstandard,
+)
+from tests import SOLVED_SUDOKU, UNSOLVABLE_SUDOKU
+
+SOLUTION = "".join(map(str, SOLVED_SUDOKU.ravel()))
+RECORDS = [
+    SolveRecord(puzzle="0" * 81, solution=SOLUTION, elapsed=0.5, engine="backtracking"),
+    SolveRecord(puzzle=UNSOLVABLE_SUDOKU, solution=None, elapsed=0.25, engine="sat"),
+]
+
+
+def _write(path: Path, sink_format: SinkFormat, **kwargs) -> None:
+    with open_sink(path, sink_format, **kwargs) as sink:
+        sink.write_many(RECORDS)
+
+
+def test_text_sink(tmp_path: Path) -> None:
+    _write(tmp_path / "output.txt", SinkFormat.TEXT)
+
+    assert (tmp_path / "output.txt").read_text(encoding="utf-8").splitlines() == [
+        SOLUTION,
+        UNSOLVABLE_SUDOKU,
+    ]
+
+
+def test_jsonl_sink(tmp_path: Path) -> None:
+    _write(tmp_path / "output.jsonl", SinkFormat.JSONL)
+    lines = (tmp_path / "output.jsonl").read_text(encoding="utf-8").splitlines()
+
+    assert [json.loads(line) for line in lines] == [
+        {
+            "puzzle": "0" * 81,
+            "solution": SOLUTION,
+            "solved": True,
+            "elapsed": 0.5,
+            "engine": "backtracking",
+        },
+        {
+            "puzzle": UNSOLVABLE_SUDOKU,
+            "solution": None,
+            "solved": False,
+            "elapsed": 0.25,
+            "engine": "sat",
+        },
+    ]
+
+
+def test_csv_sink(tmp_path: Path) -> None:
+    _write(tmp_path / "output.csv", SinkFormat.CSV)
+    with Path.open(tmp_path / "output.csv", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    assert [row["solution"] for row in rows] == [SOLUTION, ""]
+    assert [row["solved"] for row in rows] == ["1", "0"]
+
+
+def test_csv_sink_quotes_malformed_lines(tmp_path: Path) -> None:
+    puzzle = 'garbage,line"x'
+    with CsvSink(tmp_path / "output.csv") as sink:
+        sink.write(SolveRecord(puzzle=puzzle, solution=None, elapsed=0.0, engine="backtracking"))
+    with Path.open(tmp_path / "output.csv", encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+
+    assert rows[1] == [puzzle, "", "0", "0.000000", "backtracking"]
+
+
+def test_binary_sink(tmp_path: Path) -> None:
+    _write(tmp_path / "output.bin", SinkFormat.BINARY)
+    grids = np.frombuffer((tmp_path / "output.bin").read_bytes(), dtype=np.uint8).reshape(-1, 9, 9)
+
+    assert (grids[0] == SOLVED_SUDOKU).all()
+    assert "".join(map(str, grids[1].ravel())) == UNSOLVABLE_SUDOKU
+
+
+def test_sink_append_skips_header(tmp_path: Path) -> None:
+    path = tmp_path / "output.csv"
+    _write(path, SinkFormat.CSV)
+    _write(path, SinkFormat.CSV, append=True)
+
+    assert path.read_text(encoding="utf-8").count("puzzle,solution") == 1
+
+
+@pytest.mark.parametrize("buffer_size", [1, 1 << 20])
+def test_sink_gzip_frames(tmp_path: Path, buffer_size: int) -> None:
+    path = tmp_path / "output.txt.gz"
+    with TextSink(path, compression=Compression.GZIP, buffer_size=buffer_size) as sink:
+        sink.write(RECORDS[0])
+        sink.sync()
+        size = sink.size
+        sink.write(RECORDS[1])
+
+    assert size < path.stat().st_size
+    assert gzip.decompress(path.read_bytes()[:size]) == (SOLUTION + "\n").encode()
+    assert (
+        gzip.decompress(path.read_bytes()) == (SOLUTION + "\n" + UNSOLVABLE_SUDOKU + "\n").encode()
+    )
+
+
+def test_sink_digest(tmp_path: Path) -> None:
+    path = tmp_path / "output.jsonl"
+    with JsonlSink(path) as sink:
+        sink.write_many(RECORDS)
+        sink.sync()
+        digest, size = sink.digest, sink.size
+
+    assert size == path.stat().st_size
+    assert digest == hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@pytest.mark.skipif(zstandard is None, reason="zstandard isn't installed")
+def test_sink_zstd(tmp_path: Path) -> None:
+    path = tmp_path / "output.bin.zst"
+    with BinarySink(path, compression=Compression.ZSTD) as sink:
+        sink.write(RECORDS[0])
+        sink.sync()
+        sink.write(RECORDS[1])
+
+    assert len(zstandard.ZstdDecompressor().decompressobj().decompress(path.read_bytes())) == 81
+
+
+@pytest.mark.skipif(zstandard is not None, reason="zstandard is installed")
+def test_sink_zstd_unavailable(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="zstandard"):
+        CsvSink(tmp_path / "output.csv.zst", compression=Compression.ZSTD)
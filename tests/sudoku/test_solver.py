@@ -0,0 +1,69 @@
+"""Solver tests module."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from sudoku_resolver.engines import EngineName
+from sudoku_resolver.solver import SolverContext, solve
+from sudoku_resolver.sudoku import Sudoku
+from tests import SOLVED_SUDOKU, SUDOKU_PATH, UNSOLVABLE_SUDOKU
+
+SUDOKU = Sudoku.from_file(SUDOKU_PATH).grid.values
+
+
+@pytest.mark.parametrize("engine", list(EngineName))
+def test_solve(engine: EngineName) -> None:
+    values = SUDOKU.copy()
+    result = solve(values, engine=engine)
+
+    assert result.solved
+    assert result.engine is engine
+    assert (result.values == SOLVED_SUDOKU).all()
+    assert (values == SUDOKU).all()
+    assert not result.values.flags.writeable
+
+
+def test_solve_flat_values() -> None:
+    assert solve(SUDOKU.ravel()).to_string() == "".join(map(str, SOLVED_SUDOKU.ravel()))
+
+
+def test_solve_unsolvable() -> None:
+    values = np.array(list(UNSOLVABLE_SUDOKU), dtype=np.uint8)
+    result = solve(values)
+
+    assert not result.solved
+    assert result.to_string() == UNSOLVABLE_SUDOKU
+
+
+def test_solve_stopped() -> None:
+    result = solve(np.zeros((9, 9), dtype=np.uint8), should_stop=lambda: True)
+
+    assert not result.solved
+    assert not result.values.any()
+
+
+def test_solve_invalid_shape() -> None:
+    with pytest.raises(ValueError, match="Expected 81 values"):
+        solve(np.zeros(80, dtype=np.uint8))
+
+
+def test_solve_threads() -> None:
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: solve(SUDOKU), range(32)))
+
+    assert all((result.values == SOLVED_SUDOKU).all() for result in results)
+    assert (SUDOKU == Sudoku.from_file(SUDOKU_PATH).grid.values).all()
+
+
+@pytest.mark.parametrize("engine", list(EngineName))
+def test_solver_context(engine: EngineName) -> None:
+    context = SolverContext(engine=engine)
+    unsolvable = np.array(list(UNSOLVABLE_SUDOKU), dtype=np.uint8)
+    results = [context.solve(values) for values in [SUDOKU, unsolvable, SUDOKU.ravel(), SUDOKU]]
+
+    assert [result.solved for result in results] == [True, False, True, True]
+    assert all((result.values == SOLVED_SUDOKU).all() for result in results[2:])
+    assert results[1].to_string() == UNSOLVABLE_SUDOKU
+    assert (results[0].values == SOLVED_SUDOKU).all()
@@ -0,0 +1,109 @@
+"""Telemetry tests module."""
+
+import io
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from sudoku_resolver.sinks import SolveRecord
+from sudoku_resolver.telemetry import OPENMETRICS_CONTENT_TYPE, BatchTelemetry
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _record(elapsed: float, *, solved: bool = True) -> SolveRecord:
+    return SolveRecord(
+        puzzle="0" * 81, solution="1" * 81 if solved else None, elapsed=elapsed, engine="sat"
+    )
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def telemetry(clock: FakeClock) -> BatchTelemetry:
+    telemetry = BatchTelemetry(workers=2, report_interval=None, stream=None, clock=clock)
+    records = [_record(0.0015)] * 90 + [_record(0.015)] * 9 + [_record(0.15, solved=False)]
+    list(telemetry.observe_many(records))
+    telemetry.observe_duplicates(10)
+    clock.now = 2.0
+    return telemetry
+
+
+def test_snapshot(telemetry: BatchTelemetry) -> None:
+    snapshot = telemetry.snapshot()
+
+    assert snapshot.puzzles == 110
+    assert snapshot.outcomes == {"solved": 99, "unsolved": 1, "malformed": 0, "duplicate": 10}
+    assert snapshot.throughput == pytest.approx(55.0)
+    assert snapshot.utilization == pytest.approx((90 * 0.0015 + 9 * 0.015 + 0.15) / 4)
+    assert 0.001 < snapshot.quantiles[0.5] <= 0.002
+    assert 0.01 < snapshot.quantiles[0.95] <= 0.02
+    assert 0.01 < snapshot.quantiles[0.99] <= 0.02
+    assert "110 puzzles in 2.0s (55.0/s)" in str(snapshot)
+
+
+def test_observe_malformed_line(telemetry: BatchTelemetry) -> None:
+    quantiles = telemetry.snapshot().quantiles
+    telemetry.observe(SolveRecord(puzzle="garbage", solution=None, elapsed=0.0, engine="sat"))
+    snapshot = telemetry.snapshot()
+
+    assert snapshot.outcomes["malformed"] == 1
+    assert snapshot.outcomes["unsolved"] == 1
+    assert snapshot.quantiles == quantiles
+    assert telemetry.solves == 100
+    assert telemetry.handled == 111
+    assert "sudoku_batch_solve_seconds_count 100" in telemetry.render()
+
+
+def test_quantile_without_solves() -> None:
+    assert BatchTelemetry(stream=None).quantile(0.5) == 0.0
+
+
+def test_render(telemetry: BatchTelemetry) -> None:
+    prometheus = telemetry.render().splitlines()
+    openmetrics = telemetry.render(openmetrics=True).splitlines()
+
+    assert "# TYPE sudoku_batch_puzzles_total counter" in prometheus
+    assert 'sudoku_batch_puzzles_total{outcome="duplicate"} 10' in prometheus
+    assert 'sudoku_batch_solve_seconds_bucket{le="0.002"} 90' in prometheus
+    assert 'sudoku_batch_solve_seconds_bucket{le="+Inf"} 100' in prometheus
+    assert "sudoku_batch_workers 2" in prometheus
+    assert "# TYPE sudoku_batch_puzzles counter" in openmetrics
+    assert openmetrics[-1] == "# EOF"
+
+
+def test_report(tmp_path: Path, clock: FakeClock) -> None:
+    stream = io.StringIO()
+    telemetry = BatchTelemetry(
+        report_interval=1.0, stream=stream, metrics_path=tmp_path / "metrics.prom", clock=clock
+    )
+    telemetry.observe(_record(0.1))
+    assert not stream.getvalue()
+
+    clock.now = 1.0
+    telemetry.observe(_record(0.1))
+    assert stream.getvalue().startswith("2 puzzles in 1.0s")
+    assert 'outcome="solved"} 2' in (tmp_path / "metrics.prom").read_text(encoding="utf-8")
+
+    telemetry.close()
+    assert len(stream.getvalue().splitlines()) == 2
+
+
+def test_serve(telemetry: BatchTelemetry) -> None:
+    server = telemetry.serve(0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics") as response:
+            assert response.headers["Content-Type"] == OPENMETRICS_CONTENT_TYPE
+            assert response.read().decode("utf-8") == telemetry.render(openmetrics=True)
+    finally:
+        telemetry.close()
@@ -0,0 +1,83 @@
+"""Templates tests module."""
+
+import numpy as np
+import pytest
+
+from sudoku_resolver.constraints import CLASSIC, VARIANTS, Variant
+from sudoku_resolver.exceptions import SearchCancelledError, UnsolvableSudokuError
+from sudoku_resolver.grid import Grid
+from sudoku_resolver.templates import (
+    TEMPLATES_CACHE_SIZE,
+    compile_templates,
+    get_templates,
+    template_solve,
+)
+from sudoku_resolver.validation import validate
+from tests import HARD_SUDOKU, SOLVED_SUDOKU, UNSOLVABLE_SUDOKU
+
+
+def _cells(masks: np.ndarray) -> np.ndarray:
+    """Unpacks masks into the boolean selection of their cells, of shape (N, 81)."""
+    bits = np.unpackbits(masks.view(np.uint8), axis=1, bitorder="little")
+    return np.concatenate([bits[:, :64], bits[:, 64:81]], axis=1).astype(np.bool_)
+
+
+def test_classic_templates() -> None:
+    templates = get_templates(CLASSIC)
+    cells = _cells(templates)
+
+    assert templates.shape == (46656, 2)
+    assert not templates.flags.writeable
+    assert get_templates(CLASSIC) is templates
+    assert (compile_templates() == templates).all()
+    assert len(np.unique(templates, axis=0)) == len(templates)
+    assert (CLASSIC.membership.astype(np.intp) @ cells.T == 1).all()
+
+
+def test_templates_cache_is_bounded() -> None:
+    get_templates.cache_clear()
+    for model in VARIANTS.values():
+        get_templates(model)
+    info = get_templates.cache_info()
+
+    assert info.maxsize == TEMPLATES_CACHE_SIZE
+    assert info.currsize == len(VARIANTS)
+
+
+@pytest.mark.parametrize("variant,expected_count", [(Variant.X, 9288), (Variant.HYPER, 6080)])
+def test_variant_templates(variant: Variant, expected_count: int) -> None:
+    model = VARIANTS[variant]
+    templates = compile_templates(model)
+
+    assert len(templates) == expected_count
+    assert (model.membership.astype(np.intp) @ _cells(templates).T == 1).all()
+
+
+def test_template_solve_hard() -> None:
+    values = np.array(list(HARD_SUDOKU), dtype=np.uint8).reshape(9, 9)
+    grid = Grid(values.copy())
+    template_solve(grid)
+
+    assert validate(grid.values).valid
+    assert (grid.values[values != 0] == values[values != 0]).all()
+
+
+def test_template_solve_solved() -> None:
+    grid = Grid(SOLVED_SUDOKU.copy())
+    template_solve(grid)
+
+    assert (grid.values == SOLVED_SUDOKU).all()
+
+
+def test_template_solve_unsolvable() -> None:
+    grid = Grid(np.array(list(UNSOLVABLE_SUDOKU), dtype=np.uint8).reshape(9, 9))
+
+    with pytest.raises(UnsolvableSudokuError):
+        template_solve(grid)
+
+
+def test_template_solve_cancelled() -> None:
+    grid = Grid(np.zeros((9, 9), dtype=np.uint8))
+
+    with pytest.raises(SearchCancelledError):
+        template_solve(grid, should_stop=lambda: True)
@@ -0,0 +1,85 @@
+"""Tensors tests module."""
+
+from collections.abc import Callable
+
+import numpy as np
+import pytest
+
+from sudoku_resolver.sudoku import Sudoku
+from sudoku_resolver.tensors import candidates_from_values, from_bitmasks, propagate, to_bitmasks
+from tests import HARD_SUDOKU, SUDOKU_PATH
+
+
+def _grids() -> list[Sudoku]:
+    return [Sudoku.from_file(SUDOKU_PATH), Sudoku.from_string(HARD_SUDOKU)]
+
+
+def test_bitmasks() -> None:
+    candidates = np.stack([sudoku.grid.candidates for sudoku in _grids()])
+    bitmasks = to_bitmasks(candidates)
+
+    assert bitmasks.shape == (2, 9, 9)
+    assert bitmasks[0, 0, 0] == 1 << 6
+    assert bitmasks[0, 0, 1] == (1 << 7) | (1 << 8) | (1 << 9)
+    assert (from_bitmasks(bitmasks) == candidates).all()
+    assert (from_bitmasks(bitmasks[1]) == candidates[1]).all()
+
+
+def test_candidates() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    candidates = sudoku.grid.candidates
+
+    assert candidates.shape == (9, 9, 9)
+    assert np.flatnonzero(candidates[0, 1]).tolist() == [6, 7, 8]
+    assert np.flatnonzero(candidates[0, 0]).tolist() == [5]
+
+
+def test_candidates_from_values() -> None:
+    grids = _grids()
+    candidates = candidates_from_values(np.stack([sudoku.grid.values for sudoku in grids]))
+
+    assert candidates.shape == (2, 9, 9, 9)
+    for sudoku, grid_candidates in zip(grids, candidates, strict=True):
+        assert (grid_candidates == sudoku.grid.candidates).all()
+
+
+def test_propagate() -> None:
+    grids = _grids()
+    candidates = np.stack([sudoku.grid.candidates for sudoku in grids])
+    propagated = propagate(candidates)
+
+    for sudoku, grid_candidates in zip(grids, propagated, strict=True):
+        sudoku.grid.enforce_arc_consistency()
+        assert (grid_candidates == sudoku.grid.candidates).all()
+    assert (propagate(candidates[0]) == propagated[0]).all()
+    assert (candidates != propagated).any()
+
+
+def test_load_candidates() -> None:
+    sudoku, expected = Sudoku.from_file(SUDOKU_PATH), Sudoku.from_file(SUDOKU_PATH)
+    sudoku.grid.load_candidates(propagate(sudoku.grid.candidates))
+    expected.grid.enforce_arc_consistency()
+    counts = sudoku.grid.domains.counts
+
+    assert sudoku.grid.domains.domains == expected.grid.domains.domains
+    expected.grid.domains.recount()
+    assert counts == expected.grid.domains.counts
+
+
+@pytest.mark.parametrize(
+    "function,array",
+    [
+        (to_bitmasks, np.zeros((9, 9))),
+        (from_bitmasks, np.zeros((2, 2, 9, 9))),
+        (candidates_from_values, np.zeros(81)),
+        (propagate, np.zeros((9, 9, 8))),
+    ],
+)
+def test_invalid_shape(function: Callable, array: np.ndarray) -> None:
+    with pytest.raises(ValueError, match="Expected"):
+        function(array)
+
+
+def test_load_candidates_invalid_shape() -> None:
+    with pytest.raises(ValueError, match="Expected candidates"):
+        Sudoku.from_file(SUDOKU_PATH).grid.load_candidates(np.zeros((81, 9)))
@@ -0,0 +1,103 @@
+"""Trace tests module."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from sudoku_resolver.backtracking import backtracking
+from sudoku_resolver.engines import EngineName
+from sudoku_resolver.exceptions import SearchCutoffError, TraceError
+from sudoku_resolver.sudoku import Sudoku
+from sudoku_resolver.trace import (
+    SearchTracer,
+    Trace,
+    TraceEvent,
+    build_search_tree,
+    summarize,
+)
+from tests import HARD_SUDOKU, SOLVED_SUDOKU, SUDOKU_PATH
+
+
+def _trace_hard_sudoku(path: Path, max_backtracks: int) -> Trace:
+    sudoku = Sudoku.from_string(HARD_SUDOKU)
+    with (
+        SearchTracer(path, sudoku.grid.values, buffer_records=16) as tracer,
+        pytest.raises(SearchCutoffError),
+    ):
+        backtracking(
+            grid=sudoku.grid,
+            domains=sudoku.grid.domains,
+            initial_domains=sudoku.grid.initial_domains,
+            max_backtracks=max_backtracks,
+            tracer=tracer,
+        )
+    return Trace.load(path)
+
+
+def test_trace_solve(tmp_path: Path) -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+    with SearchTracer(tmp_path / "trace.bin", sudoku.grid.values) as tracer:
+        sudoku.solve(tracer=tracer)
+    trace = Trace.load(tmp_path / "trace.bin")
+
+    assert tracer.records == len(trace.events) == 225
+    assert (trace.values == Sudoku.from_file(SUDOKU_PATH).grid.values).all()
+    assert (trace.replay() == SOLVED_SUDOKU).all()
+    assert (tmp_path / "trace.bin").stat().st_size == 86 + 4 * 225
+
+
+def test_trace_backtracks(tmp_path: Path) -> None:
+    trace = _trace_hard_sudoku(tmp_path / "trace.bin", 20)
+    summary = summarize(trace, hot_cells=3)
+
+    assert summary.events[TraceEvent.BACKTRACK] == 20
+    assert summary.events[TraceEvent.DEAD_END] == 21
+    assert sum(summary.depth_histogram) == summary.events[TraceEvent.ASSIGN]
+    assert summary.max_depth == len(summary.depth_histogram) - 1
+    assert len(summary.hot_cells) <= 3
+    assert [count for _, count in summary.hot_cells] == sorted(
+        (count for _, count in summary.hot_cells), reverse=True
+    )
+
+
+def test_build_search_tree(tmp_path: Path) -> None:
+    trace = _trace_hard_sudoku(tmp_path / "trace.bin", 20)
+    root = build_search_tree(trace)
+    nodes = list(root.walk(-1))[1:]
+    assignments = trace.events[trace.events["event"] == TraceEvent.ASSIGN]
+
+    assert len(nodes) == len(assignments)
+    assert sum(node.failed for _, node in nodes) == 20
+    assert sorted(depth for depth, _ in nodes) == sorted(assignments["depth"].tolist())
+
+
+def test_trace_requires_backtracking(tmp_path: Path) -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+
+    with (
+        SearchTracer(tmp_path / "trace.bin", sudoku.grid.values) as tracer,
+        pytest.raises(ValueError, match="backtracking"),
+    ):
+        sudoku.solve(engine=EngineName.SAT, tracer=tracer)
+
+
+@pytest.mark.parametrize(
+    "content,reason",
+    [
+        (b"SDKT", "shorter than the header"),
+        (b"ABCD\x01" + bytes(81), "isn't a search trace"),
+        (b"SDKT\x02" + bytes(81), "unsupported version '2'"),
+        (b"SDKT\x01" + bytes(81) + b"\x01\x00", "truncated"),
+    ],
+)
+def test_load_invalid_trace(tmp_path: Path, content: bytes, reason: str) -> None:
+    (tmp_path / "trace.bin").write_bytes(content)
+
+    with pytest.raises(TraceError, match=reason):
+        Trace.load(tmp_path / "trace.bin")
+
+
+def test_invalid_buffer_records(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="positive"):
+        SearchTracer(tmp_path / "trace.bin", np.zeros(81), buffer_records=0)
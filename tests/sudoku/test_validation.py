@@ -0,0 +1,80 @@
+"""Validation tests module."""
+
+import numpy as np
+import pytest
+
+from sudoku_resolver.grid import Index
+from sudoku_resolver.sudoku import Sudoku
+from sudoku_resolver.validation import UNITS, validate
+from tests import SOLVED_SUDOKU, SUDOKU_PATH
+
+
+def test_units() -> None:
+    assert UNITS.shape == (27, 9)
+    assert (np.bincount(UNITS.ravel()) == 3).all()
+    assert list(UNITS[18]) == [0, 1, 2, 9, 10, 11, 18, 19, 20]
+
+
+def test_validate_solved() -> None:
+    result = validate(SOLVED_SUDOKU)
+
+    assert result.valid
+    assert result.offending_indexes == []
+
+
+@pytest.mark.parametrize(
+    "complete,expected_valid,expected_offending_indexes",
+    [(True, False, [(0, 1), (0, 3)]), (False, True, [])],
+)
+def test_validate_incomplete(
+    complete: bool, expected_valid: bool, expected_offending_indexes: list[Index]
+) -> None:
+    values = SOLVED_SUDOKU.copy()
+    values[0][1] = values[0][3] = 0
+    result = validate(values, complete=complete)
+
+    assert result.valid == expected_valid
+    assert result.offending_indexes == expected_offending_indexes
+
+
+@pytest.mark.parametrize(
+    "value_index,value,expected_offending_indexes",
+    [
+        ((0, 0), 7, [(0, 0), (0, 1), (5, 0)]),
+        ((4, 4), 10, [(4, 4)]),
+    ],
+)
+def test_validate_inconsistent(
+    value_index: Index, value: int, expected_offending_indexes: list[Index]
+) -> None:
+    values = SOLVED_SUDOKU.copy()
+    values[value_index] = value
+    result = validate(values)
+
+    assert not result.valid
+    assert result.offending_indexes == expected_offending_indexes
+
+
+def test_validate_batch() -> None:
+    batch = np.stack([SOLVED_SUDOKU] * 3)
+    batch[1][8][8] = 0
+    batch[2][0][0] = 7
+    result = validate(batch)
+
+    assert list(result.valid) == [True, False, False]
+    assert result.offending_cells.shape == (3, 9, 9)
+    assert not result.offending_cells[0].any()
+    assert np.argwhere(result.offending_cells[1]).tolist() == [[8, 8]]
+    assert result.offending_cells[2].sum() == 3
+
+
+def test_validate_invalid_shape() -> None:
+    with pytest.raises(ValueError, match=r"Expected grids of shape \(9, 9\) or \(N, 9, 9\)"):
+        validate(np.zeros((9, 8), dtype=np.uint8))
+
+
+def test_validate_unsolved_sudoku() -> None:
+    sudoku = Sudoku.from_file(SUDOKU_PATH)
+
+    assert validate(sudoku.grid.values, complete=False).valid
+    assert not validate(sudoku.grid.values).valid